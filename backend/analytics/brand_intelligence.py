@@ -64,22 +64,34 @@ def extrair_marca(razao_social, registro_ans):
     primeira_palavra = nome.split()[0].replace("-", "")
     return primeira_palavra
 
-def analisar_performance_marca(df_trimestre, operadora_row):
+def analisar_performance_marca(df_trimestre, operadora_row, cubo=None):
     """
     Retorna estatísticas comparativas do grupo.
+    Com o cubo de mercado (backend/analytics/cubo_mercado.py) os totais e medianas
+    do grupo são lidos pré-agregados em vez de recalculados sobre o trimestre.
     """
     marca = extrair_marca(operadora_row['razao_social'], operadora_row['ID_OPERADORA'])
     
     df_calc = df_trimestre.copy()
     
-    df_calc['Marca_Temp'] = df_calc.apply(
-        lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-        axis=1
-    )
+    if 'Marca_Temp' not in df_calc.columns:
+        df_calc['Marca_Temp'] = cubo.marca_de(df_calc) if cubo is not None else df_calc.apply(
+            lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
+            axis=1
+        )
     
     df_grupo = df_calc[df_calc['Marca_Temp'] == marca].copy()
     
-    total_vidas_grupo = df_grupo['NR_BENEF_T'].sum()
+    if cubo is not None:
+        trimestre = operadora_row['ID_TRIMESTRE']
+        total_vidas_grupo = cubo.valor(trimestre, 'NR_BENEF_T', 'soma', marca=marca, padrao=0)
+        mediana_vidas = cubo.valor(trimestre, 'VAR_PCT_VIDAS', 'mediana', marca=marca)
+        mediana_receita = cubo.valor(trimestre, 'VAR_PCT_RECEITA', 'mediana', marca=marca)
+    else:
+        total_vidas_grupo = df_grupo['NR_BENEF_T'].sum()
+        mediana_vidas = df_grupo['VAR_PCT_VIDAS'].median()
+        mediana_receita = df_grupo['VAR_PCT_RECEITA'].median()
+
     vidas_op = operadora_row['NR_BENEF_T']
     share_of_brand = (vidas_op / total_vidas_grupo) * 100 if total_vidas_grupo > 0 else 0
     
@@ -87,7 +99,7 @@ def analisar_performance_marca(df_trimestre, operadora_row):
         'Marca': marca,
         'Qtd_Grupo': len(df_grupo),
         'Share_of_Brand': share_of_brand,
-        'Media_Cresc_Vidas_Grupo': df_grupo['VAR_PCT_VIDAS'].median(),
-        'Media_Cresc_Receita_Grupo': df_grupo['VAR_PCT_RECEITA'].median(),
+        'Media_Cresc_Vidas_Grupo': mediana_vidas,
+        'Media_Cresc_Receita_Grupo': mediana_receita,
         'Df_Grupo': df_grupo 
-    }
\ No newline at end of file
+    }
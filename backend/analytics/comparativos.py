@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 from backend.analytics.brand_intelligence import extrair_marca
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import (
+    garantir_chaves, filtrar_operadora, filtrar_trimestre,
+    trimestre_para_ordinal, ordinal_para_trimestre
+)
 
 # --- Funções Auxiliares de Formatação ---
 def _fmt_reais(valor):
@@ -16,37 +21,27 @@ def _fmt_numero(valor):
         return "0"
 
 def obter_trimestres_anteriores(trimestre_atual):
-    try:
-        ano, tri = trimestre_atual.split('-')
-        ano = int(ano)
-        tri_num = int(tri.replace('T', ''))
-        if tri_num == 1:
-            tri_prev_q = f"{ano-1}-T4"
-        else:
-            tri_prev_q = f"{ano}-T{tri_num-1}"
-        tri_prev_y = f"{ano-1}-T{tri_num}"
-        return tri_prev_q, tri_prev_y
-    except:
+    # Aritmética de ordinais: trimestre anterior = -1, mesmo trimestre do ano anterior = -4
+    ordinal = trimestre_para_ordinal(trimestre_atual)
+    if ordinal is None:
         return None, None
+    return ordinal_para_trimestre(ordinal - 1), ordinal_para_trimestre(ordinal - 4)
 
 def calcular_variacoes_operadora(df, id_operadora, trimestre_atual):
-    # Normaliza ID para busca
-    id_busca = str(id_operadora).split('.')[0].strip().zfill(6)
+    # Chaves inteiras (já presentes quando o DF vem do DataEngine)
+    df = garantir_chaves(df)
+    ordinal_atual = trimestre_para_ordinal(trimestre_atual)
     
-    # Garante que o DF também tenha IDs normalizados (caso não tenha vindo do DataEngine)
-    df = df.copy()
-    df['ID_OPERADORA'] = df['ID_OPERADORA'].apply(lambda x: str(x).split('.')[0].strip().zfill(6))
+    df_op = filtrar_operadora(df, id_operadora).set_index('TRIMESTRE_ORD')
     
-    df_op = df[df['ID_OPERADORA'] == id_busca].set_index('ID_TRIMESTRE')
-    
-    if trimestre_atual not in df_op.index:
+    if ordinal_atual is None or ordinal_atual not in df_op.index:
         return None
 
-    atual = df_op.loc[trimestre_atual]
+    atual = df_op.loc[ordinal_atual]
     tri_prev_q, tri_prev_y = obter_trimestres_anteriores(trimestre_atual)
     
-    dados_prev_q = df_op.loc[tri_prev_q] if tri_prev_q in df_op.index else None
-    dados_prev_y = df_op.loc[tri_prev_y] if tri_prev_y in df_op.index else None
+    dados_prev_q = df_op.loc[ordinal_atual - 1] if ordinal_atual - 1 in df_op.index else None
+    dados_prev_y = df_op.loc[ordinal_atual - 4] if ordinal_atual - 4 in df_op.index else None
 
     kpis = {
         'Vidas': atual['NR_BENEF_T'],
@@ -75,43 +70,44 @@ def calcular_variacoes_operadora(df, id_operadora, trimestre_atual):
     return kpis
 
 def calcular_kpis_financeiros_avancados(df_mestre, id_operadora, trimestre_atual):
-    # Normaliza ID
+    # Normaliza ID (rótulo) e usa as chaves inteiras nos filtros
     id_busca = str(id_operadora).split('.')[0].strip().zfill(6)
-    df_mestre = df_mestre.copy()
-    df_mestre['ID_OPERADORA'] = df_mestre['ID_OPERADORA'].apply(lambda x: str(x).split('.')[0].strip().zfill(6))
+    df_mestre = garantir_chaves(df_mestre)
+    ordinal_atual = trimestre_para_ordinal(trimestre_atual)
+    if ordinal_atual is None:
+        return None
 
-    df_op = df_mestre[df_mestre['ID_OPERADORA'] == id_busca].copy()
-    df_hist_window = df_op[df_op['ID_TRIMESTRE'] <= trimestre_atual].sort_values('ID_TRIMESTRE')
+    df_op = filtrar_operadora(df_mestre, id_busca)
+    df_hist_window = df_op[df_op['TRIMESTRE_ORD'] <= ordinal_atual].sort_values('TRIMESTRE_ORD')
     
-    if df_hist_window.empty or df_hist_window.iloc[-1]['ID_TRIMESTRE'] != trimestre_atual:
+    if df_hist_window.empty or df_hist_window.iloc[-1]['TRIMESTRE_ORD'] != ordinal_atual:
         return None
         
     row_atual = df_hist_window.iloc[[-1]]
-    df_tri_mercado = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre_atual].copy()
+    cubo = obter_cubo(df_mestre)
+    df_tri_mercado = filtrar_trimestre(df_mestre, trimestre_atual).copy()
     
     receita_op = row_atual['VL_SALDO_FINAL'].values[0]
     vidas_op = row_atual['NR_BENEF_T'].values[0]
     razao_social = row_atual['razao_social'].values[0]
     
     # Share Nacional
-    total_receita_br = df_tri_mercado['VL_SALDO_FINAL'].sum()
+    total_receita_br = cubo.valor(trimestre_atual, 'VL_SALDO_FINAL', 'soma', padrao=0)
     share_br = (receita_op / total_receita_br) * 100 if total_receita_br > 0 else 0
     ctx_share_br = f"{_fmt_reais(receita_op)} (Op)  /  {_fmt_reais(total_receita_br)} (Total BR)"
     
     # Share Grupo
     marca_op = extrair_marca(razao_social, id_busca)
-    df_tri_mercado['Marca_Temp'] = df_tri_mercado.apply(
-        lambda x: extrair_marca(x['razao_social'], x['ID_OPERADORA']), axis=1
-    )
+    df_tri_mercado['Marca_Temp'] = cubo.marca_de(df_tri_mercado)
     df_grupo = df_tri_mercado[df_tri_mercado['Marca_Temp'] == marca_op].copy()
-    total_receita_grupo = df_grupo['VL_SALDO_FINAL'].sum()
+    total_receita_grupo = cubo.valor(trimestre_atual, 'VL_SALDO_FINAL', 'soma', marca=marca_op, padrao=0)
     share_grupo = (receita_op / total_receita_grupo) * 100 if total_receita_grupo > 0 else 0
     ctx_share_grupo = f"{_fmt_reais(receita_op)} (Op)  /  {_fmt_reais(total_receita_grupo)} (Total {marca_op})"
     
     # Ranking Financeiro (Volume)
     df_grupo['Rank_Fin'] = df_grupo['VL_SALDO_FINAL'].rank(ascending=False, method='min')
     try:
-        rank_grupo = int(df_grupo[df_grupo['ID_OPERADORA'] == id_busca]['Rank_Fin'].iloc[0])
+        rank_grupo = int(filtrar_operadora(df_grupo, id_busca)['Rank_Fin'].iloc[0])
     except:
         rank_grupo = "-"
     total_grupo = len(df_grupo)
@@ -137,42 +133,43 @@ def calcular_kpis_financeiros_avancados(df_mestre, id_operadora, trimestre_atual
     }
 
 def calcular_kpis_vidas_avancados(df_mestre, id_operadora, trimestre_atual):
-    # Normaliza ID
+    # Normaliza ID (rótulo) e usa as chaves inteiras nos filtros
     id_busca = str(id_operadora).split('.')[0].strip().zfill(6)
-    df_mestre = df_mestre.copy()
-    df_mestre['ID_OPERADORA'] = df_mestre['ID_OPERADORA'].apply(lambda x: str(x).split('.')[0].strip().zfill(6))
+    df_mestre = garantir_chaves(df_mestre)
+    ordinal_atual = trimestre_para_ordinal(trimestre_atual)
+    if ordinal_atual is None:
+        return None
 
-    df_op = df_mestre[df_mestre['ID_OPERADORA'] == id_busca].copy()
-    df_hist_window = df_op[df_op['ID_TRIMESTRE'] <= trimestre_atual].sort_values('ID_TRIMESTRE')
+    df_op = filtrar_operadora(df_mestre, id_busca)
+    df_hist_window = df_op[df_op['TRIMESTRE_ORD'] <= ordinal_atual].sort_values('TRIMESTRE_ORD')
     
-    if df_hist_window.empty or df_hist_window.iloc[-1]['ID_TRIMESTRE'] != trimestre_atual:
+    if df_hist_window.empty or df_hist_window.iloc[-1]['TRIMESTRE_ORD'] != ordinal_atual:
         return None
         
     row_atual = df_hist_window.iloc[[-1]]
-    df_tri_mercado = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre_atual].copy()
+    cubo = obter_cubo(df_mestre)
+    df_tri_mercado = filtrar_trimestre(df_mestre, trimestre_atual).copy()
     
     vidas_op = row_atual['NR_BENEF_T'].values[0]
     razao_social = row_atual['razao_social'].values[0]
     
     # Share Nacional
-    total_vidas_br = df_tri_mercado['NR_BENEF_T'].sum()
+    total_vidas_br = cubo.valor(trimestre_atual, 'NR_BENEF_T', 'soma', padrao=0)
     share_br = (vidas_op / total_vidas_br) * 100 if total_vidas_br > 0 else 0
     ctx_share_br = f"{_fmt_numero(vidas_op)} (Op)  /  {_fmt_numero(total_vidas_br)} (Total BR)"
     
     # Share Grupo
     marca_op = extrair_marca(razao_social, id_busca)
-    df_tri_mercado['Marca_Temp'] = df_tri_mercado.apply(
-        lambda x: extrair_marca(x['razao_social'], x['ID_OPERADORA']), axis=1
-    )
+    df_tri_mercado['Marca_Temp'] = cubo.marca_de(df_tri_mercado)
     df_grupo = df_tri_mercado[df_tri_mercado['Marca_Temp'] == marca_op].copy()
-    total_vidas_grupo = df_grupo['NR_BENEF_T'].sum()
+    total_vidas_grupo = cubo.valor(trimestre_atual, 'NR_BENEF_T', 'soma', marca=marca_op, padrao=0)
     share_grupo = (vidas_op / total_vidas_grupo) * 100 if total_vidas_grupo > 0 else 0
     ctx_share_grupo = f"{_fmt_numero(vidas_op)} (Op)  /  {_fmt_numero(total_vidas_grupo)} (Total {marca_op})"
     
     # Ranking Vidas (Volume)
     df_grupo['Rank_Vid'] = df_grupo['NR_BENEF_T'].rank(ascending=False, method='min')
     try:
-        rank_grupo = int(df_grupo[df_grupo['ID_OPERADORA'] == id_busca]['Rank_Vid'].iloc[0])
+        rank_grupo = int(filtrar_operadora(df_grupo, id_busca)['Rank_Vid'].iloc[0])
     except:
         rank_grupo = "-"
     total_grupo = len(df_grupo)
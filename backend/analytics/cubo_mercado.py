@@ -0,0 +1,146 @@
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.analytics.brand_intelligence import extrair_marca
+from backend.constants import Colunas
+from backend.processing.chaves import garantir_chaves, trimestre_para_ordinal
+
+# Cubo de agregados do Dataset Mestre, calculado uma única vez por dataset:
+#   (trimestre, modalidade, marca) -> qtd + soma/max/mediana/quantis de cada métrica.
+# Mediana e quantis não são somáveis, então cada nível de rollup é um grupo próprio;
+# o nível "todas" de uma dimensão é representado por TODOS.
+TODOS = "*"
+DIM_MODALIDADE = Colunas.MODALIDADE
+DIM_MARCA = "Marca"
+
+METRICAS = (Colunas.VIDAS, Colunas.RECEITA, Colunas.VAR_VIDAS, Colunas.VAR_RECEITA)
+ESTATISTICAS = ("soma", "max", "mediana", "q25", "q75")
+_AGREGACOES = {"soma": "sum", "max": "max", "mediana": "median"}
+_QUANTIS = {"q25": 0.25, "q75": 0.75}
+_NIVEIS_ROLLUP = ((), (DIM_MODALIDADE,), (DIM_MARCA,), (DIM_MODALIDADE, DIM_MARCA))
+
+
+class CuboMercado:
+    """
+    Estatísticas de mercado pré-agregadas por (ID_TRIMESTRE, modalidade, Marca).
+    Os use cases consultam o cubo em vez de reescanear a tabela de operadoras a cada interação.
+    """
+
+    def __init__(self, df_mestre: pd.DataFrame):
+        df = garantir_chaves(df_mestre)
+        self._marca_por_operadora = self._mapear_marcas(df)
+        self.tabela = self._construir(df)
+
+    @staticmethod
+    def _mapear_marcas(df: pd.DataFrame) -> pd.Series:
+        """ID_OPERADORA_KEY -> Marca (extrair_marca roda uma vez por operadora, não por linha)."""
+        if df.empty:
+            return pd.Series(dtype=object)
+        pares = df[[Colunas.ID_OPERADORA_KEY, Colunas.ID_OPERADORA, Colunas.RAZAO_SOCIAL]]
+        pares = pares.drop_duplicates(subset=Colunas.ID_OPERADORA_KEY, keep="last")
+        marcas = [extrair_marca(razao, id_op) for id_op, razao in zip(pares[Colunas.ID_OPERADORA], pares[Colunas.RAZAO_SOCIAL])]
+        return pd.Series(marcas, index=pares[Colunas.ID_OPERADORA_KEY].to_numpy())
+
+    def _construir(self, df: pd.DataFrame) -> pd.DataFrame:
+        if df.empty:
+            return pd.DataFrame()
+
+        metricas = [m for m in METRICAS if m in df.columns]
+        base = df[[Colunas.TRIMESTRE] + metricas].copy()
+        base[Colunas.TRIMESTRE] = base[Colunas.TRIMESTRE].astype(str)
+        base[DIM_MODALIDADE] = df[DIM_MODALIDADE].astype(object).fillna("N/A") if DIM_MODALIDADE in df.columns else TODOS
+        base[DIM_MARCA] = self.marca_de(df).to_numpy()
+        base[metricas] = base[metricas].astype("float64")
+
+        niveis = []
+        for dimensoes in _NIVEIS_ROLLUP:
+            grupos = base.groupby([Colunas.TRIMESTRE, *dimensoes], sort=False)[metricas]
+            partes = {"qtd": grupos.size()}
+            for nome, funcao in _AGREGACOES.items():
+                agregado = grupos.agg(funcao)
+                partes.update({f"{m}_{nome}": agregado[m] for m in metricas})
+            for nome, quantil in _QUANTIS.items():
+                agregado = grupos.quantile(quantil)
+                partes.update({f"{m}_{nome}": agregado[m] for m in metricas})
+
+            nivel = pd.DataFrame(partes).reset_index()
+            for dimensao in (DIM_MODALIDADE, DIM_MARCA):
+                if dimensao not in dimensoes:
+                    nivel[dimensao] = TODOS
+            niveis.append(nivel)
+
+        tabela = pd.concat(niveis, ignore_index=True)
+        tabela["qtd"] = tabela["qtd"].astype("int64")
+        return tabela.set_index([Colunas.TRIMESTRE, DIM_MODALIDADE, DIM_MARCA]).sort_index()
+
+    def marca_de(self, df: pd.DataFrame) -> pd.Series:
+        """Marca de cada linha de um recorte do Dataset Mestre (mesmo índice do df)."""
+        if df.empty:
+            return pd.Series(dtype=object, index=df.index)
+        chaves = garantir_chaves(df)[Colunas.ID_OPERADORA_KEY]
+        marcas = chaves.map(self._marca_por_operadora)
+        ausentes = marcas.isna()
+        if ausentes.any():
+            marcas[ausentes] = [
+                extrair_marca(razao, id_op)
+                for id_op, razao in zip(df.loc[ausentes, Colunas.ID_OPERADORA], df.loc[ausentes, Colunas.RAZAO_SOCIAL])
+            ]
+        return marcas.astype(object)
+
+    def estatisticas(self, trimestre, modalidade: Optional[str] = None, marca: Optional[str] = None) -> pd.Series:
+        """Linha do cubo para a célula pedida (None = todas). Série vazia se não houver dados."""
+        chave = (str(trimestre), modalidade or TODOS, marca or TODOS)
+        if self.tabela.empty or chave not in self.tabela.index:
+            return pd.Series(dtype="float64")
+        return self.tabela.loc[chave]
+
+    def valor(self, trimestre, metrica: str, estatistica: str, modalidade: Optional[str] = None,
+              marca: Optional[str] = None, padrao=np.nan):
+        """Ex: valor('2024-T1', 'VAR_PCT_RECEITA', 'mediana') -> mediana de mercado no trimestre."""
+        linha = self.estatisticas(trimestre, modalidade, marca)
+        coluna = "qtd" if estatistica == "qtd" else f"{metrica}_{estatistica}"
+        if coluna not in linha.index or pd.isna(linha[coluna]):
+            return padrao
+        return linha[coluna]
+
+    def serie(self, metrica: str, estatistica: str, modalidade: Optional[str] = None,
+              marca: Optional[str] = None) -> pd.Series:
+        """Série histórica (índice ID_TRIMESTRE, ordem cronológica) de uma estatística."""
+        coluna = "qtd" if estatistica == "qtd" else f"{metrica}_{estatistica}"
+        if self.tabela.empty or coluna not in self.tabela.columns:
+            return pd.Series(dtype="float64", name=coluna)
+        fatia = self.tabela.xs((modalidade or TODOS, marca or TODOS), level=(DIM_MODALIDADE, DIM_MARCA))[coluna]
+        ordem = sorted(fatia.index, key=lambda t: (trimestre_para_ordinal(t) is None, trimestre_para_ordinal(t) or 0, t))
+        return fatia.reindex(ordem)
+
+
+# --- CACHE POR DATASET ---
+# O Dataset Mestre é um objeto único por versão (cache do Streamlit / snapshot),
+# então a identidade do DataFrame é a chave. A weakref invalida a entrada quando ele é coletado.
+_CUBOS: Dict[int, Tuple[weakref.ref, CuboMercado]] = {}
+_LOCK_CUBOS = threading.RLock()
+
+
+def obter_cubo(df_mestre: pd.DataFrame) -> CuboMercado:
+    """Cubo do dataset informado; construído na primeira chamada e reutilizado depois."""
+    chave = id(df_mestre)
+    with _LOCK_CUBOS:
+        entrada = _CUBOS.get(chave)
+        if entrada is not None and entrada[0]() is df_mestre:
+            return entrada[1]
+
+    cubo = CuboMercado(df_mestre)
+    with _LOCK_CUBOS:
+        _CUBOS[chave] = (weakref.ref(df_mestre, _descartar_cubo), cubo)
+    return cubo
+
+
+def _descartar_cubo(referencia: weakref.ref):
+    with _LOCK_CUBOS:
+        for chave, (ref, _cubo) in list(_CUBOS.items()):
+            if ref is referencia:
+                del _CUBOS[chave]
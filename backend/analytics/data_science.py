@@ -3,6 +3,7 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
+from backend.processing.chaves import filtrar_trimestre
 
 def calcular_correlacoes(df_mestre):
     """
@@ -24,7 +25,7 @@ def preparar_dados_segmentacao(df_mestre, trimestre):
     Prepara os dados para o gráfico de quadrantes (Scatter Plot).
     Eixos: Crescimento (Y) vs Market Share (X).
     """
-    df_tri = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+    df_tri = filtrar_trimestre(df_mestre, trimestre).copy()
     
     # Calcula Market Share
     total_receita = df_tri['VL_SALDO_FINAL'].sum()
@@ -41,7 +42,7 @@ def calcular_outliers_ticket(df_mestre, trimestre):
     """
     Prepara dados para análise de distribuição de Ticket Médio por Modalidade.
     """
-    df_tri = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+    df_tri = filtrar_trimestre(df_mestre, trimestre).copy()
     df_tri['Ticket_Medio'] = df_tri['VL_SALDO_FINAL'] / df_tri['NR_BENEF_T']
     
     # Remove infinitos e nulos
@@ -53,7 +54,7 @@ def _preparar_dados_clustering(df_mestre, trimestre):
     """
     Prepara os dados: Log em Vidas/Receita, cria Ticket Médio e remove NaNs.
     """
-    df_tri = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+    df_tri = filtrar_trimestre(df_mestre, trimestre).copy()
     
     # Features Logarítmicas (para reduzir escala de gigantes)
     df_tri['Log_Vidas'] = np.log1p(df_tri['NR_BENEF_T'].clip(lower=0))
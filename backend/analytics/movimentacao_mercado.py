@@ -1,26 +1,28 @@
 import pandas as pd
 import numpy as np
 from backend.analytics.brand_intelligence import extrair_marca
+from backend.processing.chaves import filtrar_trimestre
 
 def calcular_fluxo_entrada_saida(df_mestre, trimestre_ref, trimestre_comp):
     """
     Identifica operadoras que entraram e saíram do mercado entre dois trimestres.
     """
     # 1. Filtrar os dados dos dois períodos
-    df_ref = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre_ref].copy()
-    df_comp = df_mestre[df_mestre['ID_TRIMESTRE'] == trimestre_comp].copy()
+    df_ref = filtrar_trimestre(df_mestre, trimestre_ref).copy()
+    df_comp = filtrar_trimestre(df_mestre, trimestre_comp).copy()
     
-    # 2. Extrair conjuntos de IDs únicos
-    ids_ref = set(df_ref['ID_OPERADORA'].unique())
-    ids_comp = set(df_comp['ID_OPERADORA'].unique())
+    # 2. Extrair conjuntos de IDs únicos (chave inteira quando disponível)
+    col_id = 'ID_OPERADORA_KEY' if 'ID_OPERADORA_KEY' in df_mestre.columns else 'ID_OPERADORA'
+    ids_ref = set(df_ref[col_id].unique())
+    ids_comp = set(df_comp[col_id].unique())
     
     # 3. Calcular Diferenças
     ids_novos = ids_ref - ids_comp      # Entrantes
     ids_excluidos = ids_comp - ids_ref  # Saintes
     
     # 4. Recuperar dados detalhados
-    df_entrantes = df_ref[df_ref['ID_OPERADORA'].isin(ids_novos)].copy()
-    df_saintes = df_comp[df_comp['ID_OPERADORA'].isin(ids_excluidos)].copy()
+    df_entrantes = df_ref[df_ref[col_id].isin(ids_novos)].copy()
+    df_saintes = df_comp[df_comp[col_id].isin(ids_excluidos)].copy()
     
     return df_entrantes, df_saintes
 
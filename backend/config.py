@@ -8,10 +8,49 @@ class Settings:
     DATA_DIR = ROOT_DIR / "data"
     DB_PATH = DATA_DIR / "base_ans_paralela.db"
     
+    # Pool de Conexões SQLite (somente leitura, uma conexão por thread em uso)
+    SQLITE_POOL_MAX_CONEXOES = 8
+    SQLITE_POOL_TIMEOUT = 30.0
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024   # bytes
+    SQLITE_CACHE_SIZE_KB = 64 * 1024       # KiB por conexão
+    SQLITE_USAR_WAL = True
+    # Na primeira carga do processo: cria índices ausentes e checa planos (EXPLAIN QUERY PLAN)
+    MANUTENCAO_AUTOMATICA = True
+    # Linhas por lote nas leituras em streaming (fetchmany) das tabelas fato
+    TAMANHO_LOTE_STREAMING = 100_000
+    
     # Caminhos de Queries
     QUERIES_DIR = ROOT_DIR / "queries"
     ETL_QUERIES = QUERIES_DIR / "etl"
     FILTER_QUERIES = QUERIES_DIR / "filtros"
+    GOLD_QUERIES = QUERIES_DIR / "gold"
+
+    # Cache Colunar do Dataset Mestre (Gold Layer)
+    CACHE_DIR = DATA_DIR / "cache"
+    USAR_SNAPSHOT = True
+    # Nova carga da ANS: anexa apenas os trimestres >= watermark do snapshot
+    ATUALIZACAO_INCREMENTAL = True
+    # Dimensões repetidas como category e métricas reduzidas (int32/float32) quando sem perda
+    COMPACTAR_DATASET = True
+    # Contrato do Dataset Mestre: "rapido" (vetorizado), "auditoria" (Pandera) ou "desligado"
+    MODO_VALIDACAO = "rapido"
+    # Acesso particionado (DataEngine.get_quarter / get_operator_history):
+    # um arquivo Arrow por trimestre e no máximo N trimestres decodificados em memória
+    PARTICOES_EM_MEMORIA = 8
+
+    # Modo "SQL-native gold": consolidação feita pelo SQLite (tabela gold_mestre materializada)
+    MODO_GOLD_SQL = False
+
+    # Backend analítico da consolidação: "sqlite" (Pandas / SQL-native acima) ou "duckdb"
+    # (join, janelas e KPIs vetorizados no DuckDB, dependência opcional: pip install duckdb)
+    BACKEND_ANALITICO = "sqlite"
+    DUCKDB_THREADS = 0                 # 0 = todos os núcleos
+    DUCKDB_LIMITE_MEMORIA = None       # ex: "2GB"; None = padrão do DuckDB
+    # Pasta com exports Parquet das tabelas (ConexaoDuckDB.exportar_parquet); None = lê o SQLite
+    DUCKDB_PARQUET_DIR = None
+
+    # ETL: downloads e resultados processados das fontes da ANS, endereçados por sha256
+    ETL_CACHE_DIR = DATA_DIR / "cache" / "fontes_ans"
 
     # Configurações de Negócio
     DATA_CORTE_INICIO = '2012-T1'
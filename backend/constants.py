@@ -6,6 +6,9 @@ class Colunas:
     CD_OPERADORA = "CD_OPERADO"
     REG_ANS_FIN = "REG_ANS"
     TRIMESTRE = "ID_TRIMESTRE"
+    # Chaves substitutas inteiras (ver backend/processing/chaves.py)
+    ID_OPERADORA_KEY = "ID_OPERADORA_KEY"
+    TRIMESTRE_ORD = "TRIMESTRE_ORD"
     
     # Dimensões
     RAZAO_SOCIAL = "razao_social"
@@ -26,6 +29,11 @@ class Colunas:
     VAR_RECEITA = "VAR_PCT_RECEITA"
     CUSTO_VIDA = "CUSTO_POR_VIDA"
 
+class GruposColunas:
+    """Grupos de colunas da dimensão carregados sob demanda (fora do Dataset Mestre)"""
+    CADASTRAL = "cadastral"                  # representante, cargo_representante, Data_Registro_ANS
+    DESCREDENCIAMENTO = "descredenciamento"  # descredenciada_em, descredenciamento_motivo
+
 class Negocio:
     """Regras de Negócio Globais"""
     DATA_CORTE_INICIO = "2012-T1"
\ No newline at end of file
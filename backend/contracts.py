@@ -1,6 +1,13 @@
+import numpy as np
+import pandas as pd
 import pandera.pandas as pa
 from pandera.typing import Series
 
+# Domínio de UFs válidas (compartilhado entre o SchemaMestre e o validador rápido)
+UFS_VALIDAS = ['SP', 'RJ', 'MG', 'ES', 'RS', 'SC', 'PR', 'BA', 'PE', 
+               'CE', 'DF', 'GO', 'MT', 'MS', 'AM', 'PA', 'RO', 'RR', 
+               'AP', 'TO', 'MA', 'PI', 'RN', 'PB', 'AL', 'SE', 'AC']
+
 class SchemaMestre(pa.DataFrameModel):
     """
     Contrato de Dados para o Dataset Mestre (Gold Layer).
@@ -15,12 +22,7 @@ class SchemaMestre(pa.DataFrameModel):
     razao_social: Series[str] = pa.Field(nullable=True)
     cidade: Series[str] = pa.Field(nullable=True)
     # Lista atualizada de UFs válidas
-    uf: Series[str] = pa.Field(
-        isin=['SP', 'RJ', 'MG', 'ES', 'RS', 'SC', 'PR', 'BA', 'PE', 
-              'CE', 'DF', 'GO', 'MT', 'MS', 'AM', 'PA', 'RO', 'RR', 
-              'AP', 'TO', 'MA', 'PI', 'RN', 'PB', 'AL', 'SE', 'AC'], 
-        nullable=True
-    )
+    uf: Series[str] = pa.Field(isin=UFS_VALIDAS, nullable=True)
     modalidade: Series[str] = pa.Field(nullable=True)
     
     # Métricas Críticas
@@ -31,4 +33,67 @@ class SchemaMestre(pa.DataFrameModel):
     CUSTO_POR_VIDA: Series[float] = pa.Field(nullable=True)
 
     class Config:
-        strict = False # Permite colunas extras, mas valida as declaradas acima
\ No newline at end of file
+        strict = False # Permite colunas extras, mas valida as declaradas acima
+
+
+def _valores_unicos(serie: pd.Series) -> np.ndarray:
+    """Únicos não nulos (em category lê direto das categorias usadas, sem varrer as linhas)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return np.asarray(serie.cat.remove_unused_categories().cat.categories, dtype=object)
+    return serie.dropna().unique()
+
+def _eh_texto(serie: pd.Series) -> bool:
+    return (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)
+            or isinstance(serie.dtype, pd.CategoricalDtype))
+
+def validar_mestre_rapido(df: pd.DataFrame) -> list:
+    """
+    Validador vetorizado do Dataset Mestre (caminho rápido), com a mesma semântica dos
+    campos declarados em SchemaMestre: presença, nulos, tamanho da chave, domínio de UF,
+    coerção numérica, faixa de vidas e dtypes. Checagens de texto rodam sobre os valores
+    únicos. Retorna a lista de violações (vazia = contrato atendido).
+    O SchemaMestre (Pandera) segue como modo "auditoria".
+    """
+    campos = SchemaMestre.to_schema().columns
+    ausentes = [c for c in campos if c not in df.columns]
+    erros = [f"Colunas ausentes: {ausentes}"] if ausentes else []
+
+    def _presente(coluna):
+        return coluna in df.columns
+
+    # Chaves (coerce=True para str; não anuláveis)
+    for coluna in ('ID_TRIMESTRE', 'ID_OPERADORA'):
+        if _presente(coluna) and df[coluna].isna().any():
+            erros.append(f"{coluna}: {int(df[coluna].isna().sum())} valores nulos")
+    if _presente('ID_OPERADORA'):
+        tamanhos = {len(str(v)) for v in _valores_unicos(df['ID_OPERADORA'])}
+        if tamanhos - {6}:
+            erros.append(f"ID_OPERADORA: chaves com tamanho diferente de 6 ({sorted(tamanhos - {6})})")
+
+    # Dimensões texto (anuláveis)
+    for coluna in ('razao_social', 'cidade', 'uf', 'modalidade'):
+        if _presente(coluna) and not _eh_texto(df[coluna]):
+            erros.append(f"{coluna}: dtype {df[coluna].dtype} não é texto")
+    if _presente('uf'):
+        invalidas = set(_valores_unicos(df['uf'])) - set(UFS_VALIDAS)
+        if invalidas:
+            erros.append(f"uf: valores fora do domínio {sorted(map(str, invalidas))}")
+
+    # Métricas (coerce=True; não anuláveis)
+    for coluna in ('NR_BENEF_T', 'VL_SALDO_FINAL'):
+        if not _presente(coluna):
+            continue
+        numerico = df[coluna] if pd.api.types.is_numeric_dtype(df[coluna]) else pd.to_numeric(df[coluna], errors='coerce')
+        if numerico.isna().any():
+            erros.append(f"{coluna}: {int(numerico.isna().sum())} valores nulos ou não numéricos")
+        elif coluna == 'NR_BENEF_T':
+            if not np.isfinite(numerico.to_numpy(dtype=float)).all():
+                erros.append("NR_BENEF_T: valores infinitos (não conversíveis para int)")
+            elif (numerico < 0).any():
+                erros.append(f"NR_BENEF_T: {int((numerico < 0).sum())} valores negativos")
+
+    # KPI (sem coerção: dtype precisa ser float64)
+    if _presente('CUSTO_POR_VIDA') and df['CUSTO_POR_VIDA'].dtype != np.float64:
+        erros.append(f"CUSTO_POR_VIDA: dtype {df['CUSTO_POR_VIDA'].dtype}, esperado float64")
+
+    return erros
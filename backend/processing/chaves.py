@@ -0,0 +1,90 @@
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from backend.constants import Colunas
+
+# Chaves substitutas do Dataset Mestre:
+#   ID_OPERADORA '000123'  -> ID_OPERADORA_KEY 123 (int32)
+#   ID_TRIMESTRE '2012-T1' -> TRIMESTRE_ORD 0     (int16, +1 por trimestre)
+# Filtros, joins, sorts e deslocamentos (QoQ/YoY) usam os inteiros;
+# as strings ficam apenas na fronteira com a UI (seleções e rótulos).
+ANO_BASE = 2012
+SEM_CHAVE = -1
+
+_RE_TRIMESTRE = re.compile(r"^\s*(\d{4})-T([1-4])\s*$")
+
+
+def chave_operadora(id_operadora) -> int:
+    """'000123', 123, '123.0' -> 123. Registros não numéricos viram SEM_CHAVE."""
+    texto = str(id_operadora).split('.')[0].strip()
+    return int(texto) if texto.isdigit() else SEM_CHAVE
+
+
+def trimestre_para_ordinal(trimestre) -> Optional[int]:
+    """'2012-T1' -> 0, '2013-T2' -> 5. Retorna None se o formato for inválido."""
+    encontrado = _RE_TRIMESTRE.match(str(trimestre))
+    if not encontrado:
+        return None
+    return (int(encontrado.group(1)) - ANO_BASE) * 4 + int(encontrado.group(2)) - 1
+
+
+def ordinal_para_trimestre(ordinal: int) -> str:
+    """Inverso de trimestre_para_ordinal (aceita negativos: -1 -> '2011-T4')."""
+    ano, indice = divmod(int(ordinal), 4)
+    return f"{ANO_BASE + ano}-T{indice + 1}"
+
+
+def _converter_por_unicos(serie: pd.Series, conversor, dtype) -> pd.Series:
+    """Aplica o conversor escalar só nos valores únicos (poucas operadoras/trimestres, muitas linhas)."""
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+    convertidos = np.array([conversor(v) for v in unicos], dtype=np.int64)
+    return pd.Series(convertidos.take(codigos).astype(dtype), index=serie.index)
+
+
+def serie_chave_operadora(serie: pd.Series) -> pd.Series:
+    return _converter_por_unicos(serie, chave_operadora, np.int32)
+
+
+def serie_ordinal_trimestre(serie: pd.Series) -> pd.Series:
+    def _ordinal(trimestre):
+        ordinal = trimestre_para_ordinal(trimestre)
+        return SEM_CHAVE if ordinal is None else ordinal
+    return _converter_por_unicos(serie, _ordinal, np.int16)
+
+
+def adicionar_chaves(df: pd.DataFrame) -> pd.DataFrame:
+    """Acrescenta ID_OPERADORA_KEY e TRIMESTRE_ORD a partir das chaves texto."""
+    if df.empty:
+        return df
+    df = df.copy()
+    if Colunas.ID_OPERADORA in df.columns:
+        df[Colunas.ID_OPERADORA_KEY] = serie_chave_operadora(df[Colunas.ID_OPERADORA])
+    if Colunas.TRIMESTRE in df.columns:
+        df[Colunas.TRIMESTRE_ORD] = serie_ordinal_trimestre(df[Colunas.TRIMESTRE])
+    return df
+
+
+def garantir_chaves(df: pd.DataFrame) -> pd.DataFrame:
+    """Devolve o próprio df se já tiver as chaves (caso do Dataset Mestre); senão as calcula."""
+    if Colunas.ID_OPERADORA_KEY in df.columns and Colunas.TRIMESTRE_ORD in df.columns:
+        return df
+    return adicionar_chaves(df)
+
+
+def filtrar_trimestre(df: pd.DataFrame, trimestre) -> pd.DataFrame:
+    """df[ID_TRIMESTRE == trimestre] via ordinal int16 (fallback para texto se a chave não existir)."""
+    ordinal = trimestre_para_ordinal(trimestre)
+    if Colunas.TRIMESTRE_ORD in df.columns and ordinal is not None:
+        return df[df[Colunas.TRIMESTRE_ORD] == ordinal]
+    return df[df[Colunas.TRIMESTRE] == trimestre]
+
+
+def filtrar_operadora(df: pd.DataFrame, id_operadora) -> pd.DataFrame:
+    """df[ID_OPERADORA == id] via chave int32 (fallback: compara o texto normalizado para 6 dígitos)."""
+    chave = chave_operadora(id_operadora)
+    if Colunas.ID_OPERADORA_KEY in df.columns and chave != SEM_CHAVE:
+        return df[df[Colunas.ID_OPERADORA_KEY] == chave]
+    id_busca = str(id_operadora).split('.')[0].strip().zfill(6)
+    return df[df[Colunas.ID_OPERADORA].astype(str).str.split('.').str[0].str.strip().str.zfill(6) == id_busca]
@@ -13,15 +13,36 @@ class DataProcessor:
         """Padroniza chaves (ex: Registro ANS) para 6 dígitos string."""
         if df.empty:
             return df
-            
-        def _normalizar(valor):
-            return str(valor).split('.')[0].strip().zfill(6)
 
         for col in colunas:
             if col in df.columns:
-                df[col] = df[col].apply(_normalizar)
+                df[col] = DataProcessor._normalizar_serie_chave(df[col])
         return df
 
+    @staticmethod
+    def _normalizar_serie_chave(serie: pd.Series) -> pd.Series:
+        """
+        Equivalente vetorizado de str(valor).split('.')[0].strip().zfill(6).
+        As chaves se repetem a cada trimestre (~1.5k operadoras para milhões de linhas),
+        então fatoramos a coluna (hash em C) e aplicamos as operações de string
+        apenas sobre os valores únicos, reexpandindo pelos códigos.
+        """
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+        texto = pd.Index(unicos).astype(str)
+
+        if not pd.api.types.is_integer_dtype(unicos.dtype):
+            # Remove a parte decimal ('456.0' -> '456') e espaços; inteiros não precisam
+            texto = texto.str.replace(r'(?s)\..*', '', regex=True).str.strip()
+
+        normalizados = np.asarray(texto.str.zfill(6), dtype=object).take(codigos)
+
+        # factorize agrupa None/NaN/NA num único código; os (raros) nulos mantêm o str() original
+        if pd.isna(unicos).any():
+            nulos = serie.isna().to_numpy()
+            normalizados[nulos] = [str(v).split('.')[0].strip().zfill(6) for v in serie[nulos]]
+
+        return pd.Series(normalizados, index=serie.index, name=serie.name)
+
     @staticmethod
     def aplicar_filtro_temporal(df: pd.DataFrame, coluna_tempo: str, data_corte: str) -> pd.DataFrame:
         if df.empty or coluna_tempo not in df.columns:
@@ -57,4 +78,49 @@ class DataProcessor:
             df[Colunas.RECEITA] / df[Colunas.VIDAS], 
             0
         )
-        return df
\ No newline at end of file
+        return df
+
+    @staticmethod
+    def compactar_tipos(df: pd.DataFrame, colunas_categoricas: list, colunas_ordenadas: list,
+                        colunas_contagem: list, colunas_decimais: list,
+                        limite_cardinalidade: float = 0.5) -> pd.DataFrame:
+        """
+        Reduz o footprint do DataFrame sem perda de informação.
+        - Textos repetidos viram category (ordenada quando a ordem lexical importa, ex: trimestre).
+        - Contagens (ex: vidas) viram int32 quando todos os valores são inteiros e cabem no tipo.
+        - Contagens e decimais viram float32 quando o round-trip é exato; senão ficam como estão.
+        """
+        if df.empty:
+            return df
+
+        df = df.copy()
+        for col in colunas_categoricas + colunas_ordenadas:
+            if col not in df.columns or isinstance(df[col].dtype, pd.CategoricalDtype):
+                continue
+            if df[col].nunique(dropna=True) <= limite_cardinalidade * len(df):
+                valores = df[col].astype(object).where(df[col].notna(), None)
+                df[col] = pd.Categorical(valores, ordered=col in colunas_ordenadas)
+
+        for col in colunas_contagem + colunas_decimais:
+            if col in df.columns:
+                df[col] = DataProcessor._reduzir_metrica(df[col], permitir_inteiro=col in colunas_contagem)
+        return df
+
+    @staticmethod
+    def _reduzir_metrica(serie: pd.Series, permitir_inteiro: bool) -> pd.Series:
+        """Downcast sem perda: int32 se inteiro e dentro do limite, float32 se exato, senão original."""
+        if not pd.api.types.is_numeric_dtype(serie) or serie.isna().any():
+            return serie
+
+        valores = serie.to_numpy()
+        limites = np.iinfo(np.int32)
+        if (permitir_inteiro and np.all(np.isfinite(valores)) and np.array_equal(valores, np.trunc(valores))
+                and valores.min(initial=0) >= limites.min and valores.max(initial=0) <= limites.max):
+            return serie.astype(np.int32)
+
+        if pd.api.types.is_float_dtype(serie) and serie.dtype.itemsize > 4:
+            reduzido = valores.astype(np.float32)
+            with np.errstate(over='ignore', invalid='ignore'):
+                if np.array_equal(reduzido.astype(serie.dtype), valores):
+                    return serie.astype(np.float32)
+        return serie
@@ -0,0 +1,163 @@
+import re
+import time
+import hashlib
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Tuple, Union
+
+from backend.exceptions import DataLoadError
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Metadados declarados no cabeçalho do arquivo .sql:
+#   -- @params: trimestre_inicial
+#   -- @colunas: CD_OPERADO, ID_TRIMESTRE, NR_BENEF_T
+#   -- @scan: permitido   (leitura integral intencional; não alerta na checagem de planos)
+_RE_METADADO = re.compile(r"^\s*--\s*@(params|colunas|scan)\s*:(.*)$", re.MULTILINE)
+_RE_COMENTARIO = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_PARAM_NOMEADO = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+@dataclass(frozen=True)
+class ConsultaSQL:
+    """Query compilada: texto + checksum (sha256 do arquivo) + metadados declarados/inferidos."""
+    nome: str
+    sql: str
+    checksum: str
+    parametros: Tuple[str, ...]
+    colunas: Tuple[str, ...]
+    caminho: Path
+    mtime_ns: int
+    scan_permitido: bool = False
+
+    @property
+    def somente_leitura(self) -> bool:
+        """SELECT/WITH de instrução única (candidata a EXPLAIN QUERY PLAN)."""
+        corpo = _RE_STRING.sub("''", _RE_COMENTARIO.sub("", self.sql)).strip().rstrip(";")
+        if not corpo or ";" in corpo:
+            return False
+        return corpo.split(None, 1)[0].upper() in ("SELECT", "WITH")
+
+    def parametros_nulos(self):
+        """Parâmetros com valor None no formato esperado pela query (dict nomeado ou tupla posicional)."""
+        corpo = _RE_STRING.sub("''", _RE_COMENTARIO.sub("", self.sql))
+        nomeados = _RE_PARAM_NOMEADO.findall(corpo)
+        if nomeados:
+            return {nome: None for nome in nomeados}
+        return (None,) * corpo.count("?")
+
+
+class QueryRegistry:
+    """
+    Catálogo das queries em 'queries/': cada arquivo é lido e checksumado uma única vez.
+    Queries são expostas pelo nome relativo sem extensão (ex: 'etl/load_beneficiarios').
+    Hot-reload: no máximo a cada 'intervalo_verificacao' segundos o diretório é varrido
+    (apenas stat); só arquivos com mtime alterado são relidos.
+    """
+
+    _instancias: Dict[Path, "QueryRegistry"] = {}
+    _lock_instancias = threading.Lock()
+
+    def __init__(self, diretorio: Union[str, Path], intervalo_verificacao: float = 2.0):
+        """
+        Args:
+            diretorio: Raiz das queries (settings.QUERIES_DIR).
+            intervalo_verificacao (float): Segundos entre varreduras de mtime (0 = a cada acesso).
+        """
+        self.diretorio = Path(diretorio).resolve()
+        self.intervalo_verificacao = intervalo_verificacao
+        self._consultas: Dict[str, ConsultaSQL] = {}
+        self._lock = threading.RLock()
+        self._ultima_verificacao = 0.0
+        self._recarregar()
+
+    @classmethod
+    def para_diretorio(cls, diretorio: Union[str, Path]) -> "QueryRegistry":
+        """Instância compartilhada por diretório (todas as sessões/engines usam o mesmo catálogo)."""
+        chave = Path(diretorio).resolve()
+        with cls._lock_instancias:
+            if chave not in cls._instancias:
+                cls._instancias[chave] = cls(chave)
+            return cls._instancias[chave]
+
+    @staticmethod
+    def _compilar(nome: str, caminho: Path, mtime_ns: int) -> ConsultaSQL:
+        conteudo = caminho.read_bytes()
+        sql = conteudo.decode("utf-8")
+
+        declarados = {chave: valor for chave, valor in _RE_METADADO.findall(sql)}
+        if "params" in declarados:
+            parametros = tuple(p.strip() for p in declarados["params"].split(",") if p.strip())
+        else:
+            # Inferência: placeholders fora de comentários e strings ('?' posicional ou ':nome')
+            corpo = _RE_STRING.sub("''", _RE_COMENTARIO.sub("", sql))
+            nomeados = tuple(dict.fromkeys(_RE_PARAM_NOMEADO.findall(corpo)))
+            parametros = nomeados or tuple(f"?{i}" for i in range(1, corpo.count("?") + 1))
+        colunas = tuple(c.strip() for c in declarados.get("colunas", "").split(",") if c.strip())
+
+        return ConsultaSQL(
+            nome=nome,
+            sql=sql,
+            checksum=hashlib.sha256(conteudo).hexdigest(),
+            parametros=parametros,
+            colunas=colunas,
+            caminho=caminho,
+            mtime_ns=mtime_ns,
+            scan_permitido=declarados.get("scan", "").strip().lower() == "permitido"
+        )
+
+    def _recarregar(self):
+        """Varre o diretório e (re)compila apenas arquivos novos ou com mtime alterado."""
+        with self._lock:
+            encontrados = {}
+            for caminho in sorted(self.diretorio.rglob("*.sql")):
+                nome = caminho.relative_to(self.diretorio).with_suffix("").as_posix()
+                mtime_ns = caminho.stat().st_mtime_ns
+                atual = self._consultas.get(nome)
+                if atual is not None and atual.mtime_ns == mtime_ns:
+                    encontrados[nome] = atual
+                else:
+                    encontrados[nome] = self._compilar(nome, caminho, mtime_ns)
+                    if atual is not None:
+                        logger.info(f"Query '{nome}' recarregada (arquivo alterado).")
+
+            self._consultas = encontrados
+            self._ultima_verificacao = time.monotonic()
+
+    def _verificar_alteracoes(self):
+        if time.monotonic() - self._ultima_verificacao >= self.intervalo_verificacao:
+            self._recarregar()
+
+    def _normalizar_nome(self, nome: Union[str, Path]) -> str:
+        """Aceita 'etl/load_x', 'etl/load_x.sql' ou um caminho absoluto dentro do diretório."""
+        caminho = Path(nome)
+        if caminho.is_absolute():
+            try:
+                caminho = caminho.resolve().relative_to(self.diretorio)
+            except ValueError:
+                raise DataLoadError(f"Query fora do diretório registrado ({self.diretorio}): {nome}")
+        return caminho.with_suffix("").as_posix() if caminho.suffix == ".sql" else caminho.as_posix()
+
+    def obter(self, nome: Union[str, Path]) -> ConsultaSQL:
+        """Retorna a query compilada pelo nome. Lança DataLoadError se não existir."""
+        self._verificar_alteracoes()
+        nome_normalizado = self._normalizar_nome(nome)
+        consulta = self._consultas.get(nome_normalizado)
+        if consulta is None:
+            raise DataLoadError(f"Query não registrada: '{nome_normalizado}'")
+        return consulta
+
+    def listar(self, prefixo: str = "") -> Tuple[ConsultaSQL, ...]:
+        self._verificar_alteracoes()
+        return tuple(c for nome, c in sorted(self._consultas.items()) if nome.startswith(prefixo))
+
+    def versao(self, *prefixos: str) -> str:
+        """Hash estável do conjunto de queries (opcionalmente só das pastas informadas)."""
+        h = hashlib.sha256()
+        for consulta in self.listar():
+            if not prefixos or consulta.nome.startswith(prefixos):
+                h.update(f"{consulta.nome}|{consulta.checksum}".encode())
+        return h.hexdigest()
@@ -1,20 +1,53 @@
-import os
 import pandas as pd
+from typing import Iterator
 from infra.db_connector import ConexaoSQLite
+from backend.query_registry import QueryRegistry
+from backend.constants import GruposColunas
+from backend.exceptions import DataLoadError
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AnsRepository:
-    def __init__(self, connector: ConexaoSQLite, queries_path:str):
+    # Grupo de colunas sob demanda -> query (uma linha por operadora, chave registro_operadora)
+    QUERIES_GRUPOS = {
+        GruposColunas.CADASTRAL: "dimensao/grupo_cadastral",
+        GruposColunas.DESCREDENCIAMENTO: "dimensao/grupo_descredenciamento",
+    }
+
+    def __init__(self, connector: ConexaoSQLite, queries_path:str, registry: QueryRegistry = None):
         self.connector = connector
         self.queries_path = queries_path
+        # Catálogo compartilhado: os .sql são lidos uma vez, não a cada chamada
+        self.registry = registry or QueryRegistry.para_diretorio(queries_path)
 
     def _ler_arquivo_sql(self, nome_arquivo:str) -> str:
-        caminho = os.path.join(self.queries_path, nome_arquivo)
-        with open (caminho,'r', encoding='utf-8') as f:
-            return f.read()
+        return self.registry.obter(nome_arquivo).sql
 
     def buscar_dados_brutos(self, nome_query: str, parametros: dict = None) -> pd.DataFrame:
         """Busca o SQL pelo nome e manda a execução para o connector
         """
+        consulta = self.registry.obter(nome_query)
+        df = self.connector.executar_query(consulta.sql, parametros=parametros)
+        if consulta.colunas and not df.empty:
+            ausentes = set(consulta.colunas) - set(df.columns)
+            if ausentes:
+                logger.warning(f"Query '{consulta.nome}' sem as colunas declaradas: {sorted(ausentes)}")
+        return df
+
+    def buscar_dados_streaming(self, nome_query: str, parametros: tuple = None, tamanho_lote: int = 50_000,
+                               formato: str = "pandas") -> Iterator:
+        """Igual ao buscar_dados_brutos, mas devolve um gerador de lotes (DataFrame ou RecordBatch)."""
+        sql = self._ler_arquivo_sql(nome_arquivo=nome_query)
+        yield from self.connector.executar_query_stream(sql, parametros, tamanho_lote=tamanho_lote, formato=formato)
+
+    def buscar_grupo_colunas(self, grupo: str) -> pd.DataFrame:
+        """Busca um grupo de colunas da dimensão (projeção fora do núcleo do Dataset Mestre)."""
+        if grupo not in self.QUERIES_GRUPOS:
+            raise DataLoadError(f"Grupo de colunas desconhecido: '{grupo}' (disponíveis: {sorted(self.QUERIES_GRUPOS)})")
+        return self.buscar_dados_brutos(self.QUERIES_GRUPOS[grupo])
+
+    def executar_script(self, nome_query: str, parametros: dict = None) -> None:
+        """Busca um script SQL (várias instruções) pelo nome e executa via connector."""
         sql = self._ler_arquivo_sql(nome_arquivo=nome_query)
-        return self.connector.executar_query(sql, parametros=parametros)
-        
\ No newline at end of file
+        self.connector.executar_script(sql, parametros=parametros)
@@ -1,19 +1,50 @@
+import os
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from infra.db_connector import ConexaoSQLite
+from infra.db_connector import ConexaoSQLite, PoolConexoesSQLite
+from infra.duckdb_connector import ConexaoDuckDB
+from infra.snapshot_store import SnapshotArrow, SnapshotParticionado
+from infra.db_maintenance import ManutencaoSQLite
 from backend.repository import AnsRepository
 from backend.config import settings
 from backend.processing.processor import DataProcessor
+from backend.processing.chaves import adicionar_chaves, chave_operadora, SEM_CHAVE
 from backend.logger import get_logger
-from backend.contracts import SchemaMestre
+from backend.contracts import SchemaMestre, validar_mestre_rapido
 from backend.constants import Colunas, Negocio
 
 logger = get_logger(__name__)
 
 class DataEngine:
+    # Incrementar sempre que a lógica do pipeline mudar o formato do Dataset Mestre
+    # (invalida snapshots gravados por versões anteriores)
+    VERSAO_PIPELINE = 3
+
+    # Resultado da validação por (fingerprint, modo): o mesmo dataset nunca é validado duas vezes
+    _VALIDACOES: dict = {}
+    # Bancos já preparados (índices + checagem de planos) neste processo
+    _BANCOS_PREPARADOS: set = set()
+    # Grupos de colunas sob demanda: (banco, grupo) -> (fingerprint, frame indexado por ID_OPERADORA)
+    _GRUPOS_COLUNAS: dict = {}
+    # Armazenamento particionado por trimestre, um por diretório de cache (o LRU é do processo)
+    _PARTICIONADOS: dict = {}
+
     def __init__(self):
-        # 1. Infraestrutura (Conexão) - Agora usa settings.DB_PATH
+        # 1. Infraestrutura (Conexão) - Pool somente-leitura sobre settings.DB_PATH
         # Idealmente, injetaríamos isso no __init__, mas manteremos assim por enquanto
-        self.connector = ConexaoSQLite(str(settings.DB_PATH))
+        self.connector = PoolConexoesSQLite(
+            str(settings.DB_PATH),
+            max_conexoes=settings.SQLITE_POOL_MAX_CONEXOES,
+            timeout=settings.SQLITE_POOL_TIMEOUT,
+            mmap_size=settings.SQLITE_MMAP_SIZE,
+            cache_size_kb=settings.SQLITE_CACHE_SIZE_KB,
+            usar_wal=settings.SQLITE_USAR_WAL
+        )
         
         # 2. Repositório (Acesso a Dados)
         self.repository = AnsRepository(self.connector, str(settings.QUERIES_DIR))
@@ -21,41 +52,346 @@ class DataEngine:
         # 3. Processador (Lógica de Transformação)
         self.processor = DataProcessor()
 
-    def _extrair_dados(self):
-        """Etapa de Extração (Bronze Layer)"""
-        logger.info(f"Iniciando extração de dados (Corte: {settings.DATA_CORTE_INICIO})...")
+        # 4. Cache Colunar (Snapshot da Gold Layer)
+        self.snapshot = SnapshotArrow(str(settings.CACHE_DIR))
+        self._hash_dimensao_atual = None
+
+        # 5. Tempos da última carga por etapa (segundos)
+        self.tempos_carga = {}
+
+    def _calcular_versao_logica(self) -> str:
+        """
+        Versão lógica do pipeline: textos das queries, data de corte e modo de consolidação.
+        Se ela muda, o snapshot não serve nem como base para atualização incremental.
+        """
+        h = hashlib.sha256()
+        h.update(f"pipeline={self.VERSAO_PIPELINE}".encode())
+        # Checksums vêm do QueryRegistry (arquivos já carregados em memória)
+        h.update(self.repository.registry.versao("etl/", "gold/", "duckdb/").encode())
+        h.update(f"{settings.DATA_CORTE_INICIO}|gold_sql={settings.MODO_GOLD_SQL}".encode())
+        h.update(f"backend={settings.BACKEND_ANALITICO}".encode())
+        return h.hexdigest()
+
+    def _calcular_fingerprint(self) -> str:
+        """
+        Identifica a versão da origem: versão lógica + arquivo do banco (tamanho + mtime,
+        incluindo o WAL). Qualquer mudança invalida o snapshot.
+        """
+        h = hashlib.sha256(self._calcular_versao_logica().encode())
+
+        for caminho in (settings.DB_PATH, settings.DB_PATH.with_name(settings.DB_PATH.name + "-wal")):
+            if caminho.exists():
+                stat = os.stat(caminho)
+                if caminho != settings.DB_PATH and stat.st_size == 0:
+                    continue  # WAL vazio (criado/truncado ao abrir/fechar conexões) não é mudança de dados
+                h.update(f"{caminho.name}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+
+        if self._usar_duckdb() and settings.DUCKDB_PARQUET_DIR:
+            # Origem são os exports Parquet: um novo export também invalida o snapshot
+            for caminho in sorted(Path(settings.DUCKDB_PARQUET_DIR).glob("*.parquet")):
+                stat = os.stat(caminho)
+                h.update(f"{caminho.name}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+
+        return h.hexdigest()
+
+    @staticmethod
+    def _usar_duckdb() -> bool:
+        return settings.BACKEND_ANALITICO == "duckdb"
+
+    @staticmethod
+    def _hash_dimensao(df_dim: pd.DataFrame) -> str:
+        """Hash do conteúdo da dimensão (detecta alterações cadastrais entre cargas)."""
+        return hashlib.sha256(pd.util.hash_pandas_object(df_dim, index=False).values.tobytes()).hexdigest()
+
+    def _extrair_dados(self, trimestre_inicial: str = None):
+        """
+        Etapa de Extração (Bronze Layer) + normalização de chaves (Silver).
+        As três fontes rodam em paralelo, cada uma numa conexão própria do pool
+        (o SQLite libera o GIL durante a execução). As tabelas fato são lidas em lotes:
+        cada lote é normalizado assim que chega, então nunca coexistem o resultado
+        bruto completo e sua cópia normalizada.
+        """
+        trimestre_inicial = trimestre_inicial or settings.DATA_CORTE_INICIO
+        logger.info(f"Iniciando extração de dados (Corte: {trimestre_inicial})...")
         
         # Parâmetro para injetar nas queries
-        params = (settings.DATA_CORTE_INICIO,)
-        
-        return (
-            self.repository.buscar_dados_brutos("etl/load_dim_operadoras.sql"),
-            self.repository.buscar_dados_brutos("etl/load_beneficiarios.sql", params),
-            self.repository.buscar_dados_brutos("etl/load_financeiro.sql", params)
-        )
-    def gerar_dataset_mestre(self):
+        params = (trimestre_inicial,)
+
+        fontes = {
+            "dim_operadoras": lambda: self.processor.normalizar_chaves(
+                self.repository.buscar_dados_brutos("etl/load_dim_operadoras"), [Colunas.REGISTRO_ANS]),
+            "beneficiarios": lambda: self._extrair_fato_em_lotes(
+                "etl/load_beneficiarios", params, Colunas.CD_OPERADORA),
+            "financeiro": lambda: self._extrair_fato_em_lotes(
+                "etl/load_financeiro", params, Colunas.REG_ANS_FIN),
+        }
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(fontes), thread_name_prefix="extracao") as executor:
+            futuros = {nome: executor.submit(self._cronometrar_fonte, nome, tarefa) for nome, tarefa in fontes.items()}
+            df_dim, df_ben, df_fin = (futuros[nome].result() for nome in fontes)
+        logger.info(f"Extração concluída em {time.perf_counter() - inicio:.2f}s (fontes em paralelo).")
+
+        return df_dim, df_ben, df_fin
+
+    @staticmethod
+    def _cronometrar_fonte(nome: str, tarefa) -> pd.DataFrame:
+        """Executa a extração de uma fonte e registra o tempo (identifica quem domina o startup)."""
+        inicio = time.perf_counter()
+        df = tarefa()
+        logger.info(f"Fonte '{nome}': {len(df)} linhas em {time.perf_counter() - inicio:.2f}s.")
+        return df
+
+    def _extrair_fato_em_lotes(self, nome_query: str, params: tuple, coluna_chave: str) -> pd.DataFrame:
+        """Lê uma tabela fato em streaming, normalizando a chave lote a lote."""
+        try:
+            lotes = [
+                self.processor.normalizar_chaves(lote, [coluna_chave])
+                for lote in self.repository.buscar_dados_streaming(
+                    nome_query, params, tamanho_lote=settings.TAMANHO_LOTE_STREAMING)
+            ]
+        except sqlite3.Error:
+            # Erro de banco (ex: tabela ausente) mantém o Fail Gracefully; MemoryError propaga
+            return pd.DataFrame()
+        return pd.concat(lotes, ignore_index=True) if len(lotes) > 1 else lotes[0]
+
+    def gerar_dataset_mestre(self, forcar_rebuild: bool = False):
+        """
+        Ponto de entrada do Dataset Mestre.
+        Warm start: leitura única do snapshot colunar (mmap) quando o fingerprint bate.
+        Banco alterado (nova carga): atualização incremental a partir do watermark do snapshot.
+        Cold start (ou versão lógica/dimensão divergente): pipeline ETL completo.
+        """
+        self.tempos_carga = {}
+        inicio = time.perf_counter()
+        if settings.MANUTENCAO_AUTOMATICA and str(settings.DB_PATH) not in DataEngine._BANCOS_PREPARADOS:
+            # Antes do fingerprint: criar índices altera o arquivo do banco
+            with self._cronometrar("manutencao"):
+                self.preparar_banco()
+        fingerprint = self._calcular_fingerprint()
+        versao_logica = self._calcular_versao_logica()
+        self._hash_dimensao_atual = None
+        df_final = None
+
+        if settings.USAR_SNAPSHOT and not forcar_rebuild:
+            metadados = self.snapshot.ler_metadados()
+            if metadados and metadados.get("fingerprint") == fingerprint:
+                with self._cronometrar("leitura_snapshot"):
+                    df_cache = self.snapshot.ler()
+                if df_cache is not None:
+                    logger.info(f"Snapshot válido encontrado ({len(df_cache)} linhas). Pipeline ETL ignorado.")
+                    self._registrar_tempos(inicio)
+                    return df_cache
+            elif metadados is not None:
+                logger.info("Snapshot desatualizado (fingerprint divergente).")
+                if (settings.ATUALIZACAO_INCREMENTAL and not settings.MODO_GOLD_SQL and not self._usar_duckdb()
+                        and metadados.get("versao_logica") == versao_logica):
+                    with self._cronometrar("incremental"):
+                        df_final = self._atualizar_incremental(metadados)
+
+        if df_final is None:
+            with self._cronometrar("pipeline"):
+                df_final = self._construir_dataset_mestre()
+
+        erros_contrato = None
+        if not df_final.empty:
+            with self._cronometrar("validacao"):
+                erros_contrato = self._validar_contrato(df_final, fingerprint)
+
+        if settings.COMPACTAR_DATASET:
+            with self._cronometrar("compactacao"):
+                df_final = self._compactar_dataset(df_final)
+
+        if settings.USAR_SNAPSHOT and not df_final.empty:
+            if settings.MODO_GOLD_SQL:
+                # A materialização escreve no banco (mtime muda); o fingerprint precisa refletir isso
+                fingerprint = self._calcular_fingerprint()
+            with self._cronometrar("gravacao_snapshot"):
+                self.snapshot.salvar(df_final, {
+                    "fingerprint": fingerprint,
+                    "versao_logica": versao_logica,
+                    "watermark": str(df_final[Colunas.TRIMESTRE].max()),
+                    "hash_dimensao": self._hash_dimensao_atual,
+                    "validacao": {"modo": settings.MODO_VALIDACAO, "violacoes": erros_contrato}
+                })
+
+        self._registrar_tempos(inicio)
+        return df_final
+
+    @contextmanager
+    def _cronometrar(self, etapa: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos_carga[etapa] = time.perf_counter() - inicio
+
+    def _registrar_tempos(self, inicio: float):
+        self.tempos_carga["total"] = time.perf_counter() - inicio
+        resumo = " | ".join(f"{etapa}={segundos:.2f}s" for etapa, segundos in self.tempos_carga.items())
+        logger.info(f"Tempos de carga: {resumo}")
+
+    def _validar_contrato(self, df_final: pd.DataFrame, fingerprint: str):
+        """
+        Validação de contrato (Gold Layer), cacheada por fingerprint + modo.
+        Modos (settings.MODO_VALIDACAO): "rapido" (vetorizado), "auditoria" (Pandera completo)
+        ou "desligado". Violações são logadas (não interrompem o dashboard).
+        Retorna a lista de violações (None se a validação estiver desligada).
+        """
+        modo = settings.MODO_VALIDACAO
+        if modo == "desligado":
+            return None
+
+        chave = (fingerprint, modo)
+        if chave in DataEngine._VALIDACOES:
+            logger.info(f"Contrato já validado para este fingerprint (modo {modo}).")
+            return DataEngine._VALIDACOES[chave]
+
+        logger.info(f"Validando contrato de dados (modo {modo})...")
+        if modo == "auditoria":
+            try:
+                SchemaMestre.validate(df_final, lazy=True)
+                erros = []
+            except Exception as e:
+                erros = [str(e)]
+        else:
+            erros = validar_mestre_rapido(df_final)
+
+        if erros:
+            logger.error(f"Violação de Schema: {erros}")
+        else:
+            logger.info("Dados validados com sucesso.")
+
+        DataEngine._VALIDACOES[chave] = erros
+        return erros
+
+    def _atualizar_incremental(self, metadados: dict):
+        """
+        Atualização por watermark: busca apenas os trimestres >= watermark (o próprio
+        watermark é relido, pois beneficiários e financeiro são publicados em datas
+        diferentes), anexa ao snapshot e recalcula KPIs só nas caudas das operadoras afetadas.
+        Retorna None quando é necessário rebuild completo (ex: dimensão alterada).
+        """
+        watermark = metadados.get("watermark")
+        hash_anterior = metadados.get("hash_dimensao")
+        if not watermark or not hash_anterior:
+            return None
+
+        df_anterior = self.snapshot.ler()
+        if df_anterior is None or df_anterior.empty:
+            return None
+
+        df_dim, df_ben, df_fin = self._extrair_dados(trimestre_inicial=watermark)
+        if df_dim.empty:
+            return None
+
+        if self._hash_dimensao(df_dim) != hash_anterior:
+            logger.info("Dimensão de operadoras alterada desde o snapshot. Rebuild completo necessário.")
+            return None
+        self._hash_dimensao_atual = hash_anterior
+
+        logger.info(f"Atualização incremental a partir do watermark {watermark}...")
+        df_novo = self._consolidar_frames(df_dim, df_ben, df_fin)
+
+        # Histórico consolidado (imutável) + última linha de cada operadora afetada (base do pct_change)
+        df_historico = df_anterior[df_anterior[Colunas.TRIMESTRE] < watermark]
+        afetadas = df_historico[Colunas.ID_OPERADORA].isin(df_novo[Colunas.ID_OPERADORA].unique())
+        df_caudas = df_historico[afetadas].groupby(Colunas.ID_OPERADORA, sort=False).tail(1)
+
+        df_recalculado = self.processor.calcular_kpis(pd.concat([df_caudas, df_novo], ignore_index=True))
+        df_recalculado = df_recalculado[df_recalculado[Colunas.TRIMESTRE] >= watermark]
+        df_recalculado = self._finalizar_dataset(df_recalculado)
+
+        df_final = pd.concat([df_historico, df_recalculado], ignore_index=True)
+        df_final = df_final.sort_values([Colunas.ID_OPERADORA, Colunas.TRIMESTRE], ignore_index=True)
+        logger.info(f"Incremental: {len(df_recalculado)} linhas (re)calculadas, {len(df_historico)} reaproveitadas.")
+
+        return self._finalizar_dataset(df_final)
+
+    def _construir_dataset_mestre(self):
         """
         Pipeline ETL Principal Otimizado
         """
-        # 1. Extração Otimizada
+        # 1-4. Consolidação (Pandas, SQL-native ou DuckDB)
+        if self._usar_duckdb():
+            df_final = self._consolidar_duckdb()
+        elif settings.MODO_GOLD_SQL:
+            df_final = self._consolidar_sql()
+        else:
+            df_final = self._consolidar_pandas()
+
+        if df_final.empty:
+            return df_final
+
+        return self._finalizar_dataset(df_final)
+
+    def _finalizar_dataset(self, df_final: pd.DataFrame):
+        """Seleção final de colunas (Gold Layer). O contrato é validado em gerar_dataset_mestre."""
+        # Seleção Final de Colunas
+        cols_desejadas = [
+            Colunas.TRIMESTRE, Colunas.ID_OPERADORA, Colunas.RAZAO_SOCIAL, 
+            Colunas.CNPJ, Colunas.UF, Colunas.MODALIDADE, Colunas.CIDADE,
+            Colunas.VIDAS, Colunas.RECEITA, 
+            Colunas.VAR_VIDAS, Colunas.VAR_RECEITA, Colunas.CUSTO_VIDA,
+            Colunas.ID_OPERADORA_KEY, Colunas.TRIMESTRE_ORD
+        ]
+
+        # Chaves substitutas inteiras (int32 operadora / int16 trimestre)
+        df_final = adicionar_chaves(df_final)
+        
+        # Interseção segura de colunas
+        cols_existentes = [c for c in cols_desejadas if c in df_final.columns]
+        return df_final[cols_existentes]
+
+    def _compactar_dataset(self, df_final: pd.DataFrame) -> pd.DataFrame:
+        """
+        Layout compacto do Dataset Mestre (cada processo Streamlit o mantém em memória).
+        Roda depois da validação: o contrato é checado sobre os tipos originais.
+        """
+        if df_final.empty:
+            return df_final
+
+        memoria_antes = df_final.memory_usage(deep=True).sum() / 1024 ** 2
+        df_final = self.processor.compactar_tipos(
+            df_final,
+            colunas_categoricas=[
+                Colunas.ID_OPERADORA, Colunas.RAZAO_SOCIAL, Colunas.CNPJ,
+                Colunas.UF, Colunas.MODALIDADE, Colunas.CIDADE
+            ],
+            colunas_ordenadas=[Colunas.TRIMESTRE],
+            colunas_contagem=[Colunas.VIDAS],
+            colunas_decimais=[Colunas.RECEITA, Colunas.VAR_VIDAS, Colunas.VAR_RECEITA]
+        )
+        memoria_depois = df_final.memory_usage(deep=True).sum() / 1024 ** 2
+        logger.info(f"Dataset Mestre compactado: {memoria_antes:.1f} MB -> {memoria_depois:.1f} MB.")
+        return df_final
+
+    def _consolidar_pandas(self):
+        """Consolidação Bronze -> Gold em memória (Pandas)."""
+        # 1-2. Extração Otimizada + Transformação Silver (Normalização em lotes)
         df_dim, df_ben, df_fin = self._extrair_dados()
         
         if df_dim.empty: 
             logger.warning("Dimensão de operadoras vazia. Abortando.")
             return pd.DataFrame()
 
-        logger.info("Normalizando chaves e consolidando dados...")
-
-        # 2. Transformação Silver (Normalização)
-        df_dim = self.processor.normalizar_chaves(df_dim, [Colunas.REGISTRO_ANS])
-        df_ben = self.processor.normalizar_chaves(df_ben, [Colunas.CD_OPERADORA])
-        df_fin = self.processor.normalizar_chaves(df_fin, [Colunas.REG_ANS_FIN])
+        logger.info("Consolidando dados...")
 
         # [REMOVIDO] df_ben = self.processor.aplicar_filtro_temporal(...) 
         # Motivo: O SQL já realizou essa filtragem, economizando memória.
 
+        self._hash_dimensao_atual = self._hash_dimensao(df_dim)
+
         # 3. Transformação Gold (Consolidação)
-        # 3. Transformação Gold (Consolidação)
+        df_final = self._consolidar_frames(df_dim, df_ben, df_fin)
+
+        # 4. KPIs
+        df_final = self.processor.calcular_kpis(df_final)
+
+        return df_final
+
+    def _consolidar_frames(self, df_dim, df_ben, df_fin):
+        """Join Beneficiários x Financeiro (outer), coalesce de chaves e enriquecimento."""
         df_mestre = pd.merge(
             df_ben, df_fin,
             left_on=[Colunas.CD_OPERADORA, Colunas.TRIMESTRE],
@@ -71,27 +407,171 @@ class DataEngine:
         # Enriquecimento
         df_final = self.processor.enriquecer_dataset(df_mestre, df_dim)
 
-        # 4. KPIs
-        df_final = self.processor.calcular_kpis(df_final)
+        return df_final
 
-        # Seleção Final de Colunas
-        cols_desejadas = [
-            Colunas.TRIMESTRE, Colunas.ID_OPERADORA, Colunas.RAZAO_SOCIAL, 
-            Colunas.CNPJ, Colunas.UF, Colunas.MODALIDADE, Colunas.CIDADE,
-            Colunas.VIDAS, Colunas.RECEITA, 
-            Colunas.VAR_VIDAS, Colunas.VAR_RECEITA, Colunas.CUSTO_VIDA
-        ]
-        
-        # Interseção segura de colunas
-        cols_existentes = [c for c in cols_desejadas if c in df_final.columns]
-        df_final = df_final[cols_existentes]
+    def _consolidar_sql(self):
+        """
+        Consolidação SQL-native: a tabela gold_mestre é materializada (e indexada) dentro
+        do SQLite, e a aplicação faz um único SELECT, sem manter os frames Bronze em memória.
+        """
+        if not self._gold_sql_atualizada():
+            self.materializar_gold_sql()
 
-        # Validação de Contrato
-        try:
-            logger.info("Validando contrato de dados...")
-            SchemaMestre.validate(df_final, lazy=True)
-            logger.info("Dados validados com sucesso.")
-        except Exception as e:
-            logger.error(f"Violação de Schema: {e}")
+        logger.info("Carregando tabela gold_mestre (SQL-native)...")
+        return self.repository.buscar_dados_brutos("gold/load_gold_mestre")
+
+    def _consolidar_duckdb(self):
+        """
+        Consolidação no DuckDB: o mesmo SELECT da Gold Layer, executado vetorizado e em
+        paralelo sobre o SQLite anexado (somente leitura) ou sobre os exports Parquet.
+        """
+        origem = settings.DUCKDB_PARQUET_DIR or settings.DB_PATH
+        logger.info(f"Consolidando Dataset Mestre no DuckDB (origem: {origem})...")
+        with ConexaoDuckDB(
+            db_path=str(settings.DB_PATH),
+            parquet_dir=str(settings.DUCKDB_PARQUET_DIR) if settings.DUCKDB_PARQUET_DIR else None,
+            threads=settings.DUCKDB_THREADS,
+            limite_memoria=settings.DUCKDB_LIMITE_MEMORIA
+        ) as conexao:
+            repositorio = AnsRepository(conexao, str(settings.QUERIES_DIR), registry=self.repository.registry)
+            return repositorio.buscar_dados_brutos(
+                "duckdb/consolidar_gold_mestre", parametros={"data_corte": settings.DATA_CORTE_INICIO})
+
+    # --- Acesso particionado (um trimestre / uma operadora por vez) ---
+    def _particionado(self) -> SnapshotParticionado:
+        chave = str(settings.CACHE_DIR)
+        if chave not in DataEngine._PARTICIONADOS:
+            DataEngine._PARTICIONADOS[chave] = SnapshotParticionado(
+                chave, Colunas.TRIMESTRE, max_particoes_em_memoria=settings.PARTICOES_EM_MEMORIA)
+        return DataEngine._PARTICIONADOS[chave]
+
+    def _garantir_particoes(self) -> SnapshotParticionado:
+        """
+        Publica as partições por trimestre quando não existem ou a origem mudou (fingerprint).
+        O Dataset Mestre completo só passa pela memória durante essa (re)gravação.
+        """
+        particionado = self._particionado()
+        metadados = particionado.ler_metadados()
+        if metadados is not None and metadados.get("fingerprint") == self._calcular_fingerprint():
+            return particionado
+
+        df_final = self.gerar_dataset_mestre()
+        if not df_final.empty:
+            logger.info("Gravando partições por trimestre do Dataset Mestre...")
+            particionado.salvar(df_final, {"fingerprint": self._calcular_fingerprint()})
+        return particionado
+
+    def listar_trimestres(self) -> list:
+        """Trimestres disponíveis no modo particionado (ordem cronológica)."""
+        return sorted(self._garantir_particoes().particoes())
+
+    def get_quarter(self, trimestre: str) -> pd.DataFrame:
+        """
+        Recorte de um trimestre do Dataset Mestre, servido pelo LRU de partições.
+        O frame é compartilhado entre sessões: copie antes de alterar.
+        """
+        df_trimestre = self._garantir_particoes().ler_particao(trimestre)
+        return df_trimestre if df_trimestre is not None else pd.DataFrame()
+
+    def get_operator_history(self, id_operadora) -> pd.DataFrame:
+        """Histórico completo de uma operadora (filtro por chave inteira em cada partição mapeada)."""
+        particionado = self._garantir_particoes()
+        chave = chave_operadora(id_operadora)
+        if chave == SEM_CHAVE:
+            return pd.DataFrame()
+        df_historico = particionado.filtrar(Colunas.ID_OPERADORA_KEY, chave)
+        if df_historico.empty:
+            return df_historico
+        return df_historico.sort_values(Colunas.TRIMESTRE_ORD, ignore_index=True)
+
+    def carregar_grupo_colunas(self, grupo: str) -> pd.DataFrame:
+        """
+        Projeção sob demanda: o Dataset Mestre carrega só o núcleo da dimensão; grupos como
+        "cadastral" e "descredenciamento" (GruposColunas) são buscados no primeiro acesso e
+        cacheados por processo até o banco mudar (fingerprint). Uma linha por operadora.
+        """
+        chave = (str(settings.DB_PATH), grupo)
+        fingerprint = self._calcular_fingerprint()
+        em_cache = DataEngine._GRUPOS_COLUNAS.get(chave)
+        if em_cache is not None and em_cache[0] == fingerprint:
+            return em_cache[1]
+
+        logger.info(f"Carregando grupo de colunas '{grupo}' sob demanda...")
+        df_grupo = self.repository.buscar_grupo_colunas(grupo)
+        if not df_grupo.empty:
+            df_grupo = self.processor.normalizar_chaves(df_grupo, [Colunas.REGISTRO_ANS])
+            df_grupo = (df_grupo.drop_duplicates(subset=Colunas.REGISTRO_ANS, keep='last')
+                        .rename(columns={Colunas.REGISTRO_ANS: Colunas.ID_OPERADORA})
+                        .set_index(Colunas.ID_OPERADORA))
+        DataEngine._GRUPOS_COLUNAS[chave] = (fingerprint, df_grupo)
+        return df_grupo
 
-        return df_final
\ No newline at end of file
+    def anexar_grupos_colunas(self, dados, grupos):
+        """
+        Acrescenta as colunas dos grupos pedidos a um recorte do Dataset Mestre
+        (DataFrame ou a linha de uma operadora), casando por ID_OPERADORA.
+        """
+        eh_linha = isinstance(dados, pd.Series)
+        df = dados.to_frame().T if eh_linha else dados.copy()
+        ids = df[Colunas.ID_OPERADORA].astype(str)
+
+        for grupo in grupos:
+            df_grupo = self.carregar_grupo_colunas(grupo)
+            for coluna in df_grupo.columns:
+                df[coluna] = ids.map(df_grupo[coluna]) if not df_grupo.empty else None
+
+        return df.iloc[0] if eh_linha else df
+
+    def preparar_banco(self) -> dict:
+        """
+        Manutenção do banco: garante os índices de cobertura das cargas do ETL e roda
+        EXPLAIN QUERY PLAN em toda query de leitura registrada, alertando table scans
+        (exceto as marcadas com '-- @scan: permitido'). Retorna {query: passos com scan}.
+        """
+        manutencao = ManutencaoSQLite(str(settings.DB_PATH))
+        DataEngine._BANCOS_PREPARADOS.add(str(settings.DB_PATH))
+        if not settings.DB_PATH.exists():
+            return {}
+
+        manutencao.garantir_indices(self.repository.registry.obter("manutencao/indices_etl").sql)
+
+        consultas = {
+            consulta.nome: (consulta.sql, consulta.parametros_nulos())
+            for consulta in self.repository.registry.listar()
+            if consulta.somente_leitura and not consulta.scan_permitido
+        }
+        return manutencao.verificar_planos(consultas)
+
+    def _versao_script_gold(self) -> str:
+        return self.repository.registry.obter("gold/materializar_gold_mestre").checksum
+
+    def _gold_sql_atualizada(self) -> bool:
+        """Verifica se gold_mestre existe e foi materializada com a mesma origem/corte/script."""
+        df_tabelas = self.repository.buscar_dados_brutos("gold/tabelas_gold_mestre")
+        if len(df_tabelas) < 2:
+            return False
+
+        df_estado = self.repository.buscar_dados_brutos("gold/estado_gold_mestre")
+        if df_estado.empty:
+            return False
+
+        estado = df_estado.iloc[0]
+        return bool(
+            estado['data_corte'] == settings.DATA_CORTE_INICIO
+            and estado['versao_script'] == self._versao_script_gold()
+            and estado['ben_inalterado'] and estado['fin_inalterado'] and estado['dim_inalterado']
+        )
+
+    def materializar_gold_sql(self):
+        """
+        (Re)constrói a tabela gold_mestre no banco. Usa uma conexão de escrita própria,
+        aberta apenas durante a materialização. Deve ser chamada após cada carga do ETL.
+        """
+        logger.info("Materializando tabela gold_mestre no SQLite...")
+        parametros = {
+            "data_corte": settings.DATA_CORTE_INICIO,
+            "versao_script": self._versao_script_gold()
+        }
+        with ConexaoSQLite(str(settings.DB_PATH)) as conexao_escrita:
+            repositorio_escrita = AnsRepository(conexao_escrita, str(settings.QUERIES_DIR))
+            repositorio_escrita.executar_script("gold/materializar_gold_mestre", parametros)
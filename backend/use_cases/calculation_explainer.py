@@ -1,32 +1,27 @@
 import pandas as pd
 import numpy as np
 from backend.exceptions import ProcessingError, FilterError
-from backend.analytics.brand_intelligence import extrair_marca
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import filtrar_trimestre, filtrar_operadora
 
 class CalculationExplainerUseCase:
     def __init__(self, df_mestre):
         self.df_mestre = df_mestre
+        self.cubo = obter_cubo(df_mestre)
 
     def execute(self, id_operadora: str, trimestre: str):
         """
         Reconstrói o cálculo do Power Score (Lógica LINEAR oficial), Spreads e Métricas de Grupo.
         """
         # 1. Universo de Comparação
-        df_tri = self.df_mestre[self.df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+        df_tri = filtrar_trimestre(self.df_mestre, trimestre)
         
         if df_tri.empty:
             raise FilterError(f"Sem dados no trimestre {trimestre}")
 
-        # CORREÇÃO 1: Uso de lambda para passar razao_social E ID_OPERADORA
-        df_tri['Marca_Temp'] = df_tri.apply(
-            lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-            axis=1
-        )
-        
-        df_tri['ID_OPERADORA'] = df_tri['ID_OPERADORA'].astype(str)
         id_operadora = str(id_operadora)
         
-        row_op = df_tri[df_tri['ID_OPERADORA'] == id_operadora]
+        row_op = filtrar_operadora(df_tri, id_operadora)
         if row_op.empty:
             raise FilterError("Operadora não encontrada.")
             
@@ -35,12 +30,12 @@ class CalculationExplainerUseCase:
         # --- PARTE 1: POWER SCORE (Lógica LINEAR - Igual calculadora_score.py) ---
         
         # A. VIDAS (Peso 40%) - Normalização Linear
-        max_vidas = df_tri['NR_BENEF_T'].max() or 1
+        max_vidas = self.cubo.valor(trimestre, 'NR_BENEF_T', 'max', padrao=0) or 1
         vidas_real = dados_op['NR_BENEF_T']
         score_vidas = (vidas_real / max_vidas) * 100
 
         # B. RECEITA (Peso 40%) - Normalização Linear
-        max_receita = df_tri['VL_SALDO_FINAL'].max() or 1
+        max_receita = self.cubo.valor(trimestre, 'VL_SALDO_FINAL', 'max', padrao=0) or 1
         rec_real = dados_op['VL_SALDO_FINAL']
         score_rec = (rec_real / max_receita) * 100
 
@@ -65,23 +60,21 @@ class CalculationExplainerUseCase:
 
         # --- PARTE 2: EXTRAS (Spread e Grupo) ---
         op_cresc_rec = dados_op.get('VAR_PCT_RECEITA', 0)
-        mkt_mediana_rec = df_tri['VAR_PCT_RECEITA'].median()
+        mkt_mediana_rec = self.cubo.valor(trimestre, 'VAR_PCT_RECEITA', 'mediana')
         spread_rec = op_cresc_rec - mkt_mediana_rec
         
         op_cresc_vid = dados_op.get('VAR_PCT_VIDAS', 0)
-        mkt_mediana_vid = df_tri['VAR_PCT_VIDAS'].median()
+        mkt_mediana_vid = self.cubo.valor(trimestre, 'VAR_PCT_VIDAS', 'mediana')
         spread_vid = op_cresc_vid - mkt_mediana_vid
         
-        # CORREÇÃO 2: Passagem correta dos dois argumentos
-        marca = extrair_marca(dados_op['razao_social'], dados_op['ID_OPERADORA'])
-        
-        df_grupo = df_tri[df_tri['Marca_Temp'] == marca]
+        # Totais e mediana do grupo (cubo pré-agregado por marca)
+        marca = self.cubo.marca_de(row_op).iloc[0]
         
-        total_rec_grupo = df_grupo['VL_SALDO_FINAL'].sum()
+        total_rec_grupo = self.cubo.valor(trimestre, 'VL_SALDO_FINAL', 'soma', marca=marca, padrao=0)
         share_rec = (rec_real / total_rec_grupo) * 100 if total_rec_grupo > 0 else 0
-        total_vid_grupo = df_grupo['NR_BENEF_T'].sum()
+        total_vid_grupo = self.cubo.valor(trimestre, 'NR_BENEF_T', 'soma', marca=marca, padrao=0)
         share_vid = (vidas_real / total_vid_grupo) * 100 if total_vid_grupo > 0 else 0
-        grp_mediana_vid = df_grupo['VAR_PCT_VIDAS'].median()
+        grp_mediana_vid = self.cubo.valor(trimestre, 'VAR_PCT_VIDAS', 'mediana', marca=marca)
 
         return {
             "dados_op": dados_op,
@@ -2,26 +2,27 @@ import pandas as pd
 from backend.exceptions import ProcessingError, FilterError
 from backend.analytics.comparativos import calcular_variacoes_operadora
 from backend.analytics.calculadora_score import calcular_power_score
-from backend.analytics.brand_intelligence import extrair_marca
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import filtrar_trimestre, filtrar_operadora
 
 class ComparisonAnalysisUseCase:
     def __init__(self, df_mestre):
         self.df_mestre = df_mestre
+        self.cubo = obter_cubo(df_mestre)
 
     def _get_op_stats(self, id_op, df_scored, sel_trimestre):
         """Helper para extrair estatísticas de uma única operadora."""
-        row = df_scored[df_scored['ID_OPERADORA'] == id_op]
+        row = filtrar_operadora(df_scored, id_op)
         if row.empty: return None
         
+        marcas = self.cubo.marca_de(df_scored)
         data = row.iloc[0]
-        marca = extrair_marca(data['razao_social'], data['ID_OPERADORA'])
+        marca = marcas.loc[row.index[0]]
         
         # Rank Grupo
-        df_grupo = df_scored[
-            df_scored.apply(lambda x: extrair_marca(x['razao_social'], x['ID_OPERADORA']), axis=1) == marca
-        ]
+        df_grupo = df_scored[marcas == marca]
         try:
-            rank_grupo = df_grupo['Power_Score'].rank(ascending=False, method='min')[df_grupo['ID_OPERADORA'] == id_op].iloc[0]
+            rank_grupo = df_grupo['Power_Score'].rank(ascending=False, method='min').loc[filtrar_operadora(df_grupo, id_op).index].iloc[0]
         except:
             rank_grupo = "-"
             
@@ -104,11 +105,10 @@ class ComparisonAnalysisUseCase:
         """Executa a lógica completa de comparação."""
         try:
             # 1. Preparação
-            df_tri = self.df_mestre[self.df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+            df_tri = filtrar_trimestre(self.df_mestre, trimestre).copy()
             if df_tri.empty:
                 raise FilterError(f"Sem dados para {trimestre}.")
 
-            df_tri['ID_OPERADORA'] = df_tri['ID_OPERADORA'].astype(str)
             id_op1 = str(id_op1)
             id_op2 = str(id_op2)
             
@@ -116,7 +116,6 @@ class ComparisonAnalysisUseCase:
             try:
                 df_scored = calcular_power_score(df_tri)
                 df_scored['Rank_Geral'] = df_scored['Power_Score'].rank(ascending=False, method='min')
-                df_scored['ID_OPERADORA'] = df_scored['ID_OPERADORA'].astype(str)
             except Exception as e:
                 raise ProcessingError(f"Erro ao calcular scores: {e}")
 
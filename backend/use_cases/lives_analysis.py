@@ -1,14 +1,17 @@
 import pandas as pd
 from backend.exceptions import ProcessingError, FilterError
 from backend.analytics.comparativos import calcular_variacoes_operadora, calcular_kpis_vidas_avancados
-from backend.analytics.brand_intelligence import analisar_performance_marca, extrair_marca
+from backend.analytics.brand_intelligence import analisar_performance_marca
 from backend.analytics.calculadora_score import calcular_score_vidas
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import filtrar_trimestre, filtrar_operadora
 
 class LivesAnalysisUseCase:
     def __init__(self, df_mestre):
         self.df_mestre = df_mestre
+        self.cubo = obter_cubo(df_mestre)
 
-    def _gerar_storytelling(self, nome_op, trimestre, kpis, kpis_avancados, df_trimestre, marca_grupo):
+    def _gerar_storytelling(self, nome_op, trimestre, kpis, kpis_avancados, marca_grupo):
         """
         Gera diagnóstico focado em Volume de Vidas e estabilidade da carteira.
         """
@@ -18,13 +21,13 @@ class LivesAnalysisUseCase:
         cagr = kpis_avancados.get('CAGR_1Ano', 0) * 100
         
         # Mercado
-        mediana_mkt_vid = df_trimestre['VAR_PCT_VIDAS'].median() * 100
+        mediana_mkt_vid = self.cubo.valor(trimestre, 'VAR_PCT_VIDAS', 'mediana') * 100
         spread_mkt = var_vid_op - mediana_mkt_vid
 
         # Grupo
-        df_grupo = df_trimestre[df_trimestre['Marca_Temp'] == marca_grupo]
-        if not df_grupo.empty:
-            mediana_grp_vid = df_grupo['VAR_PCT_VIDAS'].median() * 100
+        qtd_grupo = self.cubo.valor(trimestre, 'VAR_PCT_VIDAS', 'qtd', marca=marca_grupo, padrao=0)
+        if qtd_grupo > 0:
+            mediana_grp_vid = self.cubo.valor(trimestre, 'VAR_PCT_VIDAS', 'mediana', marca=marca_grupo, padrao=0) * 100
             spread_grp = var_vid_op - mediana_grp_vid
         else:
             spread_grp = 0
@@ -39,7 +42,7 @@ class LivesAnalysisUseCase:
             texto += f" A captação ficou **{spread_mkt:.2f} p.p.** abaixo da média de mercado."
 
         # 2. Contexto Grupo
-        if marca_grupo != "OUTROS" and len(df_grupo) > 1:
+        if marca_grupo != "OUTROS" and qtd_grupo > 1:
             texto += f"\n\n**2. Contexto Grupo {marca_grupo}:** "
             if spread_grp > 0:
                 texto += f"Destaque positivo, ampliando a base **+{spread_grp:.2f} p.p.** acima dos pares."
@@ -58,45 +61,35 @@ class LivesAnalysisUseCase:
         """Executa a lógica de análise de carteira de vidas."""
         try:
             # 1. Preparação
-            df_tri = self.df_mestre[self.df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+            df_tri = filtrar_trimestre(self.df_mestre, trimestre).copy()
             
             if df_tri.empty:
                 raise FilterError(f"Sem dados disponíveis para o trimestre {trimestre}.")
 
             # Garante coluna de Marca e Tipagem
             
-            df_tri['ID_OPERADORA'] = df_tri['ID_OPERADORA'].astype(str)
             id_operadora = str(id_operadora)
-            # --- CORREÇÃO AQUI: Lambda com ID_OPERADORA ---
-            df_tri['Marca_Temp'] = df_tri.apply(
-                lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                axis=1
-            )
-            row_op = df_tri[df_tri['ID_OPERADORA'] == id_operadora]
+            df_tri['Marca_Temp'] = self.cubo.marca_de(df_tri)
+            row_op = filtrar_operadora(df_tri, id_operadora)
             if row_op.empty:
                 raise FilterError(f"Operadora ID {id_operadora} não encontrada no trimestre {trimestre}.")
 
             dados_op = row_op.iloc[0]
-            marca = extrair_marca(dados_op['razao_social'], dados_op['ID_OPERADORA'])
+            marca = dados_op['Marca_Temp']
             # 2. Score de Vidas e Rankings
             try:
                 df_score = calcular_score_vidas(df_tri)
-                df_score['ID_OPERADORA'] = df_score['ID_OPERADORA'].astype(str)
                 df_score['Rank_Geral'] = df_score['Lives_Score'].rank(ascending=False, method='min')
-                
-                df_score['Marca_Temp'] = df_score.apply(
-                    lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                    axis=1
-                )
+
                 df_grupo = df_score[df_score['Marca_Temp'] == marca].copy()
                 df_grupo['Rank_Grupo'] = df_grupo['Lives_Score'].rank(ascending=False, method='min')
                 
                 # Extração
-                row_geral = df_score[df_score['ID_OPERADORA'] == id_operadora]
+                row_geral = filtrar_operadora(df_score, id_operadora)
                 r_geral = int(row_geral['Rank_Geral'].iloc[0]) if not row_geral.empty else "-"
                 score = row_geral['Lives_Score'].iloc[0] if not row_geral.empty else 0
                 
-                row_grp = df_grupo[df_grupo['ID_OPERADORA'] == id_operadora]
+                row_grp = filtrar_operadora(df_grupo, id_operadora)
                 r_grupo = int(row_grp['Rank_Grupo'].iloc[0]) if not row_grp.empty else "-"
             
             except Exception:
@@ -108,10 +101,10 @@ class LivesAnalysisUseCase:
                 raise ProcessingError("Dados históricos insuficientes.")
             
             kpis_avancados = calcular_kpis_vidas_avancados(self.df_mestre, id_operadora, trimestre)
-            insights = analisar_performance_marca(df_tri, dados_op)
+            insights = analisar_performance_marca(df_tri, dados_op, self.cubo)
 
             # 4. Storytelling
-            resumo_narrativo = self._gerar_storytelling(dados_op['razao_social'], trimestre, kpis, kpis_avancados, df_tri, marca)
+            resumo_narrativo = self._gerar_storytelling(dados_op['razao_social'], trimestre, kpis, kpis_avancados, marca)
 
             # 5. Tabelas (Ordenação por Lives_Score)
             df_view_grupo = df_grupo.rename(columns={'Lives_Score': 'Power_Score'}).sort_values('Power_Score', ascending=False).copy()
@@ -141,7 +134,8 @@ class LivesAnalysisUseCase:
                     "storytelling": resumo_narrativo,
                     "tabela_grupo": df_view_grupo,
                     "tabela_geral": df_view_geral,
-                    "df_full": self.df_mestre
+                    "df_full": self.df_mestre,
+                    "cubo": self.cubo
                 }
             }
 
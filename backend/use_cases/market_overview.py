@@ -2,7 +2,8 @@ import pandas as pd
 from backend.exceptions import ProcessingError, FilterError
 from backend.analytics.filtros_mercado import filtrar_por_modalidade
 from backend.analytics.calculadora_score import calcular_power_score
-from backend.analytics.brand_intelligence import extrair_marca
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import filtrar_trimestre
 
 class MarketOverviewUseCase:
     def __init__(self, df_mestre):
@@ -20,7 +21,7 @@ class MarketOverviewUseCase:
                 raise FilterError(f"Nenhum dado encontrado para as modalidades: {modalidades}")
 
             # 2. Filtragem por Trimestre (Snapshot)
-            df_snapshot = df_mercado_filtrado[df_mercado_filtrado['ID_TRIMESTRE'] == trimestre].copy()
+            df_snapshot = filtrar_trimestre(df_mercado_filtrado, trimestre).copy()
             
             if df_snapshot.empty:
                 raise FilterError(f"Nenhum dado encontrado para o trimestre {trimestre} com os filtros atuais.")
@@ -28,10 +29,8 @@ class MarketOverviewUseCase:
             # 3. Tratamento de Marca (Necessário para gráficos e agrupamentos)
             # Verifica se a coluna já existe para evitar reprocessamento desnecessário
             if 'Marca_Temp' not in self.df_mestre.columns:
-                df_snapshot['Marca_Temp'] = df_snapshot.apply(
-                lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                axis=1
-            )
+                df_snapshot['Marca_Temp'] = obter_cubo(self.df_mestre).marca_de(df_snapshot)
+
             # 4. Cálculo de Score e Ranking
             try:
                 df_ranqueado = calcular_power_score(df_snapshot)
@@ -1,33 +1,35 @@
 import pandas as pd
 from backend.exceptions import ProcessingError, FilterError
 from backend.analytics.comparativos import calcular_variacoes_operadora
-from backend.analytics.brand_intelligence import analisar_performance_marca, extrair_marca
+from backend.analytics.brand_intelligence import analisar_performance_marca
 from backend.analytics.calculadora_score import calcular_power_score
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import filtrar_trimestre, filtrar_operadora
 
 class OperatorAnalysisUseCase:
     def __init__(self, df_mestre):
         self.df_mestre = df_mestre
+        self.cubo = obter_cubo(df_mestre)
 
-    def _gerar_storytelling(self, nome_op, trimestre, kpis, df_trimestre, marca_grupo):
+    def _gerar_storytelling(self, nome_op, trimestre, kpis, marca_grupo):
         """
         Método interno para gerar a narrativa de texto.
         """
         var_rec_op = kpis.get('Var_Receita_QoQ', 0) * 100
         var_vid_op = kpis.get('Var_Vidas_QoQ', 0) * 100
         
-        # Garante que as colunas percentuais existem (para evitar KeyError se o backend mudar)
+        # Medianas de mercado e do grupo vêm do cubo pré-agregado
         col_rec = 'VAR_PCT_RECEITA'
         col_vid = 'VAR_PCT_VIDAS'
-        
-        if col_rec not in df_trimestre.columns or col_vid not in df_trimestre.columns:
+
+        if self.cubo.estatisticas(trimestre).empty:
             return "Dados insuficientes para gerar resumo narrativo."
 
-        mediana_mkt_rec = df_trimestre[col_rec].median() * 100
-        mediana_mkt_vid = df_trimestre[col_vid].median() * 100
+        mediana_mkt_rec = self.cubo.valor(trimestre, col_rec, 'mediana') * 100
+        mediana_mkt_vid = self.cubo.valor(trimestre, col_vid, 'mediana') * 100
 
-        # Filtra grupo com segurança (a coluna Marca_Temp deve existir aqui)
-        df_grupo = df_trimestre[df_trimestre['Marca_Temp'] == marca_grupo]
-        mediana_grp_rec = df_grupo[col_rec].median() * 100 if not df_grupo.empty else 0
+        qtd_grupo = self.cubo.valor(trimestre, col_rec, 'qtd', marca=marca_grupo, padrao=0)
+        mediana_grp_rec = self.cubo.valor(trimestre, col_rec, 'mediana', marca=marca_grupo, padrao=0) * 100
 
         spread_mkt = var_rec_op - mediana_mkt_rec
         spread_grp = var_rec_op - mediana_grp_rec
@@ -42,7 +44,7 @@ class OperatorAnalysisUseCase:
         else:
             texto += "Desempenho alinhado à média do mercado. "
 
-        if marca_grupo != "OUTROS" and len(df_grupo) > 1:
+        if marca_grupo != "OUTROS" and qtd_grupo > 1:
             texto += f"No grupo **{marca_grupo}**, a operadora "
             if spread_grp > 0:
                 texto += f"destacou-se com **+{spread_grp:.2f} p.p.** acima dos pares."
@@ -56,49 +58,39 @@ class OperatorAnalysisUseCase:
         """Executa a lógica de análise detalhada da operadora."""
         try:
             # 1. Preparação e Validação
-            df_tri = self.df_mestre[self.df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+            df_tri = filtrar_trimestre(self.df_mestre, trimestre).copy()
             
             if df_tri.empty:
                 raise FilterError(f"Sem dados disponíveis para o trimestre {trimestre}.")
 
             # Tipagem segura
-            df_tri['ID_OPERADORA'] = df_tri['ID_OPERADORA'].astype(str)
             id_operadora = str(id_operadora)
-            df_tri['Marca_Temp'] = df_tri.apply(
-                lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                axis=1
-            )
+            df_tri['Marca_Temp'] = self.cubo.marca_de(df_tri)
 
             # Busca dados da operadora
-            row_op = df_tri[df_tri['ID_OPERADORA'] == id_operadora]
+            row_op = filtrar_operadora(df_tri, id_operadora)
             if row_op.empty:
                 raise FilterError(f"Operadora ID {id_operadora} não encontrada no trimestre {trimestre}.")
 
             dados_op = row_op.iloc[0]
-            marca = extrair_marca(dados_op['razao_social'], dados_op['ID_OPERADORA'])
+            marca = dados_op['Marca_Temp']
 
             # 2. Cálculos de Score e Rankings
             try:
                 # Score Geral
                 df_score = calcular_power_score(df_tri)
                 df_score['Rank_Geral'] = df_score['Power_Score'].rank(ascending=False, method='min')
-                df_score['ID_OPERADORA'] = df_score['ID_OPERADORA'].astype(str)
                 
-                # Score Grupo
-                # Como df_score vem de df_tri, teoricamente já teria a marca, mas garantimos:
-                df_score['Marca_Temp'] = df_score.apply(
-                    lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                    axis=1
-                )
+                # Score Grupo (df_score herda 'Marca_Temp' de df_tri)
                 df_grupo = df_score[df_score['Marca_Temp'] == marca].copy()
                 df_grupo['Rank_Grupo'] = df_grupo['Power_Score'].rank(ascending=False, method='min')
 
                 # Extração dos valores individuais
-                row_geral = df_score[df_score['ID_OPERADORA'] == id_operadora]
+                row_geral = filtrar_operadora(df_score, id_operadora)
                 r_geral = int(row_geral['Rank_Geral'].iloc[0]) if not row_geral.empty else "-"
                 score = row_geral['Power_Score'].iloc[0] if not row_geral.empty else 0
                 
-                row_grupo = df_grupo[df_grupo['ID_OPERADORA'] == id_operadora]
+                row_grupo = filtrar_operadora(df_grupo, id_operadora)
                 r_grupo = int(row_grupo['Rank_Grupo'].iloc[0]) if not row_grupo.empty else "-"
             
             except Exception:
@@ -109,11 +101,10 @@ class OperatorAnalysisUseCase:
             if not kpis:
                 raise ProcessingError("Não foi possível calcular os KPIs da operadora (dados históricos insuficientes ou inconsistentes).")
                 
-            insights = analisar_performance_marca(df_tri, dados_op)
+            insights = analisar_performance_marca(df_tri, dados_op, self.cubo)
 
             # 4. Geração de Narrativa
-            # Agora df_tri já possui 'Marca_Temp', então não vai dar erro
-            resumo_narrativo = self._gerar_storytelling(dados_op['razao_social'], trimestre, kpis, df_tri, marca)
+            resumo_narrativo = self._gerar_storytelling(dados_op['razao_social'], trimestre, kpis, marca)
 
             # 5. Preparação de Tabelas
             df_view_grupo = df_grupo.sort_values('Power_Score', ascending=False).copy()
@@ -142,7 +133,8 @@ class OperatorAnalysisUseCase:
                     "storytelling": resumo_narrativo,
                     "tabela_grupo": df_view_grupo,
                     "tabela_geral": df_view_geral,
-                    "df_full": self.df_mestre # Necessário para gráficos históricos
+                    "df_full": self.df_mestre, # Necessário para gráficos históricos
+                    "cubo": self.cubo
                 }
             }
 
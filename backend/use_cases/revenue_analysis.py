@@ -1,14 +1,17 @@
 import pandas as pd
 from backend.exceptions import ProcessingError, FilterError
 from backend.analytics.comparativos import calcular_variacoes_operadora, calcular_kpis_financeiros_avancados
-from backend.analytics.brand_intelligence import analisar_performance_marca, extrair_marca
+from backend.analytics.brand_intelligence import analisar_performance_marca
 from backend.analytics.calculadora_score import calcular_score_financeiro
+from backend.analytics.cubo_mercado import obter_cubo
+from backend.processing.chaves import filtrar_trimestre, filtrar_operadora
 
 class RevenueAnalysisUseCase:
     def __init__(self, df_mestre):
         self.df_mestre = df_mestre
+        self.cubo = obter_cubo(df_mestre)
 
-    def _gerar_storytelling(self, nome_op, trimestre, kpis, kpis_avancados, df_trimestre, marca_grupo):
+    def _gerar_storytelling(self, nome_op, trimestre, kpis, kpis_avancados, marca_grupo):
         """
         Gera um diagnóstico financeiro COMPLETO (360º) baseado nos dados processados.
         """
@@ -19,13 +22,13 @@ class RevenueAnalysisUseCase:
         cagr = kpis_avancados.get('CAGR_1Ano', 0) * 100
         
         # Referências de Mercado
-        mediana_mkt_rec = df_trimestre['VAR_PCT_RECEITA'].median() * 100
+        mediana_mkt_rec = self.cubo.valor(trimestre, 'VAR_PCT_RECEITA', 'mediana') * 100
         spread_mkt = var_rec_op - mediana_mkt_rec
 
         # Referências de Grupo
-        df_grupo = df_trimestre[df_trimestre['Marca_Temp'] == marca_grupo]
-        if not df_grupo.empty:
-            mediana_grp_rec = df_grupo['VAR_PCT_RECEITA'].median() * 100
+        qtd_grupo = self.cubo.valor(trimestre, 'VAR_PCT_RECEITA', 'qtd', marca=marca_grupo, padrao=0)
+        if qtd_grupo > 0:
+            mediana_grp_rec = self.cubo.valor(trimestre, 'VAR_PCT_RECEITA', 'mediana', marca=marca_grupo, padrao=0) * 100
             spread_grp = var_rec_op - mediana_grp_rec
         else:
             spread_grp = 0
@@ -50,7 +53,7 @@ class RevenueAnalysisUseCase:
             texto += "O Ticket Médio manteve-se estável."
 
         # 3. Visão Grupo
-        if marca_grupo != "OUTROS" and len(df_grupo) > 1:
+        if marca_grupo != "OUTROS" and qtd_grupo > 1:
             texto += f"\n\n**3. Contexto Grupo {marca_grupo}:** "
             if spread_grp > 0:
                 texto += f"Liderança relativa, crescendo **+{spread_grp:.2f} p.p.** acima dos pares do grupo."
@@ -69,49 +72,40 @@ class RevenueAnalysisUseCase:
         """Executa a lógica de análise financeira da operadora."""
         try:
             # 1. Preparação
-            df_tri = self.df_mestre[self.df_mestre['ID_TRIMESTRE'] == trimestre].copy()
+            df_tri = filtrar_trimestre(self.df_mestre, trimestre).copy()
             
             if df_tri.empty:
                 raise FilterError(f"Sem dados disponíveis para o trimestre {trimestre}.")
 
             # Garante coluna de Marca
-            df_tri['Marca_Temp'] = df_tri.apply(
-                lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                axis=1
-            )
+            df_tri['Marca_Temp'] = self.cubo.marca_de(df_tri)
             
             # Tipagem segura
-            df_tri['ID_OPERADORA'] = df_tri['ID_OPERADORA'].astype(str)
             id_operadora = str(id_operadora)
 
-            row_op = df_tri[df_tri['ID_OPERADORA'] == id_operadora]
+            row_op = filtrar_operadora(df_tri, id_operadora)
             if row_op.empty:
                 raise FilterError(f"Operadora ID {id_operadora} não encontrada no trimestre {trimestre}.")
 
             dados_op = row_op.iloc[0]
-            marca = extrair_marca(dados_op['razao_social'], dados_op['ID_OPERADORA'])
+            marca = dados_op['Marca_Temp']
 
             # 2. Scores e Rankings Financeiros
             try:
                 df_score = calcular_score_financeiro(df_tri)
                 
                 # Garante tipagem no DF de score também
-                df_score['ID_OPERADORA'] = df_score['ID_OPERADORA'].astype(str)
                 df_score['Rank_Geral'] = df_score['Revenue_Score'].rank(ascending=False, method='min')
-                
-                df_score['Marca_Temp'] = df_score.apply(
-                    lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-                    axis=1
-                )
+
                 df_grupo = df_score[df_score['Marca_Temp'] == marca].copy()
                 df_grupo['Rank_Grupo'] = df_grupo['Revenue_Score'].rank(ascending=False, method='min')
                 
                 # Extração
-                row_geral = df_score[df_score['ID_OPERADORA'] == id_operadora]
+                row_geral = filtrar_operadora(df_score, id_operadora)
                 r_geral = int(row_geral['Rank_Geral'].iloc[0]) if not row_geral.empty else "-"
                 score = row_geral['Revenue_Score'].iloc[0] if not row_geral.empty else 0
                 
-                row_grupo = df_grupo[df_grupo['ID_OPERADORA'] == id_operadora]
+                row_grupo = filtrar_operadora(df_grupo, id_operadora)
                 r_grupo = int(row_grupo['Rank_Grupo'].iloc[0]) if not row_grupo.empty else "-"
             
             except Exception:
@@ -127,10 +121,10 @@ class RevenueAnalysisUseCase:
             kpis_avancados = calcular_kpis_financeiros_avancados(self.df_mestre, id_operadora, trimestre)
             
             # Insights de Marca
-            insights = analisar_performance_marca(df_tri, dados_op)
+            insights = analisar_performance_marca(df_tri, dados_op, self.cubo)
 
             # 4. Storytelling
-            resumo_narrativo = self._gerar_storytelling(dados_op['razao_social'], trimestre, kpis, kpis_avancados, df_tri, marca)
+            resumo_narrativo = self._gerar_storytelling(dados_op['razao_social'], trimestre, kpis, kpis_avancados, marca)
 
             # 5. Tabelas
             # Grupo
@@ -162,7 +156,8 @@ class RevenueAnalysisUseCase:
                     "storytelling": resumo_narrativo,
                     "tabela_grupo": df_view_grupo,
                     "tabela_geral": df_view_geral,
-                    "df_full": self.df_mestre # Para gráficos históricos
+                    "df_full": self.df_mestre, # Para gráficos históricos
+                    "cubo": self.cubo
                 }
             }
 
@@ -0,0 +1,136 @@
+"""
+Benchmark do backend analítico: consolidação do Dataset Mestre (join + LAG + KPIs) e
+agregação por trimestre, lado a lado, em Pandas, SQLite (SQL-native gold) e DuckDB.
+Gera uma base sintética com as três tabelas do ETL e mede o tempo de cada caminho
+de DataEngine._construir_dataset_mestre, conferindo que todos produzem o mesmo número de linhas.
+O DuckDB é opcional: sem o pacote, os cenários dele são ignorados.
+O SQL-native do SQLite junta por chaves calculadas (sem índice) e cresce quase
+quadraticamente; use --sem-gold-sqlite em bases grandes.
+
+Uso:
+    python -m benchmarks.bench_duckdb [--operadoras 500] [--trimestres 40] [--contas 4] [--sem-gold-sqlite]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from backend.config import settings
+from backend.services.data_engine import DataEngine
+from infra.db_connector import ConexaoSQLite
+from infra.duckdb_connector import ConexaoDuckDB
+
+TABELAS = ["dim_operadoras", "beneficiarios_agrupados", "demonstracoes_contabeis"]
+
+# Agregado de mercado por trimestre direto nas tabelas fato (mesma query nos dois motores)
+SQL_AGREGADO = """
+SELECT ID_TRIMESTRE, COUNT(DISTINCT CD_OPERADO) AS operadoras, SUM(NR_BENEF_T) AS vidas
+FROM beneficiarios_agrupados
+GROUP BY ID_TRIMESTRE
+ORDER BY ID_TRIMESTRE
+"""
+
+def _criar_base(caminho: Path, operadoras: int, trimestres: int, contas: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    codigos = rng.choice(np.arange(300000, 420000), operadoras, replace=False).astype(str)
+    periodos = [f"{a}-T{t}" for a in range(2012, 2040) for t in range(1, 5)][:trimestres]
+    conn = sqlite3.connect(caminho)
+    conn.executescript("""
+        CREATE TABLE dim_operadoras (registro_operadora TEXT, cnpj TEXT, razao_social TEXT,
+                                     uf TEXT, modalidade TEXT, cidade TEXT);
+        CREATE TABLE beneficiarios_agrupados (CD_OPERADO TEXT, NR_BENEF_T REAL, ID_TRIMESTRE TEXT);
+        CREATE TABLE demonstracoes_contabeis (REG_ANS TEXT, CD_CONTA_CONTABIL TEXT,
+                                              VL_SALDO_FINAL REAL, ID_TRIMESTRE TEXT);
+    """)
+    conn.executemany(
+        "INSERT INTO dim_operadoras VALUES (?,?,?,?,?,?)",
+        [(c, f"{i:014d}", f"OPERADORA {c}", "SP", "Medicina de Grupo", "SAO PAULO") for i, c in enumerate(codigos)]
+    )
+    pares = [(c, p) for c in codigos for p in periodos]
+    conn.executemany(
+        "INSERT INTO beneficiarios_agrupados VALUES (?,?,?)",
+        ((c, float(v), p) for (c, p), v in zip(pares, rng.integers(0, 100000, len(pares))))
+    )
+    conn.executemany(
+        "INSERT INTO demonstracoes_contabeis VALUES (?,?,?,?)",
+        ((c, "31", float(v), p) for (c, p) in pares for v in rng.random(contas) * 1e6)
+    )
+    conn.commit()
+    conn.close()
+
+def _medir(funcao) -> tuple:
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operadoras", type=int, default=500)
+    parser.add_argument("--trimestres", type=int, default=40)
+    parser.add_argument("--contas", type=int, default=4, help="linhas financeiras por operadora/trimestre")
+    parser.add_argument("--sem-gold-sqlite", action="store_true", help="ignora o cenário SQL-native do SQLite")
+    args = parser.parse_args()
+
+    try:
+        import duckdb  # noqa: F401
+        tem_duckdb = True
+    except ImportError:
+        tem_duckdb = False
+        print("duckdb não instalado: cenários DuckDB ignorados (pip install duckdb).")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "bench_duckdb.db"
+        pasta_parquet = Path(pasta) / "parquet"
+        _criar_base(caminho, args.operadoras, args.trimestres, args.contas)
+        if tem_duckdb:
+            ConexaoDuckDB.exportar_parquet(str(caminho), str(pasta_parquet), TABELAS)
+
+        settings.DB_PATH = caminho
+        settings.USAR_SNAPSHOT = False
+        settings.MANUTENCAO_AUTOMATICA = False
+
+        def _consolidar(backend: str, gold_sql: bool = False, parquet_dir=None):
+            def _executar():
+                settings.BACKEND_ANALITICO = backend
+                settings.MODO_GOLD_SQL = gold_sql
+                settings.DUCKDB_PARQUET_DIR = parquet_dir
+                return len(DataEngine()._construir_dataset_mestre())
+            return _executar
+
+        cenarios = [("gold: pandas (merge + groupby.shift)", _consolidar("sqlite"))]
+        if not args.sem_gold_sqlite:
+            cenarios.append(("gold: SQLite SQL-native", _consolidar("sqlite", gold_sql=True)))
+        if tem_duckdb:
+            cenarios += [
+                ("gold: DuckDB sobre o SQLite", _consolidar("duckdb")),
+                ("gold: DuckDB sobre Parquet", _consolidar("duckdb", parquet_dir=pasta_parquet)),
+            ]
+
+        def _agregado(conexao_factory):
+            def _executar():
+                with conexao_factory() as conexao:
+                    return len(conexao.executar_query(SQL_AGREGADO))
+            return _executar
+
+        cenarios.append(("agregado/trimestre: SQLite", _agregado(lambda: ConexaoSQLite(str(caminho)))))
+        if tem_duckdb:
+            cenarios.append(("agregado/trimestre: DuckDB (Parquet)",
+                             _agregado(lambda: ConexaoDuckDB(parquet_dir=str(pasta_parquet)))))
+
+        print(f"backend analítico - {args.operadoras:_} operadoras x {args.trimestres} trimestres "
+              f"x {args.contas} contas".replace("_", "."))
+        print(f"{'Cenário':<42}{'Tempo (s)':>12}{'Linhas':>12}")
+        linhas_gold = set()
+        for nome, funcao in cenarios:
+            duracao, linhas = _medir(funcao)
+            if nome.startswith("gold"):
+                linhas_gold.add(linhas)
+            print(f"{nome:<42}{duracao:>12.2f}{linhas:>12}")
+        if len(linhas_gold) > 1:
+            print(f"ATENÇÃO: caminhos gold divergentes em número de linhas: {sorted(linhas_gold)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark de escrita da carga (linhas/s): um DataFrame.to_sql(append) por resultado de
+worker (caminho do notebook) x GravadorSQLite (fila + executemany em transações grandes).
+
+Uso:
+    python -m benchmarks.bench_gravador [--resultados 200] [--linhas 5000]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl.gravador import GravadorSQLite
+
+def _resultados(qtd: int, linhas: int, seed: int = 42) -> list:
+    rng = np.random.default_rng(seed)
+    return [pd.DataFrame({
+        'ID_CMPT': f"2023{(i % 12) + 1:02d}",
+        'CD_OPERADO': np.char.zfill(rng.integers(1, 999999, linhas).astype(str), 6),
+        'NR_BENEF_T': rng.integers(0, 5000, linhas).astype(float),
+        'ID_TRIMESTRE': f"2023-T{(i % 12) // 3 + 1}",
+    }) for i in range(qtd)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resultados", type=int, default=200)
+    parser.add_argument("--linhas", type=int, default=5000)
+    args = parser.parse_args()
+    resultados = _resultados(args.resultados, args.linhas)
+    total = args.resultados * args.linhas
+
+    with tempfile.TemporaryDirectory() as pasta:
+        def _to_sql():
+            conn = sqlite3.connect(Path(pasta) / "to_sql.db")
+            for df in resultados:
+                df.to_sql("beneficiarios_agrupados", conn, if_exists='append', index=False)
+            conn.close()
+
+        def _gravador():
+            with GravadorSQLite(str(Path(pasta) / "gravador.db"), "beneficiarios_agrupados") as gravador:
+                for df in resultados:
+                    gravador.enviar(df)
+
+        print(f"gravação - {args.resultados} resultados x {args.linhas:_} linhas".replace("_", "."))
+        print(f"{'Cenário':<40}{'Tempo (s)':>12}{'Linhas/s':>14}")
+        for nome, funcao in [("to_sql por resultado (notebook)", _to_sql), ("GravadorSQLite", _gravador)]:
+            inicio = time.perf_counter()
+            funcao()
+            duracao = time.perf_counter() - inicio
+            print(f"{nome:<40}{duracao:>12.2f}{total / duracao:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
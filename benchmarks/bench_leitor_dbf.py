@@ -0,0 +1,87 @@
+"""
+Benchmark de vazão (MB/s) da leitura de DBF de beneficiários:
+  - dbfread registro a registro (caminho original do processar_arquivo_worker);
+  - LeitorDBF (np.frombuffer + dtype estruturado), decodificando só as 3 colunas do ETL;
+  - pipeline completo (LeitorDBF em lotes + agregação incremental).
+Gera um DBF sintético no layout do DATASUS e confere que os dois leitores produzem o mesmo resultado.
+
+Uso:
+    python -m benchmarks.bench_leitor_dbf [--linhas 2000000] [--lote 250000]
+"""
+import argparse
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dbfread import DBF
+
+from etl.beneficiarios import COLUNAS_BENEFICIARIOS, agregar_beneficiarios
+from etl.leitor_dbf import LeitorDBF
+
+CAMPOS = [("ID_CMPT", 6), ("CD_OPERADO", 6), ("SG_UF", 2), ("CD_MUNICIP", 6),
+          ("TP_SEXO", 1), ("DE_FAIXA_E", 20), ("NR_BENEF_T", 10)]
+
+def _criar_dbf(caminho: Path, linhas: int, seed: int = 42):
+    """Monta o bloco de registros direto num array estruturado (gravação em uma chamada)."""
+    rng = np.random.default_rng(seed)
+    operadoras = rng.integers(300000, 420000, 1500)
+    dtype = np.dtype([("_flag", "S1")] + [(nome, f"S{tamanho}") for nome, tamanho in CAMPOS])
+    registros = np.empty(linhas, dtype=dtype)
+    registros["_flag"] = b" "
+    registros["ID_CMPT"] = np.char.encode(rng.choice(["202301", "202302", "202303"], linhas))
+    registros["CD_OPERADO"] = np.char.encode(np.char.zfill(rng.choice(operadoras, linhas).astype(str), 6))
+    registros["SG_UF"] = np.char.encode(rng.choice(["SP", "RJ", "PE", "MG"], linhas))
+    registros["CD_MUNICIP"] = b"261160"
+    registros["TP_SEXO"] = np.char.encode(rng.choice(["M", "F"], linhas))
+    registros["DE_FAIXA_E"] = b"30 a 39 anos".ljust(20)
+    registros["NR_BENEF_T"] = np.char.encode(np.char.rjust(rng.integers(0, 5000, linhas).astype(str), 10))
+
+    tamanho_cabecalho = 32 + 32 * len(CAMPOS) + 1
+    with open(caminho, "wb") as f:
+        f.write(struct.pack("<BBBBIHH20x", 0x03, 124, 1, 1, linhas, tamanho_cabecalho, dtype.itemsize))
+        for nome, tamanho in CAMPOS:
+            tipo = b"N" if nome == "NR_BENEF_T" else b"C"
+            f.write(struct.pack("<11sc4xBB14x", nome.encode(), tipo, tamanho, 0))
+        f.write(b"\r")
+        f.write(registros.tobytes())
+        f.write(b"\x1a")
+
+def _dbfread(caminho: Path) -> pd.DataFrame:
+    tabela = DBF(str(caminho), encoding="iso-8859-1", load=False)
+    return pd.DataFrame([[r[c] for c in COLUNAS_BENEFICIARIOS] for r in tabela], columns=COLUNAS_BENEFICIARIOS)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=2_000_000)
+    parser.add_argument("--lote", type=int, default=250_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "bench_beneficiarios.dbf"
+        _criar_dbf(caminho, args.linhas)
+        megabytes = caminho.stat().st_size / 1024 ** 2
+
+        cenarios = [
+            ("dbfread (registro a registro)", lambda: _dbfread(caminho)),
+            ("LeitorDBF (3 colunas, bloco único)", lambda: LeitorDBF(caminho).ler(COLUNAS_BENEFICIARIOS)),
+            ("LeitorDBF em lotes + agregação", lambda: agregar_beneficiarios(
+                LeitorDBF(caminho).ler_lotes(COLUNAS_BENEFICIARIOS, args.lote))),
+        ]
+
+        print(f"leitor DBF - {args.linhas:_} registros ({megabytes:.1f} MB)".replace("_", "."))
+        print(f"{'Cenário':<40}{'Tempo (s)':>12}{'MB/s':>12}")
+        resultados = {}
+        for nome, funcao in cenarios:
+            inicio = time.perf_counter()
+            resultados[nome] = funcao()
+            duracao = time.perf_counter() - inicio
+            print(f"{nome:<40}{duracao:>12.2f}{megabytes / duracao:>12.1f}")
+
+        referencia, vetorizado = resultados[cenarios[0][0]], resultados[cenarios[1][0]]
+        print("Resultados idênticos:", referencia.equals(vetorizado))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark de DataProcessor.normalizar_chaves.
+Compara a implementação vetorizada com a versão antiga (closure por célula).
+
+Uso:
+    python -m benchmarks.bench_normalizar_chaves [--linhas 1200000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.processing.processor import DataProcessor
+
+def _normalizar_legado(valor):
+    return str(valor).split('.')[0].strip().zfill(6)
+
+def _gerar_cenarios(linhas: int, seed: int = 42) -> dict:
+    rng = np.random.default_rng(seed)
+    # ~1.500 operadoras distintas, como na base real
+    operadoras = rng.integers(300000, 420000, 1500)
+    ids = rng.choice(operadoras, linhas)
+    return {
+        "int64 (CD_OPERADO)": pd.Series(ids),
+        "float64 ('456.0')": pd.Series(ids.astype(float)),
+        "str (REG_ANS)": pd.Series(ids.astype(str), dtype=object),
+        "str com espaços": pd.Series([f" {i} " for i in ids], dtype=object),
+        "pior caso (todas distintas)": pd.Series(rng.permutation(linhas)),
+    }
+
+def _cronometrar(funcao, repeticoes: int = 3) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_200_000)
+    args = parser.parse_args()
+
+    print(f"normalizar_chaves - {args.linhas:,} linhas".replace(",", "."))
+    print(f"{'Cenário':<30}{'Legado (s)':>12}{'Vetorizado (s)':>16}{'Speedup':>10}")
+
+    for nome, serie in _gerar_cenarios(args.linhas).items():
+        df = pd.DataFrame({"chave": serie})
+
+        esperado = serie.apply(_normalizar_legado)
+        obtido = DataProcessor.normalizar_chaves(df.copy(), ["chave"])["chave"]
+        assert esperado.equals(obtido), f"Divergência de saída no cenário '{nome}'"
+
+        t_legado = _cronometrar(lambda: serie.apply(_normalizar_legado))
+        t_vetor = _cronometrar(lambda: DataProcessor.normalizar_chaves(df.copy(), ["chave"]))
+        print(f"{nome:<30}{t_legado:>12.3f}{t_vetor:>16.3f}{t_legado / t_vetor:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
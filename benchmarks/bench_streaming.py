@@ -0,0 +1,87 @@
+"""
+Benchmark de memória: leitura completa (executar_query) x leitura em lotes (executar_query_stream).
+Gera uma base sintética de beneficiários e mede o pico de alocação (tracemalloc) de:
+  - materializar a tabela inteira e normalizar a chave depois (caminho antigo do ETL);
+  - ler em lotes normalizando cada lote (caminho atual do ETL);
+  - apenas percorrer os lotes (pico por lote, ex: agregações/loaders por trimestre).
+
+Uso:
+    python -m benchmarks.bench_streaming [--linhas 1000000] [--lote 100000]
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from infra.db_connector import PoolConexoesSQLite
+from backend.processing.processor import DataProcessor
+
+SQL = "SELECT CD_OPERADO, ID_TRIMESTRE, NR_BENEF_T FROM beneficiarios_agrupados WHERE ID_TRIMESTRE >= ?"
+
+def _criar_base(caminho: Path, linhas: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    operadoras = rng.integers(300000, 420000, 1500).astype(str)
+    trimestres = [f"{a}-T{t}" for a in range(2012, 2025) for t in range(1, 5)]
+    conn = sqlite3.connect(caminho)
+    conn.execute("CREATE TABLE beneficiarios_agrupados (CD_OPERADO TEXT, NR_BENEF_T REAL, ID_TRIMESTRE TEXT)")
+    conn.executemany(
+        "INSERT INTO beneficiarios_agrupados VALUES (?,?,?)",
+        zip(rng.choice(operadoras, linhas).tolist(),
+            rng.integers(0, 100000, linhas).astype(float).tolist(),
+            rng.choice(trimestres, linhas).tolist())
+    )
+    conn.commit()
+    conn.close()
+
+def _medir(funcao) -> tuple:
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico / 1024 ** 2
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--lote", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "bench_streaming.db"
+        _criar_base(caminho, args.linhas)
+        pool = PoolConexoesSQLite(str(caminho))
+        params = ("2012-T1",)
+
+        def _completo():
+            df = pool.executar_query(SQL, params)
+            DataProcessor.normalizar_chaves(df, ["CD_OPERADO"])
+
+        def _em_lotes():
+            lotes = [DataProcessor.normalizar_chaves(l, ["CD_OPERADO"])
+                     for l in pool.executar_query_stream(SQL, params, tamanho_lote=args.lote)]
+            pd.concat(lotes, ignore_index=True)
+
+        def _apenas_lotes():
+            for lote in pool.executar_query_stream(SQL, params, tamanho_lote=args.lote, formato="arrow"):
+                lote.num_rows
+
+        print(f"streaming - {args.linhas:_} linhas; lote de {args.lote:_}".replace("_", "."))
+        print(f"{'Cenário':<40}{'Tempo (s)':>12}{'Pico (MB)':>12}")
+        for nome, funcao in [
+            ("executar_query + normalizar", _completo),
+            ("stream pandas + normalizar por lote", _em_lotes),
+            ("stream arrow (somente percorrer)", _apenas_lotes),
+        ]:
+            duracao, pico = _medir(funcao)
+            print(f"{nome:<40}{duracao:>12.2f}{pico:>12.1f}")
+        pool.fechar()
+
+if __name__ == "__main__":
+    main()
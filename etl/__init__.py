@@ -0,0 +1,48 @@
+"""
+ETL das bases abertas da ANS (antes só no notebook Extração_e_Tratamento_dos_Dados_ANS.ipynb).
+
+Uso (CLI):
+    python -m etl beneficiarios --db data/base_ans_paralela.db [--origem URL_OU_PASTA] [--workers 4]
+    python -m etl contabeis --db data/base_ans_paralela.db [--origem URL_OU_PASTA] [--workers 8]
+"""
+from etl.beneficiarios import (
+    COLUNAS_BENEFICIARIOS,
+    gerar_chave_trimestre,
+    ler_dbf_em_lotes,
+    agregar_beneficiarios,
+    processar_arquivo,
+    processar_arquivo_worker,
+)
+from etl.importador import ImportadorANSParalelo, URL_BENEFICIARIOS, executar_carga
+from etl.contabeis import (
+    COLUNAS_CONTABEIS,
+    extrair_trimestre_arquivo,
+    ler_contabeis_zip,
+    processar_zip_worker,
+    ExtratorContabilParalelo,
+    URL_CONTABEIS,
+)
+from etl.gravador import GravadorSQLite
+from etl.cache_fontes import CacheFontes, ResultadoFonte, processar_fonte
+
+__all__ = [
+    "COLUNAS_BENEFICIARIOS",
+    "gerar_chave_trimestre",
+    "ler_dbf_em_lotes",
+    "agregar_beneficiarios",
+    "processar_arquivo",
+    "processar_arquivo_worker",
+    "ImportadorANSParalelo",
+    "URL_BENEFICIARIOS",
+    "executar_carga",
+    "COLUNAS_CONTABEIS",
+    "extrair_trimestre_arquivo",
+    "ler_contabeis_zip",
+    "processar_zip_worker",
+    "ExtratorContabilParalelo",
+    "URL_CONTABEIS",
+    "GravadorSQLite",
+    "CacheFontes",
+    "ResultadoFonte",
+    "processar_fonte",
+]
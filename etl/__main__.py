@@ -0,0 +1,89 @@
+"""
+CLI do ETL da ANS.
+
+Uso:
+    python -m etl beneficiarios [--db CAMINHO] [--origem URL_OU_PASTA] [--workers N] [--lote N]
+    python -m etl contabeis [--db CAMINHO] [--origem URL_OU_PASTA] [--workers N]
+
+Fontes já carregadas com o mesmo conteúdo são puladas; downloads e resultados processados
+ficam em --cache (padrão: data/cache/fontes_ans). --sem-cache baixa tudo para uma pasta temporária.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from backend.config import settings
+from etl.importador import ImportadorANSParalelo, URL_BENEFICIARIOS
+from etl.contabeis import ExtratorContabilParalelo, URL_CONTABEIS
+
+
+def _diretorio_cache(args):
+    return None if args.sem_cache else args.cache
+
+
+def _adicionar_opcoes_cache(subparser):
+    subparser.add_argument("--cache", default=str(settings.ETL_CACHE_DIR),
+                           help="Pasta do cache de downloads/processados (por sha256)")
+    subparser.add_argument("--sem-cache", action="store_true", help="Não reaproveita downloads nem processados")
+
+
+def _cmd_beneficiarios(args) -> int:
+    importador = ImportadorANSParalelo(args.db, max_workers=args.workers, tamanho_lote=args.lote,
+                                       diretorio_cache=_diretorio_cache(args))
+    if Path(args.origem).is_dir():
+        fontes = importador.listar_arquivos_locais(args.origem)
+    else:
+        fontes = importador.obter_links(args.origem)
+
+    if not fontes:
+        print(f"Nenhum arquivo encontrado em {args.origem}.", file=sys.stderr)
+        return 1
+    importador.processar_paralelo(fontes, tabela_destino=args.tabela)
+    return 0
+
+
+def _cmd_contabeis(args) -> int:
+    extrator = ExtratorContabilParalelo(args.db, max_workers=args.workers, diretorio_cache=_diretorio_cache(args))
+    if Path(args.origem).is_dir():
+        tarefas = extrator.listar_arquivos_locais(args.origem)
+    else:
+        tarefas = extrator.mapear_arquivos(args.origem)
+
+    if not tarefas:
+        print(f"Nenhum arquivo encontrado em {args.origem}.", file=sys.stderr)
+        return 1
+    extrator.executar(tarefas, tabela_destino=args.tabela)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m etl", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    beneficiarios = subparsers.add_parser("beneficiarios", help="Beneficiários por operadora (DATASUS .dbc)")
+    beneficiarios.add_argument("--db", default=str(settings.DB_PATH), help="Banco SQLite de destino")
+    beneficiarios.add_argument("--origem", default=URL_BENEFICIARIOS,
+                               help="URL do índice da ANS ou pasta local com .dbc/.dbf")
+    beneficiarios.add_argument("--tabela", default="beneficiarios_agrupados")
+    beneficiarios.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    beneficiarios.add_argument("--lote", type=int, default=50_000, help="Registros DBF por lote")
+    _adicionar_opcoes_cache(beneficiarios)
+    beneficiarios.set_defaults(funcao=_cmd_beneficiarios)
+
+    contabeis = subparsers.add_parser("contabeis", help="Demonstrações contábeis trimestrais (ZIP/CSV)")
+    contabeis.add_argument("--db", default=str(settings.DB_PATH), help="Banco SQLite de destino")
+    contabeis.add_argument("--origem", default=URL_CONTABEIS,
+                           help="URL da pasta da ANS ou pasta local com <ano>/<arquivo>.zip")
+    contabeis.add_argument("--tabela", default="demonstracoes_contabeis")
+    contabeis.add_argument("--workers", type=int, default=8)
+    _adicionar_opcoes_cache(contabeis)
+    contabeis.set_defaults(funcao=_cmd_contabeis)
+
+    args = parser.parse_args(argv)
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
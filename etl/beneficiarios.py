@@ -0,0 +1,111 @@
+import os
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from etl.leitor_dbf import LeitorDBF
+from etl.cache_fontes import ResultadoFonte, processar_fonte
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Colunas lidas dos microdados de beneficiários (DATASUS .dbc) e chave da agregação
+COLUNAS_BENEFICIARIOS = ['ID_CMPT', 'CD_OPERADO', 'NR_BENEF_T']
+CHAVE_AGREGACAO = ['ID_CMPT', 'CD_OPERADO']
+ENCODING_DBF = 'iso-8859-1'
+# Incrementar quando a saída de processar_arquivo mudar (invalida o cache de processados)
+VERSAO_PROCESSAMENTO = 1
+
+
+def gerar_chave_trimestre(id_cmpt) -> Optional[str]:
+    """Competência 'AAAAMM' -> 'AAAA-Tn' (None se inválida)."""
+    try:
+        s_cmpt = str(id_cmpt).strip()
+        if len(s_cmpt) < 6:
+            return None
+        ano = s_cmpt[:4]
+        mes = int(s_cmpt[4:6])
+        trimestre = (mes - 1) // 3 + 1
+        return f"{ano}-T{trimestre}"
+    except (TypeError, ValueError):
+        return None
+
+
+def ler_dbf_em_lotes(caminho_dbf, colunas: list = None, tamanho_lote: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    Lê o DBF mapeado em memória (LeitorDBF) e entrega DataFrames de no máximo
+    `tamanho_lote` linhas, decodificando só as colunas pedidas.
+    """
+    yield from LeitorDBF(caminho_dbf, encoding=ENCODING_DBF).ler_lotes(colunas, tamanho_lote)
+
+
+def agregar_beneficiarios(lotes) -> pd.DataFrame:
+    """
+    Soma NR_BENEF_T por (ID_CMPT, CD_OPERADO) de forma incremental: cada lote é reduzido
+    e combinado ao acumulado, cujo tamanho é limitado pelo número de chaves distintas
+    (não pelo tamanho do arquivo). Resultado igual ao groupby do arquivo inteiro.
+    """
+    acumulado = None
+    for lote in lotes:
+        lote = lote[COLUNAS_BENEFICIARIOS].copy()
+        lote['NR_BENEF_T'] = pd.to_numeric(lote['NR_BENEF_T'], errors='coerce').fillna(0)
+        parcial = lote.groupby(CHAVE_AGREGACAO, as_index=False)['NR_BENEF_T'].sum()
+        if acumulado is not None:
+            parcial = pd.concat([acumulado, parcial], ignore_index=True)
+            parcial = parcial.groupby(CHAVE_AGREGACAO, as_index=False)['NR_BENEF_T'].sum()
+        acumulado = parcial
+
+    if acumulado is None:
+        return pd.DataFrame(columns=COLUNAS_BENEFICIARIOS + ['ID_TRIMESTRE'])
+
+    # Poucas competências distintas por arquivo: a chave é calculada uma vez por competência
+    trimestres = {cmpt: gerar_chave_trimestre(cmpt) for cmpt in acumulado['ID_CMPT'].unique()}
+    acumulado['ID_TRIMESTRE'] = acumulado['ID_CMPT'].map(trimestres)
+    return acumulado
+
+
+def processar_arquivo(caminho, tamanho_lote: int = 50_000) -> Optional[pd.DataFrame]:
+    """
+    Processa um arquivo local (.dbc do DATASUS ou .dbf já descompactado) e devolve os
+    beneficiários agregados por competência e operadora (None se faltarem colunas).
+    """
+    caminho = Path(caminho)
+    if caminho.suffix.lower() != '.dbc':
+        return _processar_dbf(caminho, tamanho_lote)
+
+    from datasus_dbc import decompress
+
+    with tempfile.TemporaryDirectory(prefix="etl_ans_") as pasta:
+        caminho_dbf = Path(pasta) / f"{caminho.stem}.dbf"
+        decompress(str(caminho), str(caminho_dbf))
+        return _processar_dbf(caminho_dbf, tamanho_lote, nome=caminho.name)
+
+
+def _processar_dbf(caminho_dbf: Path, tamanho_lote: int, nome: str = None) -> Optional[pd.DataFrame]:
+    nome = nome or caminho_dbf.name
+    campos = LeitorDBF(caminho_dbf, encoding=ENCODING_DBF).field_names
+    ausentes = [c for c in COLUNAS_BENEFICIARIOS if c not in campos]
+    if ausentes:
+        logger.warning(f"Ignorado {nome}: colunas ausentes {ausentes}.")
+        return None
+    return agregar_beneficiarios(ler_dbf_em_lotes(caminho_dbf, COLUNAS_BENEFICIARIOS, tamanho_lote))
+
+
+def processar_arquivo_worker(origem: str, tamanho_lote: int = 50_000, diretorio_cache: str = None,
+                             sha256_carregado: str = None) -> ResultadoFonte:
+    """
+    Unidade de trabalho de um processo do pool: obtém o arquivo (cache de fontes), descompacta,
+    lê em lotes e agrega. Conteúdo igual ao já gravado (sha256_carregado) nem é lido.
+    Erros são logados e viram um resultado sem sha256, sem derrubar os demais arquivos.
+    """
+    nome_arquivo = str(origem).split('/')[-1]
+    try:
+        return processar_fonte(origem, partial(processar_arquivo, tamanho_lote=tamanho_lote),
+                               parser="beneficiarios", versao=VERSAO_PROCESSAMENTO,
+                               diretorio_cache=diretorio_cache, sha256_carregado=sha256_carregado)
+    except Exception as e:
+        logger.error(f"Erro em {nome_arquivo}: {e} (pid {os.getpid()})")
+        return ResultadoFonte(str(origem))
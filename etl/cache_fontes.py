@@ -0,0 +1,185 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import requests
+
+from infra.snapshot_store import SnapshotArrow
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DDL_INDICE = """
+CREATE TABLE IF NOT EXISTS fontes (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    tamanho INTEGER,
+    sha256 TEXT NOT NULL,
+    atualizado_em TEXT DEFAULT (datetime('now'))
+)
+"""
+
+
+@dataclass
+class FonteLocal:
+    """Arquivo de origem já disponível localmente, identificado pelo hash do conteúdo."""
+    origem: str
+    caminho: Path
+    sha256: str
+    baixado: bool = False
+
+
+def calcular_sha256(caminho, tamanho_bloco: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class CacheFontes:
+    """
+    Cache local das fontes da ANS, endereçado por conteúdo:
+      - objetos/<sha[:2]>/<sha><ext>: o arquivo baixado, gravado uma vez por conteúdo;
+      - indice.db: URL -> (ETag, Last-Modified, tamanho, sha256). Se o HEAD devolve os
+        mesmos validadores, o download é evitado;
+      - processados/: resultado do parser por (sha256, parser, versão), em Arrow IPC.
+    O índice é SQLite (WAL), então vários workers (processos) podem usar o mesmo cache.
+    Princípio: Ignorância de Configuração.
+    """
+
+    def __init__(self, diretorio: str, timeout: float = 120.0):
+        self.diretorio = Path(diretorio)
+        self.timeout = timeout
+        self.pasta_objetos = self.diretorio / "objetos"
+        self.pasta_processados = self.diretorio / "processados"
+        self.caminho_indice = self.diretorio / "indice.db"
+        self.pasta_objetos.mkdir(parents=True, exist_ok=True)
+        with self._conectar() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(_DDL_INDICE)
+
+    @contextmanager
+    def _conectar(self):
+        """Conexão curta com o índice (commit ao sair sem erro; sempre fechada)."""
+        conn = sqlite3.connect(self.caminho_indice, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _caminho_objeto(self, sha256: str, sufixo: str) -> Path:
+        return self.pasta_objetos / sha256[:2] / f"{sha256}{sufixo.lower()}"
+
+    # --- Download ---
+    def obter(self, origem: str, sessao=None) -> FonteLocal:
+        """
+        Disponibiliza a fonte localmente. Caminhos locais só são identificados pelo hash;
+        URLs passam por HEAD e só são baixadas se ETag/Last-Modified/tamanho mudaram
+        (ou se o objeto sumiu do cache).
+        """
+        if not str(origem).lower().startswith(("http://", "https://")):
+            return FonteLocal(str(origem), Path(origem), calcular_sha256(origem))
+
+        sessao = sessao or requests
+        sufixo = Path(str(origem).split('?')[0]).suffix
+        validadores = self._validadores(sessao.head(origem, timeout=self.timeout, allow_redirects=True))
+
+        with self._conectar() as conn:
+            registro = conn.execute(
+                "SELECT etag, last_modified, tamanho, sha256 FROM fontes WHERE url = ?", (origem,)).fetchone()
+        if registro is not None and any(validadores) and tuple(registro[:3]) == validadores:
+            caminho = self._caminho_objeto(registro[3], sufixo)
+            if caminho.exists():
+                return FonteLocal(origem, caminho, registro[3])
+
+        sha256, caminho = self._baixar(origem, sufixo, sessao)
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fontes (url, etag, last_modified, tamanho, sha256) VALUES (?, ?, ?, ?, ?)",
+                (origem, *validadores, sha256))
+        return FonteLocal(origem, caminho, sha256, baixado=True)
+
+    @staticmethod
+    def _validadores(resposta) -> tuple:
+        resposta.raise_for_status()
+        tamanho = resposta.headers.get('Content-Length')
+        return (resposta.headers.get('ETag'), resposta.headers.get('Last-Modified'),
+                int(tamanho) if tamanho is not None else None)
+
+    def _baixar(self, origem: str, sufixo: str, sessao) -> tuple:
+        """Download em streaming calculando o hash; o objeto só aparece completo (os.replace)."""
+        temporario = self.pasta_objetos / f"tmp-{uuid.uuid4().hex}"
+        h = hashlib.sha256()
+        try:
+            with sessao.get(origem, stream=True, timeout=self.timeout) as resposta:
+                resposta.raise_for_status()
+                with open(temporario, 'wb') as f:
+                    for bloco in resposta.iter_content(chunk_size=1024 * 1024):
+                        h.update(bloco)
+                        f.write(bloco)
+            sha256 = h.hexdigest()
+            destino = self._caminho_objeto(sha256, sufixo)
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temporario, destino)
+            return sha256, destino
+        finally:
+            if temporario.exists():
+                temporario.unlink()
+
+    # --- Resultado processado ---
+    def _snapshot_processado(self, sha256: str, parser: str, versao: int) -> SnapshotArrow:
+        return SnapshotArrow(str(self.pasta_processados), nome=f"{sha256}-{parser}-v{versao}")
+
+    def ler_processado(self, sha256: str, parser: str, versao: int) -> Optional[pd.DataFrame]:
+        return self._snapshot_processado(sha256, parser, versao).ler()
+
+    def salvar_processado(self, sha256: str, parser: str, versao: int, df: pd.DataFrame) -> None:
+        self._snapshot_processado(sha256, parser, versao).salvar(df, {"sha256": sha256, "parser": parser})
+
+
+@dataclass
+class ResultadoFonte:
+    """Saída de um worker: sha256=None indica falha (a fonte não entra no registro de cargas)."""
+    origem: str
+    sha256: Optional[str] = None
+    df: Optional[pd.DataFrame] = None
+    inalterado: bool = False
+
+
+def processar_fonte(origem: str, processar, parser: str, versao: int,
+                    diretorio_cache: str = None, sha256_carregado: str = None) -> ResultadoFonte:
+    """
+    Fluxo comum dos workers: obtém a fonte pelo cache (sem download se inalterada), pula
+    o parsing se o conteúdo é o mesmo já gravado no banco (sha256_carregado) e reaproveita
+    o resultado processado do mesmo conteúdo (mesmo parser/versão) quando existir.
+    Sem diretorio_cache, o download vai para uma pasta temporária e nada é reaproveitado.
+    """
+    if diretorio_cache is None:
+        with tempfile.TemporaryDirectory(prefix="etl_ans_") as pasta:
+            return _processar_fonte(CacheFontes(pasta), origem, processar, parser, versao, sha256_carregado,
+                                    reaproveitar=False)
+    return _processar_fonte(CacheFontes(diretorio_cache), origem, processar, parser, versao, sha256_carregado)
+
+
+def _processar_fonte(cache: CacheFontes, origem, processar, parser, versao, sha256_carregado,
+                     reaproveitar: bool = True) -> ResultadoFonte:
+    fonte = cache.obter(origem)
+    if fonte.sha256 == sha256_carregado:
+        return ResultadoFonte(origem, fonte.sha256, inalterado=True)
+
+    df = cache.ler_processado(fonte.sha256, parser, versao) if reaproveitar else None
+    if df is None:
+        df = processar(fonte.caminho)
+        if df is not None and reaproveitar:
+            cache.salvar_processado(fonte.sha256, parser, versao, df)
+    return ResultadoFonte(origem, fonte.sha256, df)
@@ -0,0 +1,148 @@
+import re
+import zipfile
+from functools import partial
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urljoin
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+from etl.importador import executar_carga
+from etl.cache_fontes import ResultadoFonte, processar_fonte
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+URL_CONTABEIS = "https://dadosabertos.ans.gov.br/FTP/PDA/demonstracoes_contabeis/"
+
+# Conta 31 = contraprestações efetivas (receita); colunas gravadas em demonstracoes_contabeis
+CONTA_RECEITA = '31'
+COLUNAS_CONTABEIS = ['REG_ANS', 'CD_CONTA_CONTABIL', 'VL_SALDO_FINAL', 'ID_TRIMESTRE']
+# Incrementar quando a saída de ler_contabeis_zip mudar (invalida o cache de processados)
+VERSAO_PROCESSAMENTO = 1
+
+
+def extrair_trimestre_arquivo(nome_arquivo: str, pasta_ano: str) -> Optional[str]:
+    """Descobre 'AAAA-Tn' pelo nome do ZIP (ex: '1T2023.zip') e pela pasta do ano."""
+    nome = nome_arquivo.lower()
+
+    # 1. Ano pela pasta (mais confiável); senão, pelo nome do arquivo
+    ano = str(pasta_ano).rstrip('/\\')[-4:]
+    if not ano.isdigit():
+        encontrado = re.search(r'(20\d{2})', nome)
+        if not encontrado:
+            return None
+        ano = encontrado.group(1)
+
+    # 2. Trimestre: "1 trimestre"/"1_tri", "1t" ou "t1"
+    for padrao in (r'([1-4])\s*[-_]?\s*(?:trimestre|tri)', r'([1-4])t', r't([1-4])'):
+        encontrado = re.search(padrao, nome)
+        if encontrado:
+            return f"{ano}-T{encontrado.group(1)}"
+    return None
+
+
+def ler_contabeis_zip(conteudo, id_trimestre: str) -> Optional[pd.DataFrame]:
+    """Lê o CSV do ZIP (caminho ou arquivo aberto), filtra a conta de receita e normaliza o valor."""
+    with zipfile.ZipFile(conteudo) as z:
+        csvs = [n for n in z.namelist() if n.lower().endswith('.csv')]
+        if not csvs:
+            return None
+        with z.open(csvs[0]) as f:
+            # Tudo como texto para não perder zeros à esquerda
+            df = pd.read_csv(f, sep=';', encoding='iso-8859-1', dtype=str)
+
+    df.columns = [c.upper().strip() for c in df.columns]
+    if 'CD_CONTA_CONTABIL' not in df.columns:
+        return None
+
+    df = df[df['CD_CONTA_CONTABIL'] == CONTA_RECEITA].copy()
+    if df.empty:
+        return None
+
+    df['ID_TRIMESTRE'] = id_trimestre
+    if 'VL_SALDO_FINAL' in df.columns:
+        # Formato brasileiro: '1.234,56' -> 1234.56
+        valores = df['VL_SALDO_FINAL'].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        df['VL_SALDO_FINAL'] = pd.to_numeric(valores, errors='coerce')
+
+    # Só as colunas do banco (VL_SALDO_INICIAL, DATA etc. ficam de fora)
+    return df[[c for c in COLUNAS_CONTABEIS if c in df.columns]]
+
+
+def processar_zip_worker(tarefa, diretorio_cache: str = None, sha256_carregado: str = None) -> ResultadoFonte:
+    """
+    Unidade de trabalho do pool: tarefa = (origem do ZIP, pasta do ano), onde a origem
+    é uma URL ou um caminho local. Erros são logados e viram um resultado sem sha256.
+    """
+    origem, pasta_ano = tarefa
+    nome_arquivo = str(origem).replace('\\', '/').split('/')[-1]
+    id_trimestre = extrair_trimestre_arquivo(nome_arquivo, pasta_ano)
+    if not id_trimestre:
+        return ResultadoFonte(str(origem))
+
+    try:
+        return processar_fonte(origem, partial(ler_contabeis_zip, id_trimestre=id_trimestre),
+                               parser=f"contabeis-{id_trimestre}", versao=VERSAO_PROCESSAMENTO,
+                               diretorio_cache=diretorio_cache, sha256_carregado=sha256_carregado)
+    except Exception as e:
+        logger.error(f"Falha em {nome_arquivo}: {e}")
+        return ResultadoFonte(str(origem))
+
+
+class ExtratorContabilParalelo:
+    """
+    Carga das demonstrações contábeis trimestrais (ZIP com CSV): um processo por arquivo
+    (via cache de fontes) e um único gravador, pelo mesmo laço da carga de beneficiários.
+    Princípio: Ignorância de Configuração.
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 8, diretorio_cache: str = None):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.diretorio_cache = str(diretorio_cache) if diretorio_cache else None
+
+    @staticmethod
+    def mapear_arquivos(url_base: str = URL_CONTABEIS) -> list:
+        """Varre as pastas de ano e retorna [(url_zip, url_pasta_ano)]."""
+        logger.info(f"Mapeando estrutura de pastas em: {url_base}")
+        tarefas = []
+        try:
+            resposta = requests.get(url_base, timeout=30)
+            resposta.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Erro no mapeamento: {e}")
+            return tarefas
+
+        soup = BeautifulSoup(resposta.content, 'html.parser')
+        pastas_ano = [urljoin(url_base, a.get('href')) for a in soup.find_all('a')
+                      if a.get('href') and re.match(r'\d{4}/', a.get('href'))]
+        logger.info(f"Anos encontrados: {len(pastas_ano)}. Buscando ZIPs dentro de cada ano...")
+
+        for url_ano in pastas_ano:
+            try:
+                resposta_ano = requests.get(url_ano, timeout=30)
+                resposta_ano.raise_for_status()
+            except requests.RequestException as e:
+                logger.error(f"Erro ao ler pasta {url_ano}: {e}")
+                continue
+            soup_ano = BeautifulSoup(resposta_ano.content, 'html.parser')
+            tarefas.extend((urljoin(url_ano, a.get('href')), url_ano) for a in soup_ano.find_all('a')
+                           if a.get('href') and a.get('href').lower().endswith('.zip'))
+        return tarefas
+
+    @staticmethod
+    def listar_arquivos_locais(pasta: str) -> list:
+        """ZIPs de uma pasta local organizada por ano (ex: 2023/1T2023.zip)."""
+        return [(str(p), str(p.parent)) for p in sorted(Path(pasta).rglob('*.zip'))]
+
+    def executar(self, tarefas: list, tabela_destino: str = 'demonstracoes_contabeis') -> int:
+        """Processa as tarefas em paralelo; retorna o total de linhas gravadas."""
+        if not tarefas:
+            logger.warning("Nenhum arquivo encontrado.")
+            return 0
+        worker = partial(processar_zip_worker, diretorio_cache=self.diretorio_cache)
+        return executar_carga(worker, tarefas, self.db_path, tabela_destino, self.max_workers,
+                              origem_de=lambda tarefa: tarefa[0])["linhas"]
@@ -0,0 +1,198 @@
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+_FIM = object()
+
+# Registro das fontes já carregadas: (tabela, origem) -> conteúdo (sha256) e faixa de rowids gravada
+TABELA_REGISTRO = "etl_fontes_carregadas"
+_DDL_REGISTRO = f"""
+CREATE TABLE IF NOT EXISTS {TABELA_REGISTRO} (
+    tabela TEXT NOT NULL,
+    origem TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    linhas INTEGER NOT NULL,
+    rowid_inicio INTEGER,
+    rowid_fim INTEGER,
+    carregado_em TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (tabela, origem)
+)
+"""
+
+
+class GravadorSQLite:
+    """
+    Estágio único de escrita da carga: os resultados dos workers chegam por uma fila
+    limitada e uma thread dedicada grava tudo com executemany, várias entregas por
+    transação explícita (commit a cada `linhas_por_transacao`). Durante a carga a
+    conexão usa journal_mode=WAL e synchronous=OFF.
+    Princípio: Ignorância de Configuração.
+
+    Com `origem` e `sha256` no enviar, a carga fica registrada em etl_fontes_carregadas
+    na mesma transação das linhas. Uma fonte que volta com outro conteúdo substitui
+    as linhas da carga anterior (faixa de rowids); fontes_carregadas() permite pular
+    as inalteradas antes de processá-las.
+
+    Uso:
+        with GravadorSQLite(db_path, "beneficiarios_agrupados") as gravador:
+            gravador.enviar(df, origem=url, sha256=hash_do_arquivo)
+        gravador.estatisticas  # linhas, transacoes, segundos, linhas_por_segundo
+    """
+
+    def __init__(self, db_path: str, tabela: str, linhas_por_transacao: int = 200_000, tamanho_fila: int = 16):
+        """
+        Args:
+            db_path (str): Banco SQLite de destino.
+            tabela (str): Tabela de destino (criada no primeiro lote, como no to_sql).
+            linhas_por_transacao (int): Linhas acumuladas antes de cada COMMIT.
+            tamanho_fila (int): Resultados pendentes antes de os produtores esperarem.
+        """
+        self.db_path = db_path
+        self.tabela = tabela
+        self.linhas_por_transacao = linhas_por_transacao
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._thread: Optional[threading.Thread] = None
+        self._erro: Optional[BaseException] = None
+        self.estatisticas = {"linhas": 0, "transacoes": 0, "segundos": 0.0, "linhas_por_segundo": 0.0}
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.finalizar(propagar=exc_type is None)
+
+    def iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._executar, name=f"gravador-{self.tabela}", daemon=True)
+            self._thread.start()
+
+    def enviar(self, df: pd.DataFrame, origem: str = None, sha256: str = None):
+        """Entrega um resultado ao gravador (bloqueia se a fila estiver cheia)."""
+        if self._erro is not None:
+            raise self._erro
+        if df is None:
+            df = pd.DataFrame()
+        if not df.empty or origem is not None:
+            self._fila.put((df, origem, sha256))
+
+    @staticmethod
+    def fontes_carregadas(db_path: str, tabela: str) -> dict:
+        """{origem: sha256} das fontes já gravadas na tabela ({} se não houver registro)."""
+        if not Path(db_path).exists():
+            return {}
+        conexao = sqlite3.connect(db_path)
+        try:
+            return dict(conexao.execute(
+                f"SELECT origem, sha256 FROM {TABELA_REGISTRO} WHERE tabela = ?", (tabela,)).fetchall())
+        except sqlite3.OperationalError:
+            return {}  # banco sem registro (carga anterior a ele)
+        finally:
+            conexao.close()
+
+    def finalizar(self, propagar: bool = True) -> dict:
+        """Grava o que falta, fecha a conexão e devolve as estatísticas da carga."""
+        if self._thread is not None:
+            self._fila.put(_FIM)
+            self._thread.join()
+            self._thread = None
+        if propagar and self._erro is not None:
+            raise self._erro
+        return self.estatisticas
+
+    def _executar(self):
+        inicio = time.perf_counter()
+        conexao = None
+        pendentes = 0
+        try:
+            conexao = sqlite3.connect(self.db_path, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode = WAL")
+            conexao.execute("PRAGMA synchronous = OFF")
+            conexao.execute(_DDL_REGISTRO)
+            conexao.execute("BEGIN")
+        except Exception as e:
+            self._falhar(e, conexao)
+
+        while True:
+            item = self._fila.get()
+            if item is _FIM:
+                break
+            if self._erro is not None:
+                continue  # após uma falha só esvazia a fila, para não travar os produtores
+            try:
+                pendentes += self._inserir(conexao, *item)
+                if pendentes >= self.linhas_por_transacao:
+                    self._commit(conexao, pendentes)
+                    pendentes = 0
+            except Exception as e:
+                self._falhar(e, conexao)
+
+        try:
+            if self._erro is None:
+                self._commit(conexao, pendentes, reabrir=False)
+        except Exception as e:
+            self._falhar(e, conexao)
+        finally:
+            if conexao is not None:
+                conexao.close()
+            self._registrar(time.perf_counter() - inicio)
+
+    def _falhar(self, erro: Exception, conexao: Optional[sqlite3.Connection]):
+        logger.error(f"Erro ao gravar em '{self.tabela}': {erro}")
+        self._erro = erro
+        if conexao is not None and conexao.in_transaction:
+            conexao.execute("ROLLBACK")
+
+    def _inserir(self, conexao: sqlite3.Connection, df: pd.DataFrame, origem: str, sha256: str) -> int:
+        if origem is not None:
+            self._remover_carga_anterior(conexao, origem)
+
+        faixa = (None, None)
+        if not df.empty:
+            # Mesmo DDL do DataFrame.to_sql (append): a tabela nasce com os tipos do primeiro lote
+            conexao.execute(pd.io.sql.get_schema(df, self.tabela).replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+            colunas = ", ".join(f'"{c}"' for c in df.columns)
+            marcadores = ", ".join("?" * len(df.columns))
+            # NaN vira NULL no bind do SQLite; itertuples já entrega escalares Python
+            conexao.executemany(f'INSERT INTO "{self.tabela}" ({colunas}) VALUES ({marcadores})',
+                                df.itertuples(index=False, name=None))
+            # Gravador único: os rowids de um executemany são contíguos
+            ultimo = conexao.execute("SELECT last_insert_rowid()").fetchone()[0]
+            faixa = (ultimo - len(df) + 1, ultimo)
+
+        if origem is not None:
+            conexao.execute(
+                f"INSERT OR REPLACE INTO {TABELA_REGISTRO} (tabela, origem, sha256, linhas, rowid_inicio, rowid_fim) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (self.tabela, origem, sha256, len(df), *faixa))
+        return len(df)
+
+    def _remover_carga_anterior(self, conexao: sqlite3.Connection, origem: str):
+        anterior = conexao.execute(
+            f"SELECT rowid_inicio, rowid_fim FROM {TABELA_REGISTRO} WHERE tabela = ? AND origem = ?",
+            (self.tabela, origem)).fetchone()
+        if anterior and anterior[0] is not None:
+            conexao.execute(f'DELETE FROM "{self.tabela}" WHERE rowid BETWEEN ? AND ?', anterior)
+            logger.info(f"Fonte alterada, substituindo {anterior[1] - anterior[0] + 1} linhas: {origem}")
+
+    def _commit(self, conexao: sqlite3.Connection, pendentes: int, reabrir: bool = True):
+        conexao.execute("COMMIT")
+        self.estatisticas["linhas"] += pendentes
+        self.estatisticas["transacoes"] += 1
+        if reabrir:
+            conexao.execute("BEGIN")
+
+    def _registrar(self, segundos: float):
+        linhas = self.estatisticas["linhas"]
+        self.estatisticas["segundos"] = segundos
+        self.estatisticas["linhas_por_segundo"] = linhas / segundos if segundos > 0 else 0.0
+        logger.info(f"Gravação em '{self.tabela}': {linhas} linhas, {self.estatisticas['transacoes']} transações, "
+                    f"{segundos:.2f}s ({self.estatisticas['linhas_por_segundo']:,.0f} linhas/s).")
@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from etl.beneficiarios import processar_arquivo_worker
+from etl.gravador import GravadorSQLite
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+URL_BENEFICIARIOS = "https://dadosabertos.ans.gov.br/FTP/Base_de_dados/Microdados/dados_dbc/beneficiarios/operadoras/"
+
+
+class ImportadorANSParalelo:
+    """
+    Carga dos beneficiários por operadora: um processo por arquivo (download via cache de
+    fontes, descompressão, leitura em lotes e agregação) e um único gravador (GravadorSQLite).
+    Princípio: Ignorância de Configuração (caminho e paralelismo chegam pelo __init__).
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 4, tamanho_lote: int = 50_000, diretorio_cache: str = None):
+        """
+        Args:
+            db_path (str): Banco SQLite de destino.
+            max_workers (int): Processos em paralelo.
+            tamanho_lote (int): Registros DBF por lote de leitura.
+            diretorio_cache (str): Cache de fontes (CacheFontes); None = sem reaproveitamento.
+        """
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.tamanho_lote = tamanho_lote
+        self.diretorio_cache = str(diretorio_cache) if diretorio_cache else None
+
+    @staticmethod
+    def obter_links(url_origem: str) -> list:
+        """Lista os .dbc publicados na página de índice da ANS."""
+        logger.info(f"Mapeando arquivos em: {url_origem}")
+        try:
+            resposta = requests.get(url_origem, timeout=30)
+            resposta.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Erro ao obter links: {e}")
+            return []
+
+        soup = BeautifulSoup(resposta.content, 'html.parser')
+        links = [urljoin(url_origem, a.get('href')) for a in soup.find_all('a')
+                 if a.get('href') and a.get('href').lower().endswith('.dbc')]
+        logger.info(f"Total de arquivos encontrados: {len(links)}")
+        return links
+
+    @staticmethod
+    def listar_arquivos_locais(pasta: str) -> list:
+        """Arquivos .dbc/.dbf de uma pasta local (carga offline / testes)."""
+        return sorted(str(p) for p in Path(pasta).iterdir() if p.suffix.lower() in ('.dbc', '.dbf'))
+
+    def processar_paralelo(self, fontes: list, tabela_destino: str = 'beneficiarios_agrupados') -> int:
+        """
+        Processa as fontes (URLs ou caminhos locais) em paralelo e entrega cada resultado
+        ao gravador assim que fica pronto. Retorna o total de linhas gravadas.
+        """
+        worker = partial(processar_arquivo_worker, tamanho_lote=self.tamanho_lote,
+                         diretorio_cache=self.diretorio_cache)
+        return executar_carga(worker, fontes, self.db_path, tabela_destino, self.max_workers)["linhas"]
+
+
+def executar_carga(worker, tarefas: list, db_path: str, tabela_destino: str, max_workers: int,
+                   origem_de=lambda tarefa: tarefa) -> dict:
+    """
+    Laço comum das cargas: um processo por tarefa e um único GravadorSQLite.
+    Fontes cujo conteúdo já está no registro de cargas (sha256) não são reprocessadas;
+    as alteradas substituem as linhas da carga anterior.
+    worker(tarefa, sha256_carregado=...) -> ResultadoFonte.
+    """
+    total = len(tarefas)
+    carregadas = GravadorSQLite.fontes_carregadas(db_path, tabela_destino)
+    contagem = {"gravados": 0, "inalterados": 0, "ignorados": 0, "falhas": 0, "linhas": 0}
+    logger.info(f"Iniciando processamento paralelo ({max_workers} workers, {total} arquivos, "
+                f"{len(carregadas)} já registrados em '{tabela_destino}')")
+
+    with GravadorSQLite(db_path, tabela_destino) as gravador:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {executor.submit(worker, tarefa, sha256_carregado=carregadas.get(str(origem_de(tarefa)))): tarefa
+                       for tarefa in tarefas}
+            for processados, futuro in enumerate(as_completed(futuros), start=1):
+                nome = str(origem_de(futuros[futuro])).replace('\\', '/').split('/')[-1]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    contagem["falhas"] += 1
+                    logger.error(f"[{processados}/{total}] Falha ao recuperar resultado de {nome}: {e}")
+                    continue
+
+                if resultado.inalterado:
+                    contagem["inalterados"] += 1
+                    continue
+                if resultado.sha256 is None:
+                    contagem["falhas"] += 1
+                    continue
+
+                # Vazio também é registrado: o mesmo conteúdo não é reprocessado na próxima carga
+                gravador.enviar(resultado.df, origem=resultado.origem, sha256=resultado.sha256)
+                if resultado.df is None or resultado.df.empty:
+                    contagem["ignorados"] += 1
+                    logger.info(f"[{processados}/{total}] Vazio/Ignorado: {nome}")
+                else:
+                    contagem["gravados"] += 1
+                    logger.info(f"[{processados}/{total}] Processado: {nome} ({len(resultado.df)} registros)")
+
+    contagem["linhas"] = gravador.estatisticas["linhas"]
+    logger.info(f"Carga de '{tabela_destino}' finalizada: {contagem}")
+    return contagem
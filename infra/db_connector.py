@@ -1,12 +1,46 @@
 import sqlite3
+import time
+import queue
+import threading
 import pandas as pd
 import logging
-from typing import Optional
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+import pyarrow as pa
 
 # Configuração de Log
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FORMATOS_LOTE = ("pandas", "arrow")
+
+def _ler_lotes(cursor: sqlite3.Cursor, tamanho_lote: int, formato: str) -> Iterator[Union[pd.DataFrame, pa.RecordBatch]]:
+    """
+    Consome o cursor com fetchmany e converte cada lote (DataFrame ou RecordBatch Arrow).
+    Apenas um lote de tuplas fica vivo por vez. Resultado vazio gera um único lote vazio
+    (preserva os nomes das colunas para quem concatena).
+    """
+    if formato not in FORMATOS_LOTE:
+        raise ValueError(f"Formato de lote inválido: '{formato}'. Use {FORMATOS_LOTE}.")
+
+    colunas = [descricao[0] for descricao in cursor.description or ()]
+    algum_lote = False
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas and algum_lote:
+            return
+        algum_lote = True
+        if formato == "arrow":
+            valores = list(zip(*linhas)) or [()] * len(colunas)
+            yield pa.RecordBatch.from_arrays([pa.array(v) for v in valores], names=colunas)
+        else:
+            yield pd.DataFrame.from_records(linhas, columns=colunas)
+        if len(linhas) < tamanho_lote:
+            return
+
+
 class ConexaoSQLite:
     """
     Gerenciador de Conexão SQLite.
@@ -61,6 +95,24 @@ class ConexaoSQLite:
             logger.error(f"Erro ao executar query: {e}")
             return pd.DataFrame() # Fail Gracefully
             
+    def executar_query_stream(self, query: str, parametros: tuple = None, tamanho_lote: int = 50_000,
+                              formato: str = "pandas") -> Iterator[Union[pd.DataFrame, pa.RecordBatch]]:
+        """
+        Versão em lotes do executar_query (gerador). Mantém em memória apenas um lote por vez.
+        Diferente do executar_query, erros NÃO viram DataFrame vazio: são logados e propagados
+        (um MemoryError ou uma tabela ausente não pode passar por "sem dados").
+        """
+        self._conectar()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, parametros or ())
+            yield from _ler_lotes(cursor, tamanho_lote, formato)
+        except Exception as e:
+            logger.error(f"Erro ao executar query em lotes: {e}")
+            raise
+        finally:
+            cursor.close()
+            
     def executar_comando(self, sql: str, parametros: tuple = None) -> None:
         """
         Para comandos que NÃO retornam dados (INSERT, UPDATE, DELETE, CREATE).
@@ -77,4 +129,219 @@ class ConexaoSQLite:
             if self.connection:
                 self.connection.rollback()
             logger.error(f"Erro ao executar comando: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def executar_script(self, sql: str, parametros: dict = None) -> None:
+        """
+        Executa um script com várias instruções (DDL/DML) numa única transação.
+        Diferente de executescript, aceita parâmetros nomeados (:nome), repassados
+        a cada instrução (o sqlite3 ignora nomes não usados por ela).
+        """
+        self._conectar()
+        try:
+            cursor = self.connection.cursor()
+            for instrucao in self._separar_instrucoes(sql):
+                cursor.execute(instrucao, parametros or {})
+            self.connection.commit()
+        except Exception as e:
+            if self.connection:
+                self.connection.rollback()
+            logger.error(f"Erro ao executar script: {e}")
+            raise
+
+    @staticmethod
+    def _separar_instrucoes(sql: str) -> list:
+        """Quebra o script em instruções completas (respeita ';' dentro de strings)."""
+        instrucoes, buffer = [], ""
+        for trecho in sql.split(';'):
+            buffer += trecho + ';'
+            if sqlite3.complete_statement(buffer):
+                if buffer.strip(' \t\r\n;'):
+                    instrucoes.append(buffer.strip())
+                buffer = ""
+        return instrucoes
+
+
+class PoolConexoesSQLite:
+    """
+    Pool de conexões SQLite somente-leitura, seguro para as threads de script do Streamlit.
+    Mesmo contrato de leitura da ConexaoSQLite (executar_query), porém:
+      - cada thread usa uma conexão exclusiva enquanto consulta (sem serializar num único handle);
+      - conexões ociosas são reaproveitadas (não reabrimos o arquivo a cada requisição);
+      - o total de conexões é limitado (max_conexoes) e conexões ociosas passam por health check.
+    Princípio: Ignorância de Configuração (tudo é recebido no __init__).
+    """
+
+    def __init__(self, db_path: str, max_conexoes: int = 8, timeout: float = 30.0,
+                 mmap_size: int = 0, cache_size_kb: int = 2000, usar_wal: bool = False,
+                 intervalo_health_check: float = 60.0):
+        """
+        Args:
+            db_path (str): Caminho do arquivo .db (aberto via URI 'mode=ro').
+            max_conexoes (int): Limite de conexões abertas simultaneamente.
+            timeout (float): Segundos aguardando uma conexão livre antes de falhar.
+            mmap_size (int): PRAGMA mmap_size (bytes) de cada conexão.
+            cache_size_kb (int): PRAGMA cache_size (KiB) de cada conexão.
+            usar_wal (bool): Ativa journal_mode=WAL no arquivo (leitores não bloqueiam a carga do ETL).
+            intervalo_health_check (float): Conexões ociosas há mais tempo que isso são testadas antes do uso.
+        """
+        self.db_name = db_path
+        self.max_conexoes = max_conexoes
+        self.timeout = timeout
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.usar_wal = usar_wal
+        self.intervalo_health_check = intervalo_health_check
+
+        # LIFO: reaproveita primeiro as conexões "quentes" (cache de páginas já populado)
+        self._ociosas: queue.LifoQueue = queue.LifoQueue()
+        self._total = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._wal_verificado = False
+        # journal_mode altera o cabeçalho do arquivo: feito já na construção, para que
+        # quem calcula fingerprints (mtime/tamanho) do banco veja o estado definitivo
+        self._configurar_wal()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.fechar()
+
+    def _configurar_wal(self):
+        """journal_mode é persistente no arquivo: exige uma conexão de escrita, uma única vez."""
+        with self._lock:
+            if self._wal_verificado:
+                return
+            self._wal_verificado = True
+        if not self.usar_wal or not Path(self.db_name).exists():
+            return
+        try:
+            conexao = sqlite3.connect(self.db_name)
+            try:
+                conexao.execute("PRAGMA journal_mode=WAL")
+            finally:
+                conexao.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível ativar WAL em '{self.db_name}': {e}")
+
+    def _abrir_conexao(self) -> sqlite3.Connection:
+        self._configurar_wal()
+        uri = f"{Path(self.db_name).resolve().as_uri()}?mode=ro"
+        conexao = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=self.timeout)
+        conexao.execute("PRAGMA query_only = ON")
+        conexao.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conexao.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        return conexao
+
+    @staticmethod
+    def _conexao_saudavel(conexao: sqlite3.Connection) -> bool:
+        try:
+            conexao.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _descartar(self, conexao: sqlite3.Connection):
+        try:
+            conexao.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._total -= 1
+
+    def _obter(self) -> sqlite3.Connection:
+        """Retira uma conexão ociosa (com health check) ou abre uma nova, respeitando o limite."""
+        while True:
+            try:
+                conexao, ociosa_desde = self._ociosas.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    pode_abrir = self._total < self.max_conexoes
+                    if pode_abrir:
+                        self._total += 1
+                if pode_abrir:
+                    try:
+                        return self._abrir_conexao()
+                    except sqlite3.Error as e:
+                        with self._lock:
+                            self._total -= 1
+                        logger.error(f"Erro de conexão SQLite no caminho '{self.db_name}': {e}")
+                        raise
+                try:
+                    conexao, ociosa_desde = self._ociosas.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"Pool SQLite esgotado ({self.max_conexoes} conexões em uso).")
+
+            if time.monotonic() - ociosa_desde < self.intervalo_health_check or self._conexao_saudavel(conexao):
+                return conexao
+            logger.warning("Conexão ociosa falhou no health check. Descartando.")
+            self._descartar(conexao)
+
+    def _devolver(self, conexao: sqlite3.Connection, falhou: bool):
+        if falhou and not self._conexao_saudavel(conexao):
+            self._descartar(conexao)
+            return
+        self._ociosas.put((conexao, time.monotonic()))
+
+    @contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão exclusiva para a thread atual.
+        Reentrante: chamadas aninhadas na mesma thread reutilizam a mesma conexão.
+        """
+        emprestada = getattr(self._local, "conexao", None)
+        if emprestada is not None:
+            yield emprestada
+            return
+
+        conexao = self._obter()
+        self._local.conexao = conexao
+        falhou = False
+        try:
+            yield conexao
+        except Exception:
+            falhou = True
+            raise
+        finally:
+            self._local.conexao = None
+            self._devolver(conexao, falhou)
+
+    def executar_query(self, query: str, parametros: tuple = None) -> pd.DataFrame:
+        """
+        Executa uma query SQL e retorna diretamente um Pandas DataFrame.
+        """
+        try:
+            with self.conexao() as conexao:
+                return pd.read_sql(query, conexao, params=parametros)
+
+        except Exception as e:
+            logger.error(f"Erro ao executar query: {e}")
+            return pd.DataFrame() # Fail Gracefully
+
+    def executar_query_stream(self, query: str, parametros: tuple = None, tamanho_lote: int = 50_000,
+                              formato: str = "pandas") -> Iterator[Union[pd.DataFrame, pa.RecordBatch]]:
+        """
+        Versão em lotes do executar_query (gerador). A conexão fica emprestada até o
+        gerador terminar (ou ser fechado). Erros são logados e propagados.
+        """
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            try:
+                cursor.execute(query, parametros or ())
+                yield from _ler_lotes(cursor, tamanho_lote, formato)
+            except Exception as e:
+                logger.error(f"Erro ao executar query em lotes: {e}")
+                raise
+            finally:
+                cursor.close()
+
+    def fechar(self):
+        """Fecha todas as conexões ociosas (as emprestadas são fechadas ao retornar)."""
+        while True:
+            try:
+                conexao, _ = self._ociosas.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conexao)
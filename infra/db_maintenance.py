@@ -0,0 +1,89 @@
+import re
+import sqlite3
+import logging
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from infra.db_connector import ConexaoSQLite
+
+logger = logging.getLogger(__name__)
+
+_RE_NOME_INDICE = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?([\"\w]+)", re.IGNORECASE)
+
+
+class ManutencaoSQLite:
+    """
+    Rotinas de manutenção do banco: provisionamento de índices e checagem de planos.
+    Princípio: Ignorância de Configuração.
+    Esta classe não importa 'settings' nem lê arquivos de query: recebe caminho e SQL prontos.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): Caminho do arquivo .db.
+        """
+        self.db_name = db_path
+
+    def _conectar_leitura(self) -> sqlite3.Connection:
+        uri = f"{Path(self.db_name).resolve().as_uri()}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    def indices_existentes(self) -> set:
+        with closing(self._conectar_leitura()) as conexao:
+            linhas = conexao.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+        return {nome for (nome,) in linhas}
+
+    def garantir_indices(self, ddl: str) -> List[str]:
+        """
+        Cria os índices declarados no DDL que ainda não existem.
+        Só abre conexão de escrita se faltar algum: quando tudo já existe, o arquivo
+        não é tocado (mtime preservado, fingerprints do banco continuam válidos).
+        Retorna os nomes dos índices criados.
+        """
+        if not Path(self.db_name).exists():
+            return []
+
+        declarados = [nome.strip('"') for nome in _RE_NOME_INDICE.findall(ddl)]
+        faltantes = [nome for nome in declarados if nome not in self.indices_existentes()]
+        if not faltantes:
+            return []
+
+        logger.info(f"Criando índices ausentes: {faltantes}")
+        try:
+            with ConexaoSQLite(self.db_name) as conexao_escrita:
+                conexao_escrita.executar_script(ddl)
+                # Atualiza as estatísticas do planejador para os índices novos
+                conexao_escrita.executar_comando("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível criar os índices {faltantes}: {e}")
+            return []
+        return faltantes
+
+    def verificar_plano(self, sql: str, parametros: Union[tuple, dict] = ()) -> List[str]:
+        """
+        Executa EXPLAIN QUERY PLAN e retorna os passos que varrem uma tabela inteira
+        ('SCAN <tabela>' sem índice). Lista vazia = plano sem table scan.
+        """
+        with closing(self._conectar_leitura()) as conexao:
+            passos = conexao.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+        detalhes = [passo[-1] for passo in passos]
+        return [d for d in detalhes if d.startswith("SCAN ") and "INDEX" not in d and "CONSTANT ROW" not in d]
+
+    def verificar_planos(self, consultas: Dict[str, Tuple[str, Union[tuple, dict]]]) -> Dict[str, List[str]]:
+        """
+        Checa o plano de cada query ({nome: (sql, parametros)}) e loga um aviso por table scan.
+        Queries que não compilam (ex: tabela ainda não materializada) são ignoradas com log.
+        """
+        scans = {}
+        for nome, (sql, parametros) in consultas.items():
+            try:
+                encontrados = self.verificar_plano(sql, parametros)
+            except sqlite3.Error as e:
+                logger.info(f"Plano de '{nome}' não verificado: {e}")
+                continue
+            if encontrados:
+                scans[nome] = encontrados
+                logger.warning(f"Query '{nome}' com table scan no plano: {encontrados}")
+        return scans
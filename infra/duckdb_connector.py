@@ -0,0 +1,208 @@
+import re
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from infra.db_connector import FORMATOS_LOTE
+
+logger = logging.getLogger(__name__)
+
+# ':nome' (estilo sqlite3) -> '$nome' (estilo DuckDB), fora de '::' (cast do DuckDB)
+_RE_PARAM_NOMEADO = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+def _importar_duckdb():
+    """Import tardio: o DuckDB é dependência opcional (só com BACKEND_ANALITICO='duckdb')."""
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("O backend analítico 'duckdb' requer o pacote duckdb (pip install duckdb).") from e
+    return duckdb
+
+
+class ConexaoDuckDB:
+    """
+    Conector analítico sobre DuckDB embarcado, com o mesmo contrato de leitura da
+    ConexaoSQLite (executar_query / executar_query_stream): joins, janelas e agregações
+    rodam vetorizados e em várias threads.
+    Princípio: Ignorância de Configuração.
+
+    Fontes (uma das duas):
+      - db_path: o arquivo SQLite existente, anexado somente-leitura (extensão 'sqlite'
+        do DuckDB, carregada automaticamente na primeira vez). Sem a extensão (ambiente
+        offline), as tabelas são copiadas pelo sqlite3 para o DuckDB em memória;
+      - parquet_dir: exports Parquet; cada '<tabela>.parquet' vira uma view '<tabela>'.
+    Em ambos os casos as queries usam os mesmos nomes de tabela do SQLite.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, parquet_dir: Optional[str] = None,
+                 threads: int = 0, limite_memoria: Optional[str] = None):
+        """
+        Args:
+            db_path (str): Caminho do arquivo .db do SQLite.
+            parquet_dir (str): Pasta com exports Parquet (tem prioridade sobre db_path).
+            threads (int): Threads de execução do DuckDB (0 = todos os núcleos).
+            limite_memoria (str): memory_limit do DuckDB (ex: '2GB'); None = padrão dele.
+        """
+        if not db_path and not parquet_dir:
+            raise ValueError("Informe db_path ou parquet_dir.")
+        self.db_name = db_path
+        self.parquet_dir = parquet_dir
+        self.threads = threads
+        self.limite_memoria = limite_memoria
+        self.connection = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._conectar()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.fechar()
+
+    def _conectar(self):
+        with self._lock:
+            if self.connection is not None:
+                return
+            duckdb = _importar_duckdb()
+            conexao = duckdb.connect(":memory:")
+            try:
+                if self.threads:
+                    conexao.execute(f"SET threads = {int(self.threads)}")
+                if self.limite_memoria:
+                    conexao.execute(f"SET memory_limit = '{self.limite_memoria}'")
+
+                if self.parquet_dir:
+                    for arquivo in sorted(Path(self.parquet_dir).glob("*.parquet")):
+                        conexao.execute(
+                            f'CREATE VIEW "{arquivo.stem}" AS SELECT * FROM read_parquet({_literal(arquivo)})')
+                else:
+                    self._anexar_sqlite(conexao)
+            except Exception as e:
+                conexao.close()
+                logger.error(f"Erro ao preparar o DuckDB sobre '{self.parquet_dir or self.db_name}': {e}")
+                raise
+            self.connection = conexao
+
+    def _anexar_sqlite(self, conexao):
+        duckdb = _importar_duckdb()
+        try:
+            conexao.execute(f"ATTACH {_literal(self.db_name)} AS origem (TYPE SQLITE, READ_ONLY)")
+            conexao.execute("USE origem")
+        except duckdb.IOException as e:
+            logger.warning(f"Extensão 'sqlite' do DuckDB indisponível ({e}); registrando as tabelas via sqlite3.")
+            for tabela, dados in _ler_tabelas_sqlite(self.db_name):
+                # register() só vale para o próprio handle; a tabela precisa existir para os cursores
+                conexao.register("_carga_sqlite", dados)
+                conexao.execute(f'CREATE TABLE "{tabela}" AS SELECT * FROM _carga_sqlite')
+                conexao.unregister("_carga_sqlite")
+
+    def fechar(self):
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def _cursor(self):
+        """Cada chamada usa um cursor próprio (o handle do DuckDB não é compartilhável entre threads)."""
+        self._conectar()
+        return self.connection.cursor()
+
+    @staticmethod
+    def _adaptar(query: str, parametros: Union[tuple, dict, None]):
+        if isinstance(parametros, dict):
+            return _RE_PARAM_NOMEADO.sub(r"$\1", query), parametros
+        return query, list(parametros or ())
+
+    def executar_query(self, query: str, parametros: Union[tuple, dict] = None) -> pd.DataFrame:
+        """Executa a query e retorna um DataFrame (mesmo Fail Gracefully da ConexaoSQLite)."""
+        sql, params = self._adaptar(query, parametros)
+        cursor = self._cursor()
+        try:
+            return cursor.execute(sql, params).df()
+        except Exception as e:
+            logger.error(f"Erro ao executar query (DuckDB): {e}")
+            return pd.DataFrame()
+        finally:
+            cursor.close()
+
+    def executar_query_stream(self, query: str, parametros: Union[tuple, dict] = None, tamanho_lote: int = 50_000,
+                              formato: str = "pandas") -> Iterator[Union[pd.DataFrame, pa.RecordBatch]]:
+        """
+        Versão em lotes (RecordBatch nativo do DuckDB). Erros são logados e propagados,
+        como em ConexaoSQLite.executar_query_stream.
+        """
+        if formato not in FORMATOS_LOTE:
+            raise ValueError(f"Formato de lote inválido: '{formato}' (use {FORMATOS_LOTE})")
+
+        sql, params = self._adaptar(query, parametros)
+        cursor = self._cursor()
+        try:
+            resultado = cursor.execute(sql, params)
+            # to_arrow_reader (DuckDB >= 1.4); fetch_record_batch nas versões anteriores
+            ler_lotes = getattr(resultado, "to_arrow_reader", None) or resultado.fetch_record_batch
+            leitor = ler_lotes(tamanho_lote)
+            vazio = True
+            for lote in leitor:
+                vazio = False
+                yield lote if formato == "arrow" else lote.to_pandas()
+            if vazio:
+                # Mesmo contrato do SQLite: resultado vazio ainda informa as colunas
+                lote = pa.RecordBatch.from_pylist([], schema=leitor.schema)
+                yield lote if formato == "arrow" else lote.to_pandas()
+        except Exception as e:
+            logger.error(f"Erro ao executar query em lotes (DuckDB): {e}")
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def exportar_parquet(db_path: str, destino: str, tabelas: list = None) -> list:
+        """
+        Exporta tabelas do SQLite para '<destino>/<tabela>.parquet' (fonte parquet_dir).
+        Não depende do DuckDB: lê pelo sqlite3 e grava com pyarrow.
+        """
+        import pyarrow.parquet as pq
+
+        pasta = Path(destino)
+        pasta.mkdir(parents=True, exist_ok=True)
+        gerados = []
+        for tabela, dados in _ler_tabelas_sqlite(db_path, tabelas):
+            caminho = pasta / f"{tabela}.parquet"
+            pq.write_table(dados, str(caminho))
+            gerados.append(caminho)
+        return gerados
+
+
+def _ler_tabelas_sqlite(db_path: str, tabelas: list = None, tamanho_lote: int = 100_000):
+    """Gera (nome, pa.Table) para cada tabela do SQLite (todas, se tabelas=None)."""
+    conexao = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        if tabelas is None:
+            tabelas = [linha[0] for linha in conexao.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        for tabela in tabelas:
+            cursor = conexao.execute(f'SELECT * FROM "{tabela}"')
+            colunas = [d[0] for d in cursor.description]
+            partes = []
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas and partes:
+                    break
+                partes.append(pd.DataFrame.from_records(linhas, columns=colunas))
+                if not linhas:
+                    break
+            df = pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
+            yield tabela, pa.Table.from_pandas(df, preserve_index=False)
+    finally:
+        conexao.close()
+
+
+def _literal(valor) -> str:
+    """Literal SQL de texto (caminhos em ATTACH/read_parquet não aceitam parâmetros)."""
+    return "'" + str(valor).replace("'", "''") + "'"
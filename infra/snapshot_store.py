@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+class SnapshotArrow:
+    """
+    Armazenamento colunar do Dataset Mestre em Arrow IPC (Feather v2, sem compressão).
+    Princípio: Ignorância de Configuração.
+    Esta classe não importa 'settings'. Ela apenas recebe o diretório no __init__.
+
+    Os metadados (ex: fingerprint da origem) ficam no schema do arquivo, permitindo
+    validar o snapshot sem decodificar nenhuma coluna.
+    """
+
+    CHAVE_METADADOS = b"hmv_metadados"
+
+    def __init__(self, diretorio: str, nome: str = "gold_mestre"):
+        """
+        Args:
+            diretorio (str): Pasta onde o snapshot será persistido.
+            nome (str): Nome lógico do snapshot (vira o nome do arquivo .arrow).
+        """
+        self.diretorio = Path(diretorio)
+        self.caminho = self.diretorio / f"{nome}.arrow"
+
+    def ler_metadados(self) -> Optional[dict]:
+        """Lê apenas o schema do arquivo (sem carregar dados). Retorna None se não existir."""
+        if not self.caminho.exists():
+            return None
+        try:
+            with pa.memory_map(str(self.caminho), 'r') as fonte:
+                schema = pa.ipc.open_file(fonte).schema
+            bruto = (schema.metadata or {}).get(self.CHAVE_METADADOS)
+            return json.loads(bruto) if bruto else {}
+        except (pa.ArrowInvalid, OSError, ValueError) as e:
+            logger.warning(f"Snapshot ilegível em '{self.caminho}': {e}")
+            return None
+
+    def ler(self) -> Optional[pd.DataFrame]:
+        """Leitura mapeada em memória (mmap) do snapshot completo."""
+        if not self.caminho.exists():
+            return None
+        try:
+            with pa.memory_map(str(self.caminho), 'r') as fonte:
+                tabela = pa.ipc.open_file(fonte).read_all()
+            return tabela.to_pandas()
+        except (pa.ArrowInvalid, OSError) as e:
+            logger.warning(f"Falha ao ler snapshot '{self.caminho}': {e}")
+            return None
+
+    def salvar(self, df: pd.DataFrame, metadados: dict) -> None:
+        """
+        Grava o DataFrame de forma atômica (arquivo temporário + os.replace),
+        evitando que um processo concorrente leia um snapshot pela metade.
+        """
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        schema_meta = dict(tabela.schema.metadata or {})
+        schema_meta[self.CHAVE_METADADOS] = json.dumps(metadados).encode('utf-8')
+        tabela = tabela.replace_schema_metadata(schema_meta)
+
+        temporario = self.caminho.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with pa.OSFile(str(temporario), 'wb') as destino:
+                with pa.ipc.new_file(destino, tabela.schema) as writer:
+                    writer.write_table(tabela)
+            os.replace(temporario, self.caminho)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar snapshot '{self.caminho}': {e}")
+            if temporario.exists():
+                temporario.unlink()
+
+
+class SnapshotParticionado:
+    """
+    Dataset Mestre particionado (um arquivo Arrow IPC por valor da coluna de partição,
+    ex: um por trimestre), com LRU limitado de partições já decodificadas.
+    Princípio: Ignorância de Configuração (diretório, coluna e limite vêm do __init__).
+
+    Layout:
+        <diretorio>/<nome>/ATUAL.json              -> versão vigente, partições e metadados
+        <diretorio>/<nome>/<versao>/<valor>.arrow  -> uma partição
+    Uma nova gravação cria outra pasta de versão e troca o ATUAL.json com os.replace
+    (atômico); leitores nunca veem uma versão pela metade.
+    """
+
+    ARQUIVO_INDICE = "ATUAL.json"
+
+    def __init__(self, diretorio: str, coluna_particao: str, nome: str = "gold_mestre_particoes",
+                 max_particoes_em_memoria: int = 8):
+        """
+        Args:
+            diretorio (str): Pasta base dos snapshots.
+            coluna_particao (str): Coluna que define as partições (ex: 'ID_TRIMESTRE').
+            nome (str): Subpasta deste armazenamento.
+            max_particoes_em_memoria (int): Tamanho do LRU de partições decodificadas.
+        """
+        self.raiz = Path(diretorio) / nome
+        self.coluna_particao = coluna_particao
+        self.max_particoes_em_memoria = max(1, max_particoes_em_memoria)
+        self._lru: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._indice_cache = (None, None)  # (mtime_ns do ATUAL.json, conteúdo)
+        self._lock = threading.Lock()
+
+    # --- Índice ---
+    def _ler_indice(self) -> Optional[dict]:
+        caminho = self.raiz / self.ARQUIVO_INDICE
+        try:
+            mtime_ns = caminho.stat().st_mtime_ns
+        except OSError:
+            return None
+        if self._indice_cache[0] == mtime_ns:
+            return self._indice_cache[1]
+        try:
+            indice = json.loads(caminho.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Índice de partições ilegível em '{caminho}': {e}")
+            return None
+        self._indice_cache = (mtime_ns, indice)
+        return indice
+
+    def ler_metadados(self) -> Optional[dict]:
+        indice = self._ler_indice()
+        return indice.get("metadados", {}) if indice else None
+
+    def particoes(self) -> list:
+        """Valores de partição disponíveis (em ordem de gravação)."""
+        indice = self._ler_indice()
+        return list(indice["particoes"]) if indice else []
+
+    def _caminho_particao(self, indice: dict, valor) -> Path:
+        return self.raiz / indice["versao"] / f"{valor}.arrow"
+
+    # --- Escrita ---
+    def salvar(self, df: pd.DataFrame, metadados: dict) -> None:
+        """Grava uma nova versão com uma partição por valor da coluna e publica atomicamente."""
+        versao = f"v{time.time_ns()}_{os.getpid()}"
+        pasta = self.raiz / versao
+        try:
+            pasta.mkdir(parents=True, exist_ok=True)
+            tabela = pa.Table.from_pandas(df, preserve_index=False)
+            valores = [str(v) for v in sorted(df[self.coluna_particao].astype(str).unique())]
+            coluna = tabela.column(self.coluna_particao).cast(pa.string())
+            for valor in valores:
+                particao = tabela.filter(pc.equal(coluna, valor))
+                with pa.OSFile(str(pasta / f"{valor}.arrow"), 'wb') as destino:
+                    with pa.ipc.new_file(destino, particao.schema) as writer:
+                        writer.write_table(particao)
+
+            temporario = self.raiz / f"{self.ARQUIVO_INDICE}.{os.getpid()}.tmp"
+            temporario.write_text(json.dumps({"versao": versao, "particoes": valores, "metadados": metadados}),
+                                  encoding="utf-8")
+            os.replace(temporario, self.raiz / self.ARQUIVO_INDICE)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar partições em '{pasta}': {e}")
+            shutil.rmtree(pasta, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._lru.clear()
+        self._remover_versoes_antigas(versao)
+
+    def _remover_versoes_antigas(self, versao_atual: str) -> None:
+        """Remove pastas de versões anteriores (leitores com mmap aberto seguem válidos no POSIX)."""
+        for pasta in self.raiz.iterdir():
+            if pasta.is_dir() and pasta.name != versao_atual:
+                shutil.rmtree(pasta, ignore_errors=True)
+
+    # --- Leitura ---
+    def ler_particao(self, valor) -> Optional[pd.DataFrame]:
+        """
+        Partição decodificada, servida do LRU quando possível. O DataFrame retornado é
+        compartilhado entre chamadas: quem precisar alterá-lo deve copiar antes.
+        Retorna None se a partição não existir.
+        """
+        indice = self._ler_indice()
+        if not indice or str(valor) not in indice["particoes"]:
+            return None
+
+        chave = (indice["versao"], str(valor))
+        with self._lock:
+            if chave in self._lru:
+                self._lru.move_to_end(chave)
+                return self._lru[chave]
+
+        try:
+            with pa.memory_map(str(self._caminho_particao(indice, valor)), 'r') as fonte:
+                df = pa.ipc.open_file(fonte).read_all().to_pandas()
+        except (pa.ArrowInvalid, OSError) as e:
+            logger.warning(f"Falha ao ler partição '{valor}': {e}")
+            return None
+
+        with self._lock:
+            self._lru[chave] = df
+            self._lru.move_to_end(chave)
+            while len(self._lru) > self.max_particoes_em_memoria:
+                self._lru.popitem(last=False)
+        return df
+
+    def filtrar(self, coluna: str, valor) -> pd.DataFrame:
+        """
+        Linhas com coluna == valor em todas as partições, sem decodificá-las:
+        cada arquivo é mapeado em memória e só a coluna do filtro é lida antes do take.
+        Não passa pelo LRU (ex: histórico de uma operadora).
+        """
+        indice = self._ler_indice()
+        if not indice:
+            return pd.DataFrame()
+
+        pedacos = []
+        for particao in indice["particoes"]:
+            try:
+                with pa.memory_map(str(self._caminho_particao(indice, particao)), 'r') as fonte:
+                    tabela = pa.ipc.open_file(fonte).read_all()
+                    selecionadas = tabela.filter(pc.equal(tabela.column(coluna), valor))
+                    if selecionadas.num_rows:
+                        pedacos.append(selecionadas.combine_chunks())
+            except (pa.ArrowInvalid, OSError, KeyError) as e:
+                logger.warning(f"Falha ao filtrar partição '{particao}': {e}")
+        if not pedacos:
+            return pd.DataFrame()
+        return pa.concat_tables(pedacos).to_pandas()
+
+    def limpar_cache(self) -> None:
+        with self._lock:
+            self._lru.clear()
@@ -0,0 +1,10 @@
+-- @params:
+-- @scan: permitido
+-- @colunas: registro_operadora, representante, cargo_representante, Data_Registro_ANS
+-- Grupo "cadastral": carregado sob demanda (cabeçalho das páginas de operadora).
+SELECT
+    registro_operadora,
+    representante,
+    cargo_representante,
+    Data_Registro_ANS
+FROM dim_operadoras
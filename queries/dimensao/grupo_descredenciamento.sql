@@ -0,0 +1,9 @@
+-- @params:
+-- @scan: permitido
+-- @colunas: registro_operadora, descredenciada_em, descredenciamento_motivo
+-- Grupo "descredenciamento": carregado sob demanda (Movimentação de Mercado).
+SELECT
+    registro_operadora,
+    descredenciada_em,
+    descredenciamento_motivo
+FROM dim_operadoras
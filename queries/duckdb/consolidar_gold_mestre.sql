@@ -0,0 +1,87 @@
+-- @params: data_corte
+-- @scan: permitido
+-- @colunas: ID_TRIMESTRE, ID_OPERADORA, razao_social, cnpj, uf, modalidade, cidade, NR_BENEF_T, VL_SALDO_FINAL, VAR_PCT_VIDAS, VAR_PCT_RECEITA, CUSTO_POR_VIDA
+-- Dataset Mestre (Gold Layer) calculado pelo DuckDB (BACKEND_ANALITICO = "duckdb").
+-- Mesma semântica de gold/materializar_gold_mestre.sql, mas como SELECT puro:
+-- join, LAG e KPIs rodam vetorizados sobre o SQLite anexado (ou sobre os exports Parquet),
+-- sem escrever no banco.
+WITH ben AS (
+    SELECT
+        CASE WHEN length(chave) < 6 THEN right('000000' || chave, 6) ELSE chave END AS CD_OPERADO,
+        ID_TRIMESTRE,
+        NR_BENEF_T
+    FROM (
+        SELECT
+            trim(split_part(CAST(CD_OPERADO AS VARCHAR), '.', 1)) AS chave,
+            ID_TRIMESTRE,
+            NR_BENEF_T
+        FROM beneficiarios_agrupados
+        WHERE ID_TRIMESTRE >= :data_corte
+    )
+),
+fin AS (
+    SELECT
+        CASE WHEN length(chave) < 6 THEN right('000000' || chave, 6) ELSE chave END AS REG_ANS,
+        ID_TRIMESTRE,
+        VL_SALDO_FINAL
+    FROM (
+        SELECT
+            trim(split_part(CAST(REG_ANS AS VARCHAR), '.', 1)) AS chave,
+            ID_TRIMESTRE,
+            VL_SALDO_FINAL
+        FROM demonstracoes_contabeis
+        WHERE ID_TRIMESTRE >= :data_corte
+    )
+),
+dim AS (
+    SELECT
+        CASE WHEN length(chave) < 6 THEN right('000000' || chave, 6) ELSE chave END AS registro_operadora,
+        cnpj, razao_social, uf, modalidade, cidade
+    FROM (
+        SELECT
+            trim(split_part(CAST(registro_operadora AS VARCHAR), '.', 1)) AS chave,
+            cnpj, razao_social, uf, modalidade, cidade
+        FROM dim_operadoras
+    )
+),
+consolidado AS (
+    SELECT
+        COALESCE(b.ID_TRIMESTRE, f.ID_TRIMESTRE) AS ID_TRIMESTRE,
+        COALESCE(b.CD_OPERADO, f.REG_ANS) AS ID_OPERADORA,
+        CAST(COALESCE(b.NR_BENEF_T, 0) AS DOUBLE) AS NR_BENEF_T,
+        CAST(COALESCE(f.VL_SALDO_FINAL, 0) AS DOUBLE) AS VL_SALDO_FINAL
+    FROM ben b
+    FULL OUTER JOIN fin f
+        ON f.REG_ANS = b.CD_OPERADO
+       AND f.ID_TRIMESTRE = b.ID_TRIMESTRE
+),
+enriquecido AS (
+    SELECT
+        c.ID_TRIMESTRE, c.ID_OPERADORA,
+        d.razao_social, d.cnpj, d.uf, d.modalidade, d.cidade,
+        c.NR_BENEF_T, c.VL_SALDO_FINAL,
+        LAG(c.NR_BENEF_T) OVER janela AS vidas_anterior,
+        LAG(c.VL_SALDO_FINAL) OVER janela AS receita_anterior
+    FROM consolidado c
+    LEFT JOIN dim d ON d.registro_operadora = c.ID_OPERADORA
+    WINDOW janela AS (PARTITION BY c.ID_OPERADORA ORDER BY c.ID_TRIMESTRE)
+)
+SELECT
+    ID_TRIMESTRE, ID_OPERADORA, razao_social, cnpj, uf, modalidade, cidade,
+    NR_BENEF_T, VL_SALDO_FINAL,
+    -- Mesma semântica de pct_change().fillna(0): base zero gera +/-inf
+    CASE
+        WHEN vidas_anterior IS NULL THEN 0.0
+        WHEN vidas_anterior = 0 THEN
+            CASE WHEN NR_BENEF_T > 0 THEN 'inf'::DOUBLE WHEN NR_BENEF_T < 0 THEN '-inf'::DOUBLE ELSE 0.0 END
+        ELSE NR_BENEF_T / vidas_anterior - 1
+    END AS VAR_PCT_VIDAS,
+    CASE
+        WHEN receita_anterior IS NULL THEN 0.0
+        WHEN receita_anterior = 0 THEN
+            CASE WHEN VL_SALDO_FINAL > 0 THEN 'inf'::DOUBLE WHEN VL_SALDO_FINAL < 0 THEN '-inf'::DOUBLE ELSE 0.0 END
+        ELSE VL_SALDO_FINAL / receita_anterior - 1
+    END AS VAR_PCT_RECEITA,
+    CASE WHEN NR_BENEF_T > 0 THEN VL_SALDO_FINAL / NR_BENEF_T ELSE 0.0 END AS CUSTO_POR_VIDA
+FROM enriquecido
+ORDER BY ID_OPERADORA, ID_TRIMESTRE
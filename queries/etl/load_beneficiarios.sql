@@ -1,3 +1,5 @@
+-- @params: trimestre_inicial
+-- @colunas: CD_OPERADO, ID_TRIMESTRE, NR_BENEF_T
 SELECT 
     CD_OPERADO, 
     ID_TRIMESTRE, 
@@ -1,13 +1,13 @@
+-- @params:
+-- @scan: permitido
+-- @colunas: registro_operadora, cnpj, razao_social, uf, modalidade, cidade
+-- Núcleo da dimensão (entra no Dataset Mestre). Colunas usadas por poucas páginas
+-- ficam nos grupos sob demanda em queries/dimensao/.
 SELECT 
     registro_operadora, 
     cnpj, 
     razao_social, 
     uf, 
     modalidade,
-    cidade, 
-    representante, 
-    cargo_representante, 
-    Data_Registro_ANS,
-    descredenciada_em, 
-    descredenciamento_motivo
-FROM dim_operadoras
\ No newline at end of file
+    cidade
+FROM dim_operadoras
@@ -1,3 +1,5 @@
+-- @params: trimestre_inicial
+-- @colunas: REG_ANS, ID_TRIMESTRE, VL_SALDO_FINAL
 SELECT 
     REG_ANS, 
     ID_TRIMESTRE, 
@@ -1,3 +1,6 @@
+-- @params:
+-- @scan: permitido
+-- @colunas: registro_operadora, cnpj, razao_social, nome_fantasia
 SELECT op.registro_operadora,
        op.cnpj,
        op.razao_social,
@@ -0,0 +1,9 @@
+-- @params:
+-- @scan: permitido
+SELECT 
+    i.data_corte, 
+    i.versao_script, 
+    i.ultimo_rowid_ben IS (SELECT MAX(rowid) FROM beneficiarios_agrupados) AS ben_inalterado, 
+    i.ultimo_rowid_fin IS (SELECT MAX(rowid) FROM demonstracoes_contabeis) AS fin_inalterado, 
+    i.ultimo_rowid_dim IS (SELECT MAX(rowid) FROM dim_operadoras) AS dim_inalterado
+FROM gold_mestre_info i
@@ -0,0 +1,18 @@
+-- @params:
+-- @scan: permitido
+-- @colunas: ID_TRIMESTRE, ID_OPERADORA, razao_social, cnpj, uf, modalidade, cidade, NR_BENEF_T, VL_SALDO_FINAL, VAR_PCT_VIDAS, VAR_PCT_RECEITA, CUSTO_POR_VIDA
+SELECT 
+    ID_TRIMESTRE, 
+    ID_OPERADORA, 
+    razao_social, 
+    cnpj, 
+    uf, 
+    modalidade, 
+    cidade, 
+    NR_BENEF_T, 
+    VL_SALDO_FINAL, 
+    VAR_PCT_VIDAS, 
+    VAR_PCT_RECEITA, 
+    CUSTO_POR_VIDA
+FROM gold_mestre
+ORDER BY ID_OPERADORA, ID_TRIMESTRE
@@ -0,0 +1,108 @@
+-- Materializa o Dataset Mestre (Gold Layer) dentro do SQLite.
+-- Reproduz DataEngine._consolidar_pandas: chaves com 6 dígitos, FULL OUTER JOIN
+-- beneficiários x financeiro, enriquecimento pela dimensão e KPIs via LAG.
+-- Requer SQLite >= 3.39 (FULL OUTER JOIN).
+DROP TABLE IF EXISTS gold_mestre;
+
+CREATE TABLE gold_mestre AS
+WITH ben AS (
+    SELECT
+        CASE WHEN length(chave) < 6 THEN substr('000000' || chave, -6) ELSE chave END AS CD_OPERADO,
+        ID_TRIMESTRE,
+        NR_BENEF_T
+    FROM (
+        SELECT
+            trim(CASE WHEN instr(CAST(CD_OPERADO AS TEXT), '.') > 0
+                      THEN substr(CAST(CD_OPERADO AS TEXT), 1, instr(CAST(CD_OPERADO AS TEXT), '.') - 1)
+                      ELSE CAST(CD_OPERADO AS TEXT) END) AS chave,
+            ID_TRIMESTRE,
+            NR_BENEF_T
+        FROM beneficiarios_agrupados
+        WHERE ID_TRIMESTRE >= :data_corte
+    )
+),
+fin AS (
+    SELECT
+        CASE WHEN length(chave) < 6 THEN substr('000000' || chave, -6) ELSE chave END AS REG_ANS,
+        ID_TRIMESTRE,
+        VL_SALDO_FINAL
+    FROM (
+        SELECT
+            trim(CASE WHEN instr(CAST(REG_ANS AS TEXT), '.') > 0
+                      THEN substr(CAST(REG_ANS AS TEXT), 1, instr(CAST(REG_ANS AS TEXT), '.') - 1)
+                      ELSE CAST(REG_ANS AS TEXT) END) AS chave,
+            ID_TRIMESTRE,
+            VL_SALDO_FINAL
+        FROM demonstracoes_contabeis
+        WHERE ID_TRIMESTRE >= :data_corte
+    )
+),
+dim AS (
+    SELECT
+        CASE WHEN length(chave) < 6 THEN substr('000000' || chave, -6) ELSE chave END AS registro_operadora,
+        cnpj, razao_social, uf, modalidade, cidade
+    FROM (
+        SELECT
+            trim(CASE WHEN instr(CAST(registro_operadora AS TEXT), '.') > 0
+                      THEN substr(CAST(registro_operadora AS TEXT), 1, instr(CAST(registro_operadora AS TEXT), '.') - 1)
+                      ELSE CAST(registro_operadora AS TEXT) END) AS chave,
+            cnpj, razao_social, uf, modalidade, cidade
+        FROM dim_operadoras
+    )
+),
+consolidado AS (
+    SELECT
+        COALESCE(b.ID_TRIMESTRE, f.ID_TRIMESTRE) AS ID_TRIMESTRE,
+        COALESCE(b.CD_OPERADO, f.REG_ANS) AS ID_OPERADORA,
+        CAST(COALESCE(b.NR_BENEF_T, 0) AS REAL) AS NR_BENEF_T,
+        CAST(COALESCE(f.VL_SALDO_FINAL, 0) AS REAL) AS VL_SALDO_FINAL
+    FROM ben b
+    FULL OUTER JOIN fin f
+        ON f.REG_ANS = b.CD_OPERADO
+       AND f.ID_TRIMESTRE = b.ID_TRIMESTRE
+),
+enriquecido AS (
+    SELECT
+        c.ID_TRIMESTRE, c.ID_OPERADORA,
+        d.razao_social, d.cnpj, d.uf, d.modalidade, d.cidade,
+        c.NR_BENEF_T, c.VL_SALDO_FINAL,
+        LAG(c.NR_BENEF_T) OVER janela AS vidas_anterior,
+        LAG(c.VL_SALDO_FINAL) OVER janela AS receita_anterior
+    FROM consolidado c
+    LEFT JOIN dim d ON d.registro_operadora = c.ID_OPERADORA
+    WINDOW janela AS (PARTITION BY c.ID_OPERADORA ORDER BY c.ID_TRIMESTRE)
+)
+SELECT
+    ID_TRIMESTRE, ID_OPERADORA, razao_social, cnpj, uf, modalidade, cidade,
+    NR_BENEF_T, VL_SALDO_FINAL,
+    -- Mesma semântica de pct_change().fillna(0): base zero gera +/-inf (9e999)
+    CASE
+        WHEN vidas_anterior IS NULL THEN 0.0
+        WHEN vidas_anterior = 0 THEN
+            CASE WHEN NR_BENEF_T > 0 THEN 9e999 WHEN NR_BENEF_T < 0 THEN -9e999 ELSE 0.0 END
+        ELSE NR_BENEF_T / vidas_anterior - 1
+    END AS VAR_PCT_VIDAS,
+    CASE
+        WHEN receita_anterior IS NULL THEN 0.0
+        WHEN receita_anterior = 0 THEN
+            CASE WHEN VL_SALDO_FINAL > 0 THEN 9e999 WHEN VL_SALDO_FINAL < 0 THEN -9e999 ELSE 0.0 END
+        ELSE VL_SALDO_FINAL / receita_anterior - 1
+    END AS VAR_PCT_RECEITA,
+    CASE WHEN NR_BENEF_T > 0 THEN VL_SALDO_FINAL / NR_BENEF_T ELSE 0.0 END AS CUSTO_POR_VIDA
+FROM enriquecido
+ORDER BY ID_OPERADORA, ID_TRIMESTRE;
+
+CREATE INDEX idx_gold_mestre_op_tri ON gold_mestre(ID_OPERADORA, ID_TRIMESTRE);
+CREATE INDEX idx_gold_mestre_tri ON gold_mestre(ID_TRIMESTRE);
+
+-- Estado da origem no momento da materialização (usado para detectar tabela gold desatualizada)
+DROP TABLE IF EXISTS gold_mestre_info;
+
+CREATE TABLE gold_mestre_info AS
+SELECT
+    :data_corte AS data_corte,
+    :versao_script AS versao_script,
+    (SELECT MAX(rowid) FROM beneficiarios_agrupados) AS ultimo_rowid_ben,
+    (SELECT MAX(rowid) FROM demonstracoes_contabeis) AS ultimo_rowid_fin,
+    (SELECT MAX(rowid) FROM dim_operadoras) AS ultimo_rowid_dim,
+    datetime('now') AS materializado_em;
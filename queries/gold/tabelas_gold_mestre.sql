@@ -0,0 +1,6 @@
+-- @params:
+-- @scan: permitido
+SELECT name
+FROM sqlite_master
+WHERE type = 'table'
+  AND name IN ('gold_mestre', 'gold_mestre_info')
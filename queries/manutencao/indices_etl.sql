@@ -0,0 +1,8 @@
+-- Índices de cobertura das cargas do ETL (filtro ID_TRIMESTRE >= ?).
+-- etl/load_beneficiarios e etl/load_financeiro passam a ser respondidas só pelo índice
+-- (SEARCH ... USING COVERING INDEX), sem ler as páginas das tabelas.
+CREATE INDEX IF NOT EXISTS idx_beneficiarios_trimestre_cobertura
+    ON beneficiarios_agrupados (ID_TRIMESTRE, CD_OPERADO, NR_BENEF_T);
+
+CREATE INDEX IF NOT EXISTS idx_demonstracoes_trimestre_cobertura
+    ON demonstracoes_contabeis (ID_TRIMESTRE, REG_ANS, VL_SALDO_FINAL);
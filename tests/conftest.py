@@ -0,0 +1,107 @@
+import sqlite3
+import struct
+import pytest
+from backend.config import settings
+
+def _criar_base_ans(caminho):
+    """Cria uma base SQLite mínima com as três tabelas lidas pelo ETL."""
+    conn = sqlite3.connect(caminho)
+    conn.executescript("""
+        CREATE TABLE dim_operadoras (
+            registro_operadora TEXT, cnpj TEXT, razao_social TEXT, nome_fantasia TEXT,
+            uf TEXT, modalidade TEXT, cidade TEXT, representante TEXT,
+            cargo_representante TEXT, Data_Registro_ANS TEXT,
+            descredenciada_em TEXT, descredenciamento_motivo TEXT
+        );
+        CREATE TABLE beneficiarios_agrupados (
+            ID_CMPT TEXT, CD_OPERADO TEXT, NR_BENEF_T REAL, ID_TRIMESTRE TEXT
+        );
+        CREATE TABLE demonstracoes_contabeis (
+            REG_ANS TEXT, CD_CONTA_CONTABIL TEXT, VL_SALDO_FINAL REAL, ID_TRIMESTRE TEXT
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO dim_operadoras VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+        [
+            ('123', '11111111000111', 'UNIMED TESTE', None, 'SP', 'Cooperativa Médica', 'SAO PAULO', 'ANA', 'DIRETORA', '2000-01-01', None, None),
+            ('456', '22222222000122', 'BRADESCO SAUDE', None, 'RJ', 'Seguradora', 'RIO DE JANEIRO', 'BRUNO', 'PRESIDENTE', '1999-05-10', None, None),
+            ('789', '33333333000133', 'AMIL ASSISTENCIA', None, 'SP', 'Medicina de Grupo', 'SAO PAULO', 'CARLA', 'DIRETORA', '1998-03-02', '2023-08-01', 'Cancelamento'),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO beneficiarios_agrupados VALUES (?,?,?,?)",
+        [
+            ('201103', '123', 50, '2011-T1'),
+            ('202303', '123', 100, '2023-T1'),
+            ('202306', '123', 120, '2023-T2'),
+            ('202303', '456', 200, '2023-T1'),
+            ('202306', '456', 180, '2023-T2'),
+            ('202303', '789', 40, '2023-T1'),
+            ('202306', '789', 0, '2023-T2'),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO demonstracoes_contabeis VALUES (?,?,?,?)",
+        [
+            ('123', '31', 1000.0, '2023-T1'),
+            ('123', '31', 1500.0, '2023-T2'),
+            ('456', '31', 4000.0, '2023-T1'),
+            ('456', '31', 3600.0, '2023-T2'),
+            ('789', '31', 500.0, '2023-T2'),
+            ('999', '31', 10.0, '2023-T2'),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+@pytest.fixture
+def base_ans(tmp_path, monkeypatch):
+    """Base SQLite temporária + settings apontando para ela (e para um cache isolado)."""
+    caminho_db = tmp_path / "base_ans_teste.db"
+    _criar_base_ans(caminho_db)
+    monkeypatch.setattr(settings, "DB_PATH", caminho_db)
+    monkeypatch.setattr(settings, "CACHE_DIR", tmp_path / "cache")
+    return caminho_db
+
+def escrever_dbf(caminho, campos, registros):
+    """
+    Grava um DBF (dBase III) mínimo, no layout dos microdados do DATASUS.
+    campos: [(nome, tipo 'C'/'N', tamanho, decimais)]; registros: listas de valores.
+    """
+    tamanho_registro = 1 + sum(c[2] for c in campos)
+    tamanho_cabecalho = 32 + 32 * len(campos) + 1
+    cabecalho = struct.pack("<BBBBIHH20x", 0x03, 124, 1, 1, len(registros), tamanho_cabecalho, tamanho_registro)
+    descritores = b"".join(
+        struct.pack("<11sc4xBB14x", nome.encode("ascii"), tipo.encode("ascii"), tamanho, decimais)
+        for nome, tipo, tamanho, decimais in campos
+    )
+    corpo = bytearray()
+    for registro in registros:
+        corpo += b" "
+        for (_, tipo, tamanho, decimais), valor in zip(campos, registro):
+            if valor is None:
+                texto = ""
+            elif tipo == "N":
+                texto = f"{valor:.{decimais}f}" if decimais else str(int(valor))
+            else:
+                texto = str(valor)
+            texto = texto.rjust(tamanho) if tipo == "N" else texto.ljust(tamanho)
+            corpo += texto.encode("iso-8859-1")[:tamanho]
+    with open(caminho, "wb") as f:
+        f.write(cabecalho + descritores + b"\r" + bytes(corpo) + b"\x1a")
+    return caminho
+
+# Layout dos microdados de beneficiários por operadora (DATASUS)
+CAMPOS_BENEFICIARIOS = [("ID_CMPT", "C", 6, 0), ("CD_OPERADO", "C", 6, 0),
+                        ("SG_UF", "C", 2, 0), ("NR_BENEF_T", "N", 10, 0)]
+
+@pytest.fixture
+def dbf_beneficiarios(tmp_path):
+    """DBF de beneficiários com chaves repetidas (a agregação precisa somá-las)."""
+    registros = [
+        [f"2023{mes:02d}", f"{op:06d}", uf, (op * 7 + mes * 13) % 500 if (op + mes) % 11 else None]
+        for mes in (1, 2, 4)
+        for op in (123, 456, 789, 999)
+        for uf in ("SP", "RJ", "PE")
+    ]
+    return escrever_dbf(tmp_path / "ben_2023.dbf", CAMPOS_BENEFICIARIOS, registros)
@@ -0,0 +1,54 @@
+import pandas as pd
+from backend.processing.chaves import (
+    adicionar_chaves, filtrar_operadora, filtrar_trimestre,
+    trimestre_para_ordinal, ordinal_para_trimestre
+)
+from backend.analytics.comparativos import obter_trimestres_anteriores, calcular_variacoes_operadora
+
+def test_ordinal_de_trimestre_ida_e_volta():
+    # Act / Assert
+    assert trimestre_para_ordinal('2012-T1') == 0
+    assert trimestre_para_ordinal('2023-T2') == 45
+    assert trimestre_para_ordinal('2023-T5') is None
+    assert ordinal_para_trimestre(45) == '2023-T2'
+    assert ordinal_para_trimestre(-1) == '2011-T4'
+    assert obter_trimestres_anteriores('2024-T1') == ('2023-T4', '2023-T1')
+    assert obter_trimestres_anteriores('invalido') == (None, None)
+
+def test_adicionar_chaves_e_filtros_inteiros():
+    # Arrange
+    df = pd.DataFrame({
+        'ID_OPERADORA': ['000123', '000456', '000123'],
+        'ID_TRIMESTRE': ['2023-T1', '2023-T1', '2023-T2'],
+        'NR_BENEF_T': [10, 20, 30],
+        'VL_SALDO_FINAL': [1.0, 2.0, 3.0],
+    })
+
+    # Act
+    df_chaves = adicionar_chaves(df)
+
+    # Assert
+    assert df_chaves['ID_OPERADORA_KEY'].dtype == 'int32'
+    assert df_chaves['TRIMESTRE_ORD'].dtype == 'int16'
+    assert df_chaves['ID_OPERADORA_KEY'].tolist() == [123, 456, 123]
+    assert filtrar_operadora(df_chaves, '123')['NR_BENEF_T'].tolist() == [10, 30]
+    assert filtrar_trimestre(df_chaves, '2023-T2')['NR_BENEF_T'].tolist() == [30]
+    # Sem as chaves o resultado é o mesmo (fallback por texto)
+    assert filtrar_operadora(df, 123)['NR_BENEF_T'].tolist() == [10, 30]
+
+def test_variacoes_operadora_usam_deslocamento_de_ordinal():
+    # Arrange
+    df = adicionar_chaves(pd.DataFrame({
+        'ID_OPERADORA': ['000123'] * 5,
+        'ID_TRIMESTRE': ['2022-T2', '2022-T3', '2022-T4', '2023-T1', '2023-T2'],
+        'NR_BENEF_T': [100, 110, 120, 130, 150],
+        'VL_SALDO_FINAL': [1000.0, 1100.0, 1200.0, 1300.0, 2000.0],
+    }))
+
+    # Act
+    kpis = calcular_variacoes_operadora(df, '000123', '2023-T2')
+
+    # Assert
+    assert kpis['Ref_QoQ'] == '2023-T1' and kpis['Ref_YoY'] == '2022-T2'
+    assert kpis['Val_Vidas_QoQ'] == 130 and kpis['Val_Vidas_YoY'] == 100
+    assert kpis['Var_Receita_YoY'] == 1.0
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.contracts import SchemaMestre, validar_mestre_rapido
+
+def _df_valido():
+    return pd.DataFrame({
+        'ID_TRIMESTRE': ['2023-T1', '2023-T2'], 'ID_OPERADORA': ['000123', '000456'],
+        'razao_social': ['UNIMED TESTE', None], 'cidade': ['SAO PAULO', None],
+        'uf': ['SP', None], 'modalidade': ['Seguradora', 'Seguradora'],
+        'NR_BENEF_T': [100.0, 0.0], 'VL_SALDO_FINAL': [1500.0, 10.0], 'CUSTO_POR_VIDA': [15.0, np.nan],
+    })
+
+CASOS = {
+    'valido': lambda df: df,
+    'categoricas': lambda df: df.astype({'ID_TRIMESTRE': 'category', 'uf': 'category', 'razao_social': 'category'}),
+    'metricas_texto_numerico': lambda df: df.assign(VL_SALDO_FINAL=['1.5', '10']),
+    'uf_fora_do_dominio': lambda df: df.assign(uf=['XX', None]),
+    'chave_curta': lambda df: df.assign(ID_OPERADORA=['00123', '000456']),
+    'chave_inteira': lambda df: df.assign(ID_OPERADORA=[123456, 1]),
+    'chave_nula': lambda df: df.assign(ID_OPERADORA=[None, '000456']),
+    'trimestre_nulo': lambda df: df.assign(ID_TRIMESTRE=[None, '2023-T2']),
+    'vidas_negativas': lambda df: df.assign(NR_BENEF_T=[-1.0, 0.0]),
+    'vidas_nulas': lambda df: df.assign(NR_BENEF_T=[np.nan, 0.0]),
+    'vidas_infinitas': lambda df: df.assign(NR_BENEF_T=[np.inf, 0.0]),
+    'receita_nao_numerica': lambda df: df.assign(VL_SALDO_FINAL=['abc', '10']),
+    'dimensao_numerica': lambda df: df.assign(cidade=[1.0, 2.0]),
+    'custo_float32': lambda df: df.assign(CUSTO_POR_VIDA=np.float32([15.0, 0.0])),
+    'coluna_ausente': lambda df: df.drop(columns=['modalidade']),
+}
+
+@pytest.mark.parametrize("caso", CASOS)
+def test_validador_rapido_tem_mesma_semantica_do_pandera(caso):
+    # Arrange
+    df = CASOS[caso](_df_valido())
+
+    # Act
+    try:
+        SchemaMestre.validate(df, lazy=True)
+        valido_pandera = True
+    except Exception:
+        valido_pandera = False
+    erros_rapido = validar_mestre_rapido(df)
+
+    # Assert
+    assert (not erros_rapido) == valido_pandera, erros_rapido
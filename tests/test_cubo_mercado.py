@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from backend.analytics.cubo_mercado import obter_cubo, CuboMercado
+
+def _df_mestre():
+    return pd.DataFrame({
+        'ID_OPERADORA': ['000001', '000002', '000003', '000001', '000002', '000003'],
+        'razao_social': ['UNIMED A', 'UNIMED B', 'AMIL C', 'UNIMED A', 'UNIMED B', 'AMIL C'],
+        'modalidade': ['Cooperativa Médica', 'Cooperativa Médica', 'Medicina de Grupo'] * 2,
+        'ID_TRIMESTRE': ['2023-T4'] * 3 + ['2024-T1'] * 3,
+        'NR_BENEF_T': [100, 300, 50, 110, 270, 80],
+        'VL_SALDO_FINAL': [1000.0, 2000.0, 700.0, 1200.0, 1800.0, 900.0],
+        'VAR_PCT_VIDAS': [0.0, 0.0, 0.0, 0.10, -0.10, 0.60],
+        'VAR_PCT_RECEITA': [0.0, 0.0, 0.0, 0.20, -0.10, 0.2857],
+    })
+
+def test_cubo_bate_com_agregacao_direta():
+    # Arrange
+    df = _df_mestre()
+    df_tri = df[df['ID_TRIMESTRE'] == '2024-T1']
+    df_unimed = df_tri[df_tri['razao_social'].str.startswith('UNIMED')]
+
+    # Act
+    cubo = CuboMercado(df)
+
+    # Assert: mercado, rollup por marca e célula (modalidade, marca)
+    assert cubo.valor('2024-T1', 'NR_BENEF_T', 'qtd') == 3
+    assert cubo.valor('2024-T1', 'NR_BENEF_T', 'soma') == df_tri['NR_BENEF_T'].sum()
+    assert cubo.valor('2024-T1', 'VL_SALDO_FINAL', 'max') == df_tri['VL_SALDO_FINAL'].max()
+    assert cubo.valor('2024-T1', 'VAR_PCT_RECEITA', 'mediana') == pytest.approx(df_tri['VAR_PCT_RECEITA'].median())
+    assert cubo.valor('2024-T1', 'VAR_PCT_VIDAS', 'q75') == pytest.approx(df_tri['VAR_PCT_VIDAS'].quantile(0.75))
+    assert cubo.valor('2024-T1', 'VAR_PCT_VIDAS', 'mediana', marca='UNIMED') == pytest.approx(df_unimed['VAR_PCT_VIDAS'].median())
+    assert cubo.valor('2024-T1', 'NR_BENEF_T', 'soma', modalidade='Medicina de Grupo', marca='AMIL') == 80
+    assert cubo.valor('2030-T1', 'NR_BENEF_T', 'soma', padrao=0) == 0
+
+    # Série histórica em ordem cronológica (referência do gráfico de spread)
+    serie = cubo.serie('VAR_PCT_RECEITA', 'mediana', marca='UNIMED')
+    assert serie.index.tolist() == ['2023-T4', '2024-T1']
+    assert serie.loc['2024-T1'] == pytest.approx(0.05)
+
+    # Marca por linha, preservando o índice do recorte
+    assert cubo.marca_de(df_tri).tolist() == ['UNIMED', 'UNIMED', 'AMIL']
+    assert cubo.marca_de(df_tri).index.tolist() == df_tri.index.tolist()
+
+def test_obter_cubo_reutiliza_por_dataset():
+    # Arrange
+    df = _df_mestre()
+
+    # Act
+    cubo_1 = obter_cubo(df)
+    cubo_2 = obter_cubo(df)
+    cubo_outro = obter_cubo(df.copy())
+
+    # Assert
+    assert cubo_1 is cubo_2
+    assert cubo_outro is not cubo_1
@@ -0,0 +1,222 @@
+import sqlite3
+import threading
+import pytest
+import pandas as pd
+from backend.config import settings
+from backend.services import data_engine
+from backend.services.data_engine import DataEngine
+from backend.processing.processor import DataProcessor
+from backend.constants import GruposColunas
+from backend.exceptions import DataLoadError
+
+def test_gerar_dataset_mestre_consolida_fontes(base_ans):
+    # Act
+    df = DataEngine().gerar_dataset_mestre()
+
+    # Assert
+    # 2011-T1 fica fora do corte; '999' só existe no financeiro (outer join)
+    assert sorted(df['ID_TRIMESTRE'].unique()) == ['2023-T1', '2023-T2']
+    assert set(df['ID_OPERADORA']) == {'000123', '000456', '000789', '000999'}
+    linha = df[(df['ID_OPERADORA'] == '000123') & (df['ID_TRIMESTRE'] == '2023-T2')].iloc[0]
+    assert linha['VAR_PCT_VIDAS'] == pytest.approx(0.2)
+    assert linha['CUSTO_POR_VIDA'] == 12.5
+    assert (linha['ID_OPERADORA_KEY'], linha['TRIMESTRE_ORD']) == (123, 45)
+
+def test_snapshot_reaproveitado_quando_origem_nao_muda(base_ans, monkeypatch):
+    # Arrange
+    df_frio = DataEngine().gerar_dataset_mestre()
+
+    def _pipeline_proibido(self):
+        raise AssertionError("Warm start não deveria executar o pipeline ETL")
+    monkeypatch.setattr(DataEngine, "_construir_dataset_mestre", _pipeline_proibido)
+
+    # Act
+    df_quente = DataEngine().gerar_dataset_mestre()
+
+    # Assert
+    assert df_quente.equals(df_frio)
+
+def test_snapshot_invalidado_quando_banco_muda(base_ans):
+    # Arrange
+    DataEngine().gerar_dataset_mestre()
+    conn = sqlite3.connect(base_ans)
+    conn.execute("INSERT INTO beneficiarios_agrupados VALUES ('202309', '123', 130, '2023-T3')")
+    conn.commit()
+    conn.close()
+
+    # Act
+    df = DataEngine().gerar_dataset_mestre()
+
+    # Assert
+    assert '2023-T3' in set(df['ID_TRIMESTRE'])
+
+def test_modo_gold_sql_equivale_ao_pipeline_pandas(base_ans, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "USAR_SNAPSHOT", False)
+    df_pandas = DataEngine().gerar_dataset_mestre()
+    monkeypatch.setattr(settings, "MODO_GOLD_SQL", True)
+
+    # Act
+    df_sql = DataEngine().gerar_dataset_mestre()
+
+    # Assert
+    # Dimensão ausente: merge do Pandas gera NaN, o SQLite gera None (ambos nulos)
+    def _ordenar(df):
+        df = df.sort_values(['ID_OPERADORA', 'ID_TRIMESTRE']).reset_index(drop=True)
+        return df.astype(object).where(df.notna(), None)
+    pd.testing.assert_frame_equal(_ordenar(df_sql), _ordenar(df_pandas))
+
+def test_modo_gold_sql_rematerializa_quando_origem_muda(base_ans, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "USAR_SNAPSHOT", False)
+    monkeypatch.setattr(settings, "MODO_GOLD_SQL", True)
+    engine = DataEngine()
+    engine.gerar_dataset_mestre()
+    assert engine._gold_sql_atualizada()
+
+    conn = sqlite3.connect(base_ans)
+    conn.execute("INSERT INTO demonstracoes_contabeis VALUES ('456', '31', 3900.0, '2023-T3')")
+    conn.commit()
+    conn.close()
+
+    # Act / Assert
+    assert not engine._gold_sql_atualizada()
+    df = engine.gerar_dataset_mestre()
+    assert '2023-T3' in set(df['ID_TRIMESTRE'])
+
+def test_atualizacao_incremental_equivale_ao_rebuild(base_ans, monkeypatch):
+    # Arrange
+    DataEngine().gerar_dataset_mestre()
+    conn = sqlite3.connect(base_ans)
+    conn.execute("INSERT INTO beneficiarios_agrupados VALUES ('202309', '123', 150, '2023-T3')")
+    conn.execute("INSERT INTO demonstracoes_contabeis VALUES ('123', '31', 1800.0, '2023-T3')")
+    conn.execute("INSERT INTO demonstracoes_contabeis VALUES ('789', '31', 600.0, '2023-T3')")
+    conn.commit()
+    conn.close()
+
+    chamadas = []
+    construir_original = DataEngine._construir_dataset_mestre
+    monkeypatch.setattr(DataEngine, "_construir_dataset_mestre",
+                        lambda self: chamadas.append(1) or construir_original(self))
+
+    # Act
+    df_incremental = DataEngine().gerar_dataset_mestre()
+    df_completo = DataEngine().gerar_dataset_mestre(forcar_rebuild=True)
+
+    # Assert
+    assert len(chamadas) == 1  # apenas o rebuild forçado executou o pipeline completo
+    pd.testing.assert_frame_equal(df_incremental, df_completo.reset_index(drop=True))
+
+def test_atualizacao_incremental_recua_para_rebuild_se_dimensao_mudar(base_ans):
+    # Arrange
+    DataEngine().gerar_dataset_mestre()
+    conn = sqlite3.connect(base_ans)
+    conn.execute("UPDATE dim_operadoras SET razao_social = 'UNIMED NOVA' WHERE registro_operadora = '123'")
+    conn.commit()
+    conn.close()
+
+    # Act
+    df = DataEngine().gerar_dataset_mestre()
+
+    # Assert
+    assert set(df.loc[df['ID_OPERADORA'] == '000123', 'razao_social']) == {'UNIMED NOVA'}
+
+def test_extracao_executa_as_tres_fontes_em_paralelo(base_ans, monkeypatch):
+    # Arrange
+    # A barreira só libera se as três fontes estiverem normalizando ao mesmo tempo
+    barreira = threading.Barrier(3, timeout=10)
+    threads = set()
+    normalizar_original = DataProcessor.normalizar_chaves
+
+    def _normalizar_sincronizado(df, colunas):
+        if threading.get_ident() not in threads:
+            threads.add(threading.get_ident())
+            barreira.wait()
+        return normalizar_original(df, colunas)
+    monkeypatch.setattr(DataProcessor, "normalizar_chaves", staticmethod(_normalizar_sincronizado))
+
+    # Act
+    df_dim, df_ben, df_fin = DataEngine()._extrair_dados()
+
+    # Assert
+    assert len(threads) == 3 and threading.get_ident() not in threads
+    assert list(df_dim['registro_operadora']) == ['000123', '000456', '000789']
+    assert len(df_ben) == 6 and len(df_fin) == 6
+
+def test_validacao_cacheada_por_fingerprint(base_ans, monkeypatch):
+    # Arrange
+    chamadas = []
+    monkeypatch.setattr(data_engine, "validar_mestre_rapido",
+                        lambda df: chamadas.append(len(df)) or [])
+    engine = DataEngine()
+
+    # Act
+    engine.gerar_dataset_mestre()
+    engine.gerar_dataset_mestre(forcar_rebuild=True)
+
+    # Assert
+    assert len(chamadas) == 1
+    assert {"pipeline", "validacao", "total"} <= set(engine.tempos_carga)
+
+def test_grupos_de_colunas_carregados_sob_demanda(base_ans, monkeypatch):
+    # Arrange
+    engine = DataEngine()
+    df = engine.gerar_dataset_mestre()
+    consultas = []
+    buscar_original = engine.repository.buscar_grupo_colunas
+    monkeypatch.setattr(engine.repository, "buscar_grupo_colunas",
+                        lambda grupo: consultas.append(grupo) or buscar_original(grupo))
+
+    # Act
+    df_saidas = engine.anexar_grupos_colunas(df[df['ID_TRIMESTRE'] == '2023-T2'], [GruposColunas.DESCREDENCIAMENTO])
+    linha = engine.anexar_grupos_colunas(df.iloc[0], [GruposColunas.CADASTRAL])
+    engine.anexar_grupos_colunas(df.head(2), [GruposColunas.CADASTRAL])
+
+    # Assert
+    # O núcleo não carrega os grupos; cada grupo vai ao banco uma única vez
+    assert not {'representante', 'descredenciamento_motivo'} & set(df.columns)
+    assert consultas == [GruposColunas.DESCREDENCIAMENTO, GruposColunas.CADASTRAL]
+    motivos = df_saidas.set_index('ID_OPERADORA')['descredenciamento_motivo']
+    assert motivos['000789'] == 'Cancelamento' and pd.isna(motivos['000999'])
+    assert linha['representante'] == 'ANA'
+    with pytest.raises(DataLoadError):
+        engine.carregar_grupo_colunas('inexistente')
+
+def test_acesso_particionado_por_trimestre_e_operadora(base_ans, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "PARTICOES_EM_MEMORIA", 1)
+    engine = DataEngine()
+    df_mestre = engine.gerar_dataset_mestre()
+
+    # Act
+    df_t1 = engine.get_quarter('2023-T1')
+    df_t1_de_novo = engine.get_quarter('2023-T1')
+    engine.get_quarter('2023-T2')  # LRU de 1 partição: descarta 2023-T1
+    df_t1_relido = engine.get_quarter('2023-T1')
+    df_historico = engine.get_operator_history('123')
+
+    # Assert
+    assert engine.listar_trimestres() == ['2023-T1', '2023-T2']
+    esperado = df_mestre[df_mestre['ID_TRIMESTRE'] == '2023-T1'].reset_index(drop=True)
+    pd.testing.assert_frame_equal(df_t1, esperado)
+    assert df_t1_de_novo is df_t1 and df_t1_relido is not df_t1
+    assert df_historico['ID_TRIMESTRE'].tolist() == ['2023-T1', '2023-T2']
+    assert df_historico['NR_BENEF_T'].tolist() == [100, 120]
+    assert engine.get_quarter('2030-T1').empty and engine.get_operator_history('abc').empty
+
+def test_particoes_regravadas_quando_banco_muda(base_ans):
+    # Arrange
+    engine = DataEngine()
+    engine.get_quarter('2023-T1')
+    conn = sqlite3.connect(base_ans)
+    conn.execute("INSERT INTO beneficiarios_agrupados VALUES ('202309', '123', 130, '2023-T3')")
+    conn.commit()
+    conn.close()
+
+    # Act
+    df_t3 = DataEngine().get_quarter('2023-T3')
+
+    # Assert
+    assert df_t3['NR_BENEF_T'].tolist() == [130]
+    pastas_versao = [p for p in (settings.CACHE_DIR / "gold_mestre_particoes").iterdir() if p.is_dir()]
+    assert len(pastas_versao) == 1
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+import pytest
+import pandas as pd
+from infra.db_connector import ConexaoSQLite, PoolConexoesSQLite
+
+def test_pool_atende_threads_concorrentes_sem_exceder_limite(base_ans):
+    # Arrange
+    pool = PoolConexoesSQLite(str(base_ans), max_conexoes=3, usar_wal=True)
+    resultados, erros = [], []
+
+    def _consultar():
+        try:
+            df = pool.executar_query("SELECT COUNT(*) AS n FROM beneficiarios_agrupados WHERE ID_TRIMESTRE >= ?", ('2023-T1',))
+            resultados.append(int(df['n'].iloc[0]))
+        except Exception as e:
+            erros.append(e)
+
+    # Act
+    threads = [threading.Thread(target=_consultar) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Assert
+    assert not erros
+    assert resultados == [6] * 16
+    assert pool._total <= 3
+    pool.fechar()
+
+def test_pool_abre_conexoes_somente_leitura_com_pragmas(base_ans):
+    # Arrange
+    pool = PoolConexoesSQLite(str(base_ans), mmap_size=1024 * 1024, cache_size_kb=4096, usar_wal=True)
+
+    # Act
+    with pool.conexao() as conexao:
+        query_only = conexao.execute("PRAGMA query_only").fetchone()[0]
+        cache_size = conexao.execute("PRAGMA cache_size").fetchone()[0]
+        journal = conexao.execute("PRAGMA journal_mode").fetchone()[0]
+    df_escrita = pool.executar_query("DELETE FROM dim_operadoras")
+
+    # Assert
+    assert query_only == 1
+    assert cache_size == -4096
+    assert journal == 'wal'
+    assert df_escrita.empty
+    assert len(pool.executar_query("SELECT * FROM dim_operadoras")) == 3
+    pool.fechar()
+
+def test_pool_descarta_conexao_que_falha_no_health_check(base_ans):
+    # Arrange
+    pool = PoolConexoesSQLite(str(base_ans), intervalo_health_check=0)
+    with pool.conexao() as conexao:
+        pass
+    conexao.close()  # simula um handle morto parado no pool
+
+    # Act
+    df = pool.executar_query("SELECT COUNT(*) AS n FROM dim_operadoras")
+
+    # Assert
+    assert df['n'].iloc[0] == 3
+    assert pool._total == 1
+    pool.fechar()
+
+def test_query_stream_entrega_lotes_de_tamanho_fixo(base_ans):
+    # Arrange
+    pool = PoolConexoesSQLite(str(base_ans))
+    sql = "SELECT CD_OPERADO, NR_BENEF_T FROM beneficiarios_agrupados ORDER BY rowid"
+
+    # Act
+    lotes_df = list(pool.executar_query_stream(sql, tamanho_lote=3))
+    lotes_arrow = list(pool.executar_query_stream(sql, tamanho_lote=3, formato="arrow"))
+
+    # Assert
+    assert [len(l) for l in lotes_df] == [3, 3, 1]
+    assert [l.num_rows for l in lotes_arrow] == [3, 3, 1]
+    assert lotes_arrow[0].schema.names == ['CD_OPERADO', 'NR_BENEF_T']
+    pd.testing.assert_frame_equal(pd.concat(lotes_df, ignore_index=True), pool.executar_query(sql))
+    pool.fechar()
+
+def test_query_stream_propaga_erros_em_vez_de_frame_vazio(base_ans):
+    # Arrange
+    conexao = ConexaoSQLite(str(base_ans))
+
+    # Act / Assert
+    with pytest.raises(sqlite3.OperationalError):
+        list(conexao.executar_query_stream("SELECT * FROM tabela_inexistente"))
+    lotes = list(conexao.executar_query_stream("SELECT * FROM dim_operadoras WHERE 1 = 0"))
+    assert len(lotes) == 1 and lotes[0].empty and 'cnpj' in lotes[0].columns
@@ -0,0 +1,38 @@
+import os
+from backend.config import settings
+from backend.query_registry import QueryRegistry
+from backend.services.data_engine import DataEngine
+from infra.db_maintenance import ManutencaoSQLite
+
+def _consultas_etl():
+    registry = QueryRegistry(settings.QUERIES_DIR)
+    return {
+        nome: (registry.obter(nome).sql, registry.obter(nome).parametros_nulos())
+        for nome in ('etl/load_beneficiarios', 'etl/load_financeiro')
+    }
+
+def test_indices_de_cobertura_eliminam_table_scan_das_cargas(base_ans):
+    # Arrange
+    manutencao = ManutencaoSQLite(str(base_ans))
+    ddl = QueryRegistry(settings.QUERIES_DIR).obter('manutencao/indices_etl').sql
+    scans_antes = manutencao.verificar_planos(_consultas_etl())
+
+    # Act
+    criados = manutencao.garantir_indices(ddl)
+    mtime_apos_criacao = os.stat(base_ans).st_mtime_ns
+    criados_de_novo = manutencao.garantir_indices(ddl)
+
+    # Assert
+    assert set(scans_antes) == {'etl/load_beneficiarios', 'etl/load_financeiro'}
+    assert manutencao.verificar_planos(_consultas_etl()) == {}
+    assert criados == ['idx_beneficiarios_trimestre_cobertura', 'idx_demonstracoes_trimestre_cobertura']
+    assert criados_de_novo == []
+    assert os.stat(base_ans).st_mtime_ns == mtime_apos_criacao  # idempotente sem tocar o arquivo
+
+def test_preparar_banco_nao_alerta_queries_registradas(base_ans):
+    # Act
+    scans = DataEngine().preparar_banco()
+
+    # Assert
+    # Leituras integrais intencionais são marcadas com '-- @scan: permitido'
+    assert scans == {}
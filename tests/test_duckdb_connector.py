@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+from backend.config import settings
+from backend.services.data_engine import DataEngine
+from infra.duckdb_connector import ConexaoDuckDB
+
+duckdb = pytest.importorskip("duckdb")
+
+def _ordenar(df):
+    df = df.sort_values(['ID_OPERADORA', 'ID_TRIMESTRE']).reset_index(drop=True)
+    return df.astype(object).where(df.notna(), None)
+
+@pytest.mark.parametrize("via_parquet", [False, True])
+def test_backend_duckdb_equivale_ao_pipeline_pandas(base_ans, tmp_path, monkeypatch, via_parquet):
+    # Arrange
+    monkeypatch.setattr(settings, "USAR_SNAPSHOT", False)
+    df_pandas = DataEngine().gerar_dataset_mestre()
+    monkeypatch.setattr(settings, "BACKEND_ANALITICO", "duckdb")
+    if via_parquet:
+        pasta = tmp_path / "parquet"
+        ConexaoDuckDB.exportar_parquet(
+            str(base_ans), str(pasta), ["dim_operadoras", "beneficiarios_agrupados", "demonstracoes_contabeis"])
+        monkeypatch.setattr(settings, "DUCKDB_PARQUET_DIR", pasta)
+
+    # Act
+    df_duckdb = DataEngine().gerar_dataset_mestre()
+
+    # Assert
+    pd.testing.assert_frame_equal(_ordenar(df_duckdb), _ordenar(df_pandas))
+
+def test_stream_duckdb_respeita_contrato_de_lotes(base_ans):
+    # Arrange
+    conexao = ConexaoDuckDB(db_path=str(base_ans))
+    sql = "SELECT CD_OPERADO, NR_BENEF_T FROM beneficiarios_agrupados WHERE ID_TRIMESTRE >= :corte"
+
+    # Act
+    with conexao:
+        lotes = list(conexao.executar_query_stream(sql, {"corte": "2023-T1"}, tamanho_lote=4))
+        vazio = list(conexao.executar_query_stream(sql, {"corte": "2099-T1"}, formato="arrow"))
+        df_falha = conexao.executar_query("SELECT * FROM tabela_inexistente")
+
+    # Assert
+    assert sum(len(lote) for lote in lotes) == 6
+    assert list(lotes[0].columns) == ['CD_OPERADO', 'NR_BENEF_T']
+    assert len(vazio) == 1 and vazio[0].num_rows == 0
+    assert vazio[0].schema.names == ['CD_OPERADO', 'NR_BENEF_T']
+    assert df_falha.empty
@@ -0,0 +1,47 @@
+import sqlite3
+import pandas as pd
+import pytest
+from dbfread import DBF
+from etl.beneficiarios import processar_arquivo, ler_dbf_em_lotes, gerar_chave_trimestre
+from etl.__main__ import main
+from tests.conftest import escrever_dbf
+
+def _worker_notebook(caminho_dbf):
+    """Caminho original do notebook: DBF(load=True) inteiro em memória + groupby."""
+    df = pd.DataFrame(iter(DBF(str(caminho_dbf), encoding='iso-8859-1', load=True)))
+    df = df[['ID_CMPT', 'CD_OPERADO', 'NR_BENEF_T']].copy()
+    df['NR_BENEF_T'] = pd.to_numeric(df['NR_BENEF_T'], errors='coerce').fillna(0)
+    df_agrupado = df.groupby(['ID_CMPT', 'CD_OPERADO'], as_index=False)['NR_BENEF_T'].sum()
+    df_agrupado['ID_TRIMESTRE'] = df_agrupado['ID_CMPT'].apply(gerar_chave_trimestre)
+    return df_agrupado
+
+def test_processar_arquivo_em_lotes_equivale_ao_worker_do_notebook(dbf_beneficiarios):
+    # Act
+    df = processar_arquivo(dbf_beneficiarios, tamanho_lote=5)
+
+    # Assert
+    pd.testing.assert_frame_equal(df, _worker_notebook(dbf_beneficiarios))
+    assert set(df['ID_TRIMESTRE']) == {'2023-T1', '2023-T2'}
+    assert max(len(l) for l in ler_dbf_em_lotes(dbf_beneficiarios, tamanho_lote=5)) == 5
+
+def test_processar_arquivo_ignora_dbf_sem_colunas(tmp_path):
+    # Arrange
+    caminho = escrever_dbf(tmp_path / "outro.dbf", [("ID_CMPT", "C", 6, 0)], [["202301"]])
+
+    # Act / Assert
+    assert processar_arquivo(caminho) is None
+
+def test_cli_carrega_pasta_local(dbf_beneficiarios, tmp_path):
+    # Arrange
+    caminho_db = tmp_path / "destino.db"
+
+    # Act
+    codigo = main(["beneficiarios", "--db", str(caminho_db), "--origem", str(dbf_beneficiarios.parent),
+                   "--workers", "1", "--lote", "7", "--sem-cache"])
+
+    # Assert
+    assert codigo == 0
+    with sqlite3.connect(caminho_db) as conn:
+        total = conn.execute("SELECT COUNT(*), SUM(NR_BENEF_T) FROM beneficiarios_agrupados").fetchone()
+    esperado = _worker_notebook(dbf_beneficiarios)
+    assert total == (len(esperado), esperado['NR_BENEF_T'].sum())
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import threading
+from collections import Counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from etl.importador import ImportadorANSParalelo
+from etl.gravador import TABELA_REGISTRO
+from tests.conftest import escrever_dbf, CAMPOS_BENEFICIARIOS
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Servidor de arquivos estático (envia Last-Modified e Content-Length) que conta os métodos."""
+    contagem = Counter()
+
+    def do_GET(self):
+        self.contagem['GET'] += 1
+        super().do_GET()
+
+    def do_HEAD(self):
+        self.contagem['HEAD'] += 1
+        super().do_HEAD()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def servidor_ans(tmp_path):
+    """Servidor HTTP local publicando tmp_path/publico; devolve (pasta, url_base, contagem)."""
+    pasta = tmp_path / "publico"
+    pasta.mkdir()
+    _Handler.contagem = Counter()
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), partial(_Handler, directory=str(pasta)))
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield pasta, f"http://127.0.0.1:{servidor.server_address[1]}/", _Handler.contagem
+    servidor.shutdown()
+    servidor.server_close()
+
+def _publicar(pasta, nome, operadoras, mtime):
+    registros = [["202303", f"{op:06d}", "SP", 10 * i] for i, op in enumerate(operadoras, start=1)]
+    caminho = escrever_dbf(pasta / nome, CAMPOS_BENEFICIARIOS, registros)
+    os.utime(caminho, (mtime, mtime))
+    return caminho
+
+def _totais(caminho_db):
+    with sqlite3.connect(caminho_db) as conn:
+        return conn.execute("SELECT COUNT(*), SUM(NR_BENEF_T) FROM beneficiarios_agrupados").fetchone()
+
+def test_segunda_carga_so_faz_head_e_nao_duplica(tmp_path, servidor_ans):
+    # Arrange
+    pasta, url, contagem = servidor_ans
+    _publicar(pasta, "a.dbf", [1, 2], mtime=1_700_000_000)
+    _publicar(pasta, "b.dbf", [3], mtime=1_700_000_000)
+    fontes = [url + "a.dbf", url + "b.dbf"]
+    importador = ImportadorANSParalelo(str(tmp_path / "destino.db"), max_workers=1,
+                                       diretorio_cache=tmp_path / "cache")
+    importador.processar_paralelo(fontes)
+    contagem.clear()
+
+    # Act
+    linhas = importador.processar_paralelo(fontes)
+
+    # Assert: só validação (HEAD), nenhum download e nada regravado
+    assert linhas == 0
+    assert contagem == Counter({'HEAD': 2})
+    assert _totais(tmp_path / "destino.db") == (3, 40)
+
+def test_fonte_alterada_substitui_linhas_da_carga_anterior(tmp_path, servidor_ans):
+    # Arrange
+    pasta, url, contagem = servidor_ans
+    _publicar(pasta, "a.dbf", [1, 2], mtime=1_700_000_000)
+    _publicar(pasta, "b.dbf", [3], mtime=1_700_000_000)
+    fontes = [url + "a.dbf", url + "b.dbf"]
+    caminho_db = tmp_path / "destino.db"
+    importador = ImportadorANSParalelo(str(caminho_db), max_workers=1, diretorio_cache=tmp_path / "cache")
+    importador.processar_paralelo(fontes)
+    _publicar(pasta, "a.dbf", [1, 2, 4], mtime=1_700_100_000)
+    contagem.clear()
+
+    # Act
+    importador.processar_paralelo(fontes)
+
+    # Assert: só a.dbf é baixado; suas linhas antigas saem, as de b.dbf ficam
+    assert contagem == Counter({'HEAD': 2, 'GET': 1})
+    assert _totais(caminho_db) == (4, 10 + 20 + 30 + 10)
+    with sqlite3.connect(caminho_db) as conn:
+        registro = dict(conn.execute(f"SELECT origem, linhas FROM {TABELA_REGISTRO}").fetchall())
+    assert registro == {url + "a.dbf": 3, url + "b.dbf": 1}
+
+def test_banco_novo_reaproveita_download_e_processado(tmp_path, servidor_ans):
+    # Arrange
+    pasta, url, contagem = servidor_ans
+    _publicar(pasta, "a.dbf", [1, 2], mtime=1_700_000_000)
+    cache = tmp_path / "cache"
+    ImportadorANSParalelo(str(tmp_path / "primeiro.db"), max_workers=1, diretorio_cache=cache).processar_paralelo([url + "a.dbf"])
+    contagem.clear()
+
+    # Act
+    linhas = ImportadorANSParalelo(str(tmp_path / "segundo.db"), max_workers=1,
+                                   diretorio_cache=cache).processar_paralelo([url + "a.dbf"])
+
+    # Assert
+    assert linhas == 2
+    assert contagem == Counter({'HEAD': 1})
+    assert _totais(tmp_path / "segundo.db") == (2, 30)
+    assert len(list((cache / "processados").iterdir())) >= 1
@@ -0,0 +1,69 @@
+import sqlite3
+import zipfile
+import pandas as pd
+import pytest
+from etl.gravador import GravadorSQLite
+from etl.contabeis import extrair_trimestre_arquivo
+from etl.__main__ import main
+
+def _lotes(qtd, linhas):
+    return [pd.DataFrame({'ID_CMPT': ['202301'] * linhas, 'CD_OPERADO': [f"{i:06d}" for i in range(linhas)],
+                          'NR_BENEF_T': [float(n)] * linhas}) for n in range(qtd)]
+
+def test_gravador_agrupa_entregas_em_transacoes(tmp_path):
+    # Arrange
+    caminho_db = tmp_path / "destino.db"
+    lotes = _lotes(10, 1000)
+
+    # Act
+    with GravadorSQLite(str(caminho_db), "beneficiarios_agrupados", linhas_por_transacao=3000) as gravador:
+        for lote in lotes:
+            gravador.enviar(lote)
+
+    # Assert: 3 commits ao cruzar 3000 linhas + o commit final
+    assert gravador.estatisticas['linhas'] == 10_000
+    assert gravador.estatisticas['transacoes'] == 4
+    assert gravador.estatisticas['linhas_por_segundo'] > 0
+    with sqlite3.connect(caminho_db) as conn:
+        gravado = pd.read_sql("SELECT * FROM beneficiarios_agrupados", conn)
+        ddl = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'beneficiarios_agrupados'").fetchone()[0]
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    pd.testing.assert_frame_equal(gravado, pd.concat(lotes, ignore_index=True))
+    assert '"NR_BENEF_T" REAL' in ddl
+
+def test_gravador_propaga_erro_de_escrita(tmp_path):
+    # Arrange: tabela existente sem a coluna NR_BENEF_T
+    caminho_db = tmp_path / "destino.db"
+    with sqlite3.connect(caminho_db) as conn:
+        conn.execute("CREATE TABLE beneficiarios_agrupados (ID_CMPT TEXT, CD_OPERADO TEXT)")
+
+    # Act / Assert
+    with pytest.raises(sqlite3.OperationalError):
+        with GravadorSQLite(str(caminho_db), "beneficiarios_agrupados") as gravador:
+            for lote in _lotes(3, 10):
+                gravador.enviar(lote)
+
+def test_cli_contabeis_carrega_zips_locais(tmp_path):
+    # Arrange: <ano>/<trimestre>.zip com CSV no formato da ANS (latin-1, ';', vírgula decimal)
+    pasta_ano = tmp_path / "origem" / "2023"
+    pasta_ano.mkdir(parents=True)
+    csv = ("DATA;REG_ANS;CD_CONTA_CONTABIL;DESCRICAO;VL_SALDO_INICIAL;VL_SALDO_FINAL\n"
+           "01/01/2023;000123;31;CONTRAPRESTAÇÕES;0;1.234,56\n"
+           "01/01/2023;000123;4;EVENTOS;0;99,00\n"
+           "01/01/2023;000456;31;CONTRAPRESTAÇÕES;0;10,5\n")
+    with zipfile.ZipFile(pasta_ano / "1T2023.zip", "w") as z:
+        z.writestr("1T2023.csv", csv.encode("iso-8859-1"))
+    caminho_db = tmp_path / "destino.db"
+
+    # Act
+    codigo = main(["contabeis", "--db", str(caminho_db), "--origem", str(tmp_path / "origem"), "--workers", "1",
+                   "--cache", str(tmp_path / "cache")])
+
+    # Assert
+    assert codigo == 0
+    with sqlite3.connect(caminho_db) as conn:
+        linhas = conn.execute("SELECT REG_ANS, CD_CONTA_CONTABIL, VL_SALDO_FINAL, ID_TRIMESTRE "
+                              "FROM demonstracoes_contabeis ORDER BY REG_ANS").fetchall()
+    assert linhas == [('000123', '31', 1234.56, '2023-T1'), ('000456', '31', 10.5, '2023-T1')]
+    assert extrair_trimestre_arquivo("4_trimestre.zip", "https://x/2019/") == "2019-T4"
+    assert extrair_trimestre_arquivo("demonstracoes_t2.zip", "/dados/sem_ano_2020") == "2020-T2"
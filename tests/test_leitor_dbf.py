@@ -0,0 +1,41 @@
+import pandas as pd
+from dbfread import DBF
+from etl.leitor_dbf import LeitorDBF
+from tests.conftest import escrever_dbf
+
+CAMPOS = [("ID_CMPT", "C", 6, 0), ("NOME", "C", 12, 0), ("NR_BENEF_T", "N", 8, 0), ("VALOR", "N", 10, 2)]
+
+def _dbfread(caminho, colunas):
+    df = pd.DataFrame(iter(DBF(str(caminho), encoding='iso-8859-1', load=False)))
+    return df[colunas].reset_index(drop=True)
+
+def _concatenar(lotes):
+    return pd.concat(list(lotes), ignore_index=True)
+
+def test_leitor_equivale_ao_dbfread(tmp_path):
+    # Arrange: acentos (latin-1), numérico vazio, decimais, registro excluído e lixo após o EOF
+    registros = [["202301", f"SÃO JOSÉ {i}", i * 3 if i % 4 else None, i * 1.25] for i in range(10)]
+    caminho = escrever_dbf(tmp_path / "edge.dbf", CAMPOS, registros)
+    leitor = LeitorDBF(caminho)
+    conteudo = bytearray(caminho.read_bytes())
+    conteudo[leitor.tamanho_cabecalho + 2 * leitor.tamanho_registro] = ord("*")
+    conteudo[-1:] = b"\x1a" + bytes(conteudo[leitor.tamanho_cabecalho:leitor.tamanho_cabecalho + leitor.tamanho_registro])
+    caminho.write_bytes(bytes(conteudo))
+    colunas = ["ID_CMPT", "NOME", "NR_BENEF_T", "VALOR"]
+
+    # Act
+    df = _concatenar(LeitorDBF(caminho).ler_lotes(colunas, tamanho_lote=3))
+
+    # Assert
+    esperado = _dbfread(caminho, colunas)
+    assert len(df) == 9
+    pd.testing.assert_frame_equal(df, esperado)
+
+def test_leitor_decodifica_apenas_colunas_pedidas(dbf_beneficiarios):
+    # Act
+    leitor = LeitorDBF(dbf_beneficiarios)
+    df = leitor.ler(["CD_OPERADO", "NR_BENEF_T"])
+
+    # Assert
+    assert leitor.field_names == ["ID_CMPT", "CD_OPERADO", "SG_UF", "NR_BENEF_T"]
+    pd.testing.assert_frame_equal(df, _dbfread(dbf_beneficiarios, ["CD_OPERADO", "NR_BENEF_T"]))
@@ -12,6 +12,18 @@ def test_normalizar_chaves():
     # Assert (Verificação)
     assert df_output['registro'].tolist() == expected
 
+def test_normalizar_chaves_equivale_a_versao_por_celula():
+    # Arrange
+    valores = [123, 456.0, '456.0', ' 789 ', '001234', 1234567, None, float('nan')]
+    df_input = pd.DataFrame({'registro': pd.Series(valores, dtype=object)})
+    expected = [str(v).split('.')[0].strip().zfill(6) for v in valores]
+
+    # Act
+    df_output = DataProcessor.normalizar_chaves(df_input, ['registro'])
+
+    # Assert
+    assert df_output['registro'].tolist() == expected
+
 def test_calcular_kpis():
     # Arrange
     df_input = pd.DataFrame({
@@ -27,4 +39,27 @@ def test_calcular_kpis():
     # Assert
     # Variação percentual deve ser 1.0 (100%) para o segundo registro
     assert df_output.iloc[1]['VAR_PCT_VIDAS'] == 1.0
-    assert df_output.iloc[1]['CUSTO_POR_VIDA'] == 10.0 # 2000 / 200
\ No newline at end of file
+    assert df_output.iloc[1]['CUSTO_POR_VIDA'] == 10.0 # 2000 / 200
+def test_compactar_tipos_sem_perda():
+    # Arrange
+    df_input = pd.DataFrame({
+        'ID_TRIMESTRE': ['2023-T2', '2023-T1', '2023-T2', '2023-T1'],
+        'uf': ['SP', float('nan'), 'SP', 'SP'],
+        'NR_BENEF_T': [100.0, 0.0, 120.0, 5.0],
+        'VL_SALDO_FINAL': [1500.5, 0.0, 1000.25, 10.0],
+        'VAR_PCT': [0.1, 0.2, 0.0, 0.0],
+    })
+
+    # Act
+    df_output = DataProcessor.compactar_tipos(
+        df_input, colunas_categoricas=['uf'], colunas_ordenadas=['ID_TRIMESTRE'],
+        colunas_contagem=['NR_BENEF_T'], colunas_decimais=['VL_SALDO_FINAL', 'VAR_PCT']
+    )
+
+    # Assert
+    assert df_output['ID_TRIMESTRE'].cat.ordered and df_output['ID_TRIMESTRE'].max() == '2023-T2'
+    assert df_output['uf'].dtype == 'category' and df_output['uf'].isna().sum() == 1
+    assert df_output['NR_BENEF_T'].dtype == 'int32'
+    assert df_output['VL_SALDO_FINAL'].dtype == 'float32'   # valores exatos em float32
+    assert df_output['VAR_PCT'].dtype == 'float64'          # 0.1 perderia precisão
+    pd.testing.assert_frame_equal(df_output.astype(df_input.dtypes.to_dict()), df_input)
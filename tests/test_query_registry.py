@@ -0,0 +1,51 @@
+import os
+import pytest
+from pathlib import Path
+from backend.config import settings
+from backend.exceptions import DataLoadError
+from backend.query_registry import QueryRegistry
+
+def _escrever(caminho, texto, mtime_ns=None):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_text(texto, encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(caminho, ns=(mtime_ns, mtime_ns))
+
+def test_registry_expoe_queries_por_nome_com_metadados():
+    # Act
+    registry = QueryRegistry(settings.QUERIES_DIR)
+    consulta = registry.obter('etl/load_beneficiarios')
+
+    # Assert
+    assert registry.obter('etl/load_beneficiarios.sql') is consulta
+    assert registry.obter(settings.QUERIES_DIR / 'etl' / 'load_beneficiarios.sql') is consulta
+    assert consulta.parametros == ('trimestre_inicial',)
+    assert consulta.colunas == ('CD_OPERADO', 'ID_TRIMESTRE', 'NR_BENEF_T')
+    # Sem cabeçalho: parâmetros nomeados inferidos do corpo
+    assert registry.obter('gold/materializar_gold_mestre').parametros == ('data_corte', 'versao_script')
+    with pytest.raises(DataLoadError):
+        registry.obter('etl/inexistente')
+
+def test_registry_nao_rele_disco_e_recarrega_quando_mtime_muda(tmp_path, monkeypatch):
+    # Arrange
+    arquivo = tmp_path / 'etl' / 'q.sql'
+    _escrever(arquivo, "SELECT 1 AS a", mtime_ns=1_000_000_000)
+    registry = QueryRegistry(tmp_path, intervalo_verificacao=0)
+    versao_inicial = registry.versao()
+
+    leituras = []
+    ler_original = Path.read_bytes
+    monkeypatch.setattr(Path, 'read_bytes', lambda self: leituras.append(self) or ler_original(self))
+
+    # Act
+    for _ in range(5):
+        registry.obter('etl/q')
+    leituras_sem_alteracao = len(leituras)
+    _escrever(arquivo, "SELECT 2 AS a", mtime_ns=2_000_000_000)
+    consulta = registry.obter('etl/q')
+
+    # Assert
+    assert leituras_sem_alteracao == 0
+    assert consulta.sql == "SELECT 2 AS a"
+    assert len(leituras) == 1
+    assert registry.versao() != versao_inicial
@@ -3,9 +3,12 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
-def render_spread_chart(df_mestre, id_operadora, nome_operadora, tipo_kpi, tipo_comparacao, filtro_grupo=None):
+from backend.analytics.cubo_mercado import obter_cubo
+
+def render_spread_chart(df_mestre, id_operadora, nome_operadora, tipo_kpi, tipo_comparacao, filtro_grupo=None, cubo=None):
     """
     Gera gráfico de Spread (Alpha).
+    A mediana de referência por trimestre vem do cubo de mercado pré-agregado.
     """
     col_valor = 'VL_SALDO_FINAL' if tipo_kpi == 'Receita' else 'NR_BENEF_T'
     col_var_pct = 'VAR_PCT_RECEITA' if tipo_kpi == 'Receita' else 'VAR_PCT_VIDAS'
@@ -18,13 +21,10 @@ def render_spread_chart(df_mestre, id_operadora, nome_operadora, tipo_kpi, tipo_
     df_op = df_op.set_index('ID_TRIMESTRE').reindex(timeline_completa)
     s_op_pct = df_op[col_valor].pct_change() * 100
 
-    # Dados Referência
-    if tipo_comparacao == 'Grupo' and filtro_grupo:
-        df_ref = df_mestre[df_mestre['Marca_Temp'] == filtro_grupo].copy()
-    else:
-        df_ref = df_mestre.copy() # Mercado Geral
-        
-    s_ref_pct = df_ref.groupby('ID_TRIMESTRE')[col_var_pct].median() * 100
+    # Dados Referência (Grupo ou Mercado Geral)
+    cubo = cubo or obter_cubo(df_mestre)
+    marca_ref = filtro_grupo if tipo_comparacao == 'Grupo' and filtro_grupo else None
+    s_ref_pct = cubo.serie(col_var_pct, 'mediana', marca=marca_ref) * 100
     s_ref_pct = s_ref_pct.reindex(timeline_completa)
 
     s_spread = s_op_pct - s_ref_pct
@@ -0,0 +1,17 @@
+import streamlit as st
+from backend.services.data_engine import DataEngine
+
+@st.cache_resource(show_spinner=False)
+def _engine():
+    """Engine compartilhada pelas sessões (o cache dos grupos vive na própria DataEngine)."""
+    return DataEngine()
+
+def anexar_grupos_colunas(dados, grupos):
+    """
+    Acrescenta os grupos de colunas declarados pela view (ex: GruposColunas.CADASTRAL)
+    a um recorte do Dataset Mestre ou à linha de uma operadora.
+    Cada grupo é buscado no banco só no primeiro acesso.
+    """
+    if not grupos:
+        return dados
+    return _engine().anexar_grupos_colunas(dados, grupos)
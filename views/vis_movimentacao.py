@@ -3,12 +3,17 @@ import plotly.express as px
 import pandas as pd
 from backend.analytics.movimentacao_mercado import calcular_fluxo_entrada_saida, gerar_analise_impacto
 from views.components.tables import formatar_moeda_br
+from views.components.colunas_sob_demanda import anexar_grupos_colunas
+from backend.constants import GruposColunas
 
 # Imports dos Componentes Visuais (Padrão Sidebar)
 from views.components.sidebar_header import render_sidebar_header
 from views.components.footer import render_sidebar_footer
 from views.components.glossary import render_glossary
 
+# Colunas fora do Dataset Mestre usadas nesta página (carregadas sob demanda)
+GRUPOS_COLUNAS = (GruposColunas.DESCREDENCIAMENTO,)
+
 def render_movimentacao_mercado(df_mestre):
     # --- 1. CONTROLLER (Sidebar) ---
     with st.sidebar:
@@ -115,6 +120,7 @@ def render_movimentacao_mercado(df_mestre):
     # --- Função Auxiliar de Formatação ---
     def preparar_tabela_exibicao(df):
         if df.empty: return df
+        df = anexar_grupos_colunas(df, GRUPOS_COLUNAS)
         
         cols_map = {
             'ID_OPERADORA': 'Registro ANS', 
@@ -4,9 +4,11 @@ import traceback # Para logar erros detalhados se necessário
 # Imports da Arquitetura Limpa
 from backend.use_cases.market_overview import MarketOverviewUseCase
 from backend.exceptions import AppError
+from backend.constants import GruposColunas
 
 # Imports dos Componentes Visuais (Mantidos)
 from views.components.header import render_header
+from views.components.colunas_sob_demanda import anexar_grupos_colunas
 from views.components.metrics import render_kpi_row
 from views.components.charts import render_spread_chart
 from views.components.tables import render_styled_ranking_table
@@ -14,6 +16,9 @@ from views.components.glossary import render_glossary
 from views.components.footer import render_sidebar_footer
 from views.components.sidebar_header import render_sidebar_header
 
+# Colunas fora do Dataset Mestre usadas nesta página (carregadas sob demanda)
+GRUPOS_COLUNAS = (GruposColunas.CADASTRAL,)
+
 def render_panorama_mercado(df_mestre):
     # --- 1. CONFIGURAÇÃO (Inputs do Usuário) ---
     with st.sidebar:
@@ -76,7 +81,7 @@ def render_panorama_mercado(df_mestre):
     st.caption(f"📅 Referência: **{sel_trimestre}** | 🔍 {texto_contexto}")
 
     # 1. Header do Líder
-    render_header(lider['dados'], 1, lider['dados']['Power_Score'])
+    render_header(anexar_grupos_colunas(lider['dados'], GRUPOS_COLUNAS), 1, lider['dados']['Power_Score'])
 
     st.divider()
     
@@ -6,10 +6,12 @@ import traceback
 # Imports Clean Arch
 from backend.use_cases.revenue_analysis import RevenueAnalysisUseCase
 from backend.exceptions import AppError
-from backend.analytics.brand_intelligence import extrair_marca
+from backend.constants import GruposColunas
+from backend.analytics.cubo_mercado import obter_cubo
 
 # Imports Componentes Visuais
 from views.components.header import render_header
+from views.components.colunas_sob_demanda import anexar_grupos_colunas
 from views.components.metrics import render_revenue_kpi_row
 from views.components.charts import render_spread_chart
 from views.components.tables import render_ranking_table, formatar_moeda_br
@@ -17,6 +19,9 @@ from views.components.glossary import render_glossary
 from views.components.footer import render_sidebar_footer
 from views.components.sidebar_header import render_sidebar_header
 
+# Colunas fora do Dataset Mestre usadas nesta página (carregadas sob demanda)
+GRUPOS_COLUNAS = (GruposColunas.CADASTRAL,)
+
 def render_evolution_revenue_chart(df_mestre, id_operadora):
     """
     (Helper local de visualização apenas)
@@ -57,10 +62,7 @@ def render_analise_receita(df_mestre):
         if sel_mod != "Todas": df_base = df_base[df_base['modalidade'] == sel_mod]
         
         # Grupo
-        df_base['Marca_Temp'] = df_base.apply(
-            lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-            axis=1
-        )
+        df_base['Marca_Temp'] = obter_cubo(df_mestre).marca_de(df_base)
         opts_grupo = ["Todos"] + sorted(df_base['Marca_Temp'].unique())
         sel_grupo = st.selectbox("2️⃣ Grupo:", opts_grupo)
         if sel_grupo != "Todos": df_base = df_base[df_base['Marca_Temp'] == sel_grupo]
@@ -105,7 +107,7 @@ def render_analise_receita(df_mestre):
     st.caption(f"📅 Referência: **{info['trimestre']}** | Grupo: **{info['marca']}** | Visão: **Receita**")
     
     # Header
-    render_header(info['dados_op'], metrics['rank_geral'], metrics['score'])
+    render_header(anexar_grupos_colunas(info['dados_op'], GRUPOS_COLUNAS), metrics['rank_geral'], metrics['score'])
     st.divider()
 
     # Storytelling
@@ -138,17 +140,13 @@ def render_analise_receita(df_mestre):
     # Gráficos Spread
     st.subheader("2. Performance Relativa (Spread de Receita)")
     
-    # Prepara DF para gráficos
-    df_graficos = content['df_full'].copy()
-    if 'Marca_Temp' not in df_graficos.columns:
-        df_graficos['Marca_Temp'] = df_graficos.apply(
-            lambda row: extrair_marca(row['razao_social'], row['ID_OPERADORA']), 
-            axis=1
-        )
+    # Gráficos leem a referência (medianas) do cubo montado pelo use case
+    df_graficos = content['df_full']
+    cubo = content['cubo']
         
     c1, c2 = st.columns(2)
-    c1.plotly_chart(render_spread_chart(df_graficos, info['id_op'], info['dados_op']['razao_social'], "Receita", "Mercado"), width="stretch")
-    c2.plotly_chart(render_spread_chart(df_graficos, info['id_op'], info['dados_op']['razao_social'], "Receita", "Grupo", info['marca']), width="stretch")
+    c1.plotly_chart(render_spread_chart(df_graficos, info['id_op'], info['dados_op']['razao_social'], "Receita", "Mercado", cubo=cubo), width="stretch")
+    c2.plotly_chart(render_spread_chart(df_graficos, info['id_op'], info['dados_op']['razao_social'], "Receita", "Grupo", info['marca'], cubo=cubo), width="stretch")
     st.divider()
     
     # Evolução